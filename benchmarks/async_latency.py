@@ -0,0 +1,65 @@
+"""Event loop lag while a large payload is serialized, blocking versus with AsyncSerializer.
+
+Run from the repository root with: python -m benchmarks.async_latency
+"""
+
+import asyncio
+import time
+
+from src.pserialize import AsyncSerializer, serialize
+
+from tests.models.shoe_store import Condition, Shelf, ShoeBox
+
+
+TICK = 0.001
+
+
+def payload(shelves: int = 200) -> list[Shelf]:
+    return [
+        Shelf(rows=[[ShoeBox(size, "Jordans", Condition.GOOD) for size in range(100)] for _ in range(10)])
+        for _ in range(shelves)
+    ]
+
+
+async def probe(lags: list[float], stop: asyncio.Event):
+    # Stands in for a concurrent request handler, recording how late each of its short sleeps wakes up
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def measure(run) -> tuple[float, float, float]:
+    lags = []
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(probe(lags, stop))
+    await asyncio.sleep(10 * TICK)
+
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await task
+    lags.sort()
+    return elapsed, lags[int(len(lags) * 0.99) - 1], lags[-1]
+
+
+def main():
+    value = payload()
+
+    async def blocking():
+        serialize(value)
+
+    cases = {
+        "serialize": blocking,
+        "AsyncSerializer()": lambda: AsyncSerializer().serialize(value),
+        "AsyncSerializer(time_slice=2ms)": lambda: AsyncSerializer(yield_every=10 ** 9, time_slice=0.002).serialize(value),
+    }
+    for name, run in cases.items():
+        elapsed, p99, worst = asyncio.run(measure(run))
+        print(f"{name:34} total {elapsed * 1000:7.1f} ms   lag p99 {p99 * 1000:6.1f} ms   max {worst * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
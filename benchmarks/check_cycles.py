@@ -0,0 +1,56 @@
+"""Cost of cycle detection on a wide, flat, acyclic graph, for each Serializer(check_cycles=...) mode.
+
+Run from the repository root with: python -m benchmarks.check_cycles
+"""
+
+import time
+from dataclasses import dataclass
+
+from src.pserialize import Serializer
+
+
+REPEATS = 15
+
+
+@dataclass
+class Reading:
+    sensor: str
+    value: float
+    unit: str
+
+
+@dataclass
+class Sample:
+    id: int
+    reading: Reading
+    tags: list[str]
+
+
+def payload(items: int = 100000) -> list[Sample]:
+    return [Sample(index, Reading("s1", index * 0.5, "C"), ["a", "b"]) for index in range(items)]
+
+
+def best_of(run) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    value = payload()
+    baseline = None
+    for mode in (True, "depth", False):
+        for iterative in (False, True):
+            serializer = Serializer(check_cycles=mode, iterative=iterative)
+            elapsed = best_of(lambda: serializer.serialize(value))
+            if baseline is None:
+                baseline = elapsed
+            name = f"check_cycles={mode!r}{', iterative' if iterative else ''}"
+            print(f"{name:34} {elapsed * 1000:7.1f} ms   {elapsed / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Size and speed of serialize_columnar against serialize for a long list of flat records.
+
+Run from the repository root with: python -m benchmarks.columnar
+"""
+
+import json
+import time
+import zlib
+
+from src.pserialize import deserialize, deserialize_columnar, serialize, serialize_columnar
+
+from tests.models.shoe_store import Condition, ShoeBox
+
+
+REPEATS = 5
+
+
+def payload(items: int = 100000) -> list[ShoeBox]:
+    conditions = list(Condition)
+    return [ShoeBox(index % 15, "Jordans" if index % 3 else "Air Max", conditions[index % 4]) for index in range(items)]
+
+
+def best_of(run) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    value = payload()
+    rows = json.dumps(serialize(value)).encode("utf-8")
+    columns = json.dumps(serialize_columnar(value)).encode("utf-8")
+    assert deserialize_columnar(json.loads(columns), list[ShoeBox]) == value
+
+    print(f"{'json size':24} rows {len(rows):9} bytes   columns {len(columns):9} bytes   {len(columns) / len(rows):5.2f}x")
+    rowsZipped, columnsZipped = len(zlib.compress(rows)), len(zlib.compress(columns))
+    print(f"{'compressed size':24} rows {rowsZipped:9} bytes   columns {columnsZipped:9} bytes   {columnsZipped / rowsZipped:5.2f}x")
+
+    rowsValue, columnsValue = serialize(value), serialize_columnar(value)
+    for name, rowsRun, columnsRun in (
+        ("serialize", lambda: serialize(value), lambda: serialize_columnar(value)),
+        ("deserialize", lambda: deserialize(rowsValue, list[ShoeBox]), lambda: deserialize_columnar(columnsValue, list[ShoeBox])),
+    ):
+        rowsTime = best_of(rowsRun)
+        columnsTime = best_of(columnsRun)
+        print(f"{name:24} rows {rowsTime * 1000:9.1f} ms      columns {columnsTime * 1000:9.1f} ms      {columnsTime / rowsTime:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
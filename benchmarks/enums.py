@@ -0,0 +1,57 @@
+"""Time and memory of deserializing enum-heavy payloads with repeated strings, with and without interning.
+
+Run from the repository root with: python -m benchmarks.enums
+"""
+
+import json
+import time
+import tracemalloc
+
+from src.pserialize import deserialize, serialize
+
+from tests.models.shoe_store import Condition, ShoeBox
+
+
+REPEATS = 5
+NAMES = ["Jordans", "Air Max", "Chuck Taylor", "Stan Smith"]
+CONDITIONS = list(Condition)
+
+
+def payload(boxes: int = 100000) -> list[ShoeBox]:
+    return [ShoeBox(size % 15, NAMES[size % len(NAMES)], CONDITIONS[size % len(CONDITIONS)]) for size in range(boxes)]
+
+
+def best_of(run) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained(run) -> int:
+    tracemalloc.start()
+    value = run()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    text = json.dumps(serialize(payload()))
+
+    def run(intern: bool):
+        # Every call parses fresh text so no str object is shared with an earlier run
+        return lambda: deserialize(json.loads(text), list[ShoeBox], intern_strings=intern)
+
+    assert run(True)() == run(False)()
+    enumTime = best_of(lambda: [Condition(value) for value in ["Good", "Bad"] * 100000])
+    print(f"{'Condition(value)':24} {enumTime * 1000:9.1f} ms for 200000 lookups")
+    for name, intern in (("deserialize", False), ("deserialize interned", True)):
+        print(f"{name:24} {best_of(run(intern)) * 1000:9.1f} ms   {retained(run(intern)) / 2 ** 20:7.1f} MiB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Size and speed of the packed binary format against JSON text of serialize's output.
+
+Run from the repository root with: python -m benchmarks.packed
+"""
+
+import json
+import time
+
+from src.pserialize import deserialize, pack, serialize, unpack
+
+from tests.models.shoe_store import Condition, Shelf, ShoeBox
+
+
+REPEATS = 5
+
+
+def payload(shelves: int = 50) -> list[Shelf]:
+    return [
+        Shelf(rows=[[ShoeBox(size, "Jordans", Condition.GOOD) for size in range(100)] for _ in range(10)])
+        for _ in range(shelves)
+    ]
+
+
+def best_of(run) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    value = payload()
+    text = json.dumps(serialize(value))
+    data = pack(value)
+    assert unpack(data, list[Shelf]) == deserialize(json.loads(text), list[Shelf])
+
+    print(f"{'size':24} json {len(text.encode('utf-8')):9} bytes   packed {len(data):9} bytes   {len(data) / len(text):5.2f}x")
+    for name, jsonRun, packedRun in (
+        ("encode", lambda: json.dumps(serialize(value)), lambda: pack(value)),
+        ("decode", lambda: deserialize(json.loads(text), list[Shelf]), lambda: unpack(data, list[Shelf])),
+    ):
+        jsonTime = best_of(jsonRun)
+        packedTime = best_of(packedRun)
+        print(f"{name:24} json {jsonTime * 1000:9.1f} ms      packed {packedTime * 1000:9.1f} ms      {packedTime / jsonTime:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""Timings of the serialize and deserialize hot paths over representative payloads, at several sizes.
+
+Results are written as JSON, and compared against a saved baseline when one is given. The run fails
+when a case got slower than the baseline by more than the threshold, so a change can be checked with:
+
+    python -m benchmarks.suite --output baseline.json                      (before the change)
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.1    (after it)
+
+Run from the repository root with: python -m benchmarks.suite --help
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Callable, Optional, Union
+
+from src.pserialize import deserialize, serialize
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import serialize_into
+
+
+SIZES = (100, 1000, 10000)
+REPEATS = 3
+ROUNDS = 3
+MIN_SAMPLE = 0.02
+THRESHOLD = 0.1
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+    postcode: str
+
+
+@dataclass
+class Customer:
+    id: int
+    name: str
+    email: str
+    active: bool
+    balance: float
+    address: Address
+    tags: list[str]
+
+
+@dataclass
+class Level:
+    depth: int
+    child: Optional["Level"] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+
+
+@dataclass
+class Rectangle:
+    width: float
+    height: float
+
+
+@dataclass
+class Triangle:
+    base: float
+    height: float
+    angle: float
+
+
+@dataclass
+class Text:
+    text: str
+
+
+@dataclass
+class Image:
+    url: str
+    alt: str
+
+
+@dataclass
+class Line:
+    start: list[float]
+    end: list[float]
+
+
+@dataclass
+class Group:
+    name: str
+    count: int
+
+
+Shape = Union[Circle, Square, Rectangle, Triangle, Text, Image, Line, Group]
+SHAPES = (Circle(1.0), Square(2.0), Rectangle(1.0, 2.0), Triangle(1.0, 2.0, 3.0), Text("a"), Image("u", "a"), Line([0.0], [1.0]), Group("g", 1))
+
+
+@dataclass
+class Drawing:
+    shape: Shape
+
+
+class Status(Enum):
+    OPEN = "open"
+    CLOSED = "closed"
+    PENDING = "pending"
+
+
+class Priority(Enum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+
+@dataclass
+class Ticket:
+    id: int
+    status: Status
+    priority: Priority
+    history: list[Status]
+
+
+@dataclass
+class Event:
+    name: str
+    start: datetime
+    end: datetime
+    created: datetime
+
+
+class Record:
+    def __init__(self, id: int, name: str, email: str, password: str, balance: float, address: Address):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.password = password
+        self.balance = balance
+        self.address = address
+
+
+class RecordDTO:
+    def __init__(self, id: int, name: str, email: str, balance: float, address: Address):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.balance = balance
+        self.address = address
+
+
+DEPTH = 50
+DATETIME = {datetime: _datetime.serializer}
+DATETIME_BACK = {datetime: _datetime.deserializer}
+
+
+def flat_dtos(size: int) -> list[Customer]:
+    return [
+        Customer(index, f"name{index}", f"{index}@mail.com", index % 2 == 0, index * 1.5, Address("street", "city", "0000"), ["a", "b"])
+        for index in range(size)
+    ]
+
+
+def deep_nesting(size: int) -> list[Level]:
+    # size levels in total, as chains DEPTH levels deep
+    def chain() -> Level:
+        level = None
+        for depth in range(DEPTH):
+            level = Level(depth, level)
+        return level
+
+    return [chain() for _ in range(max(size // DEPTH, 1))]
+
+
+def wide_unions(size: int) -> list[Drawing]:
+    return [Drawing(SHAPES[index % len(SHAPES)]) for index in range(size)]
+
+
+def enum_records(size: int) -> list[Ticket]:
+    statuses = list(Status)
+    priorities = list(Priority)
+    return [Ticket(index, statuses[index % 3], priorities[index % 3], statuses * 2) for index in range(size)]
+
+
+def dict_of_dicts(size: int) -> dict[str, dict[str, int]]:
+    return {f"row{row}": {f"column{column}": row * column for column in range(10)} for row in range(max(size // 10, 1))}
+
+
+def datetime_events(size: int) -> list[Event]:
+    start = datetime(2022, 7, 25)
+    return [Event(f"event{index}", start + timedelta(hours=index), start + timedelta(hours=index + 1), start) for index in range(size)]
+
+
+def records(size: int) -> list[Record]:
+    return [Record(index, f"name{index}", f"{index}@mail.com", "secret", index * 1.5, Address("street", "city", "0000")) for index in range(size)]
+
+
+Operations = dict[str, Callable[[], object]]
+
+
+def round_trip(value: object, classType: type, middleware: Optional[dict] = None, back: Optional[dict] = None) -> Operations:
+    data = serialize(value, middleware)
+    return {
+        "serialize": lambda: serialize(value, middleware),
+        "deserialize": lambda: deserialize(data, classType, back),
+    }
+
+
+def projection(value: list[Record]) -> Operations:
+    return {"serialize_into": lambda: [serialize_into(record, RecordDTO) for record in value]}
+
+
+# Each case builds its payload for a size and returns the operations timed on it
+CASES: dict[str, Callable[[int], Operations]] = {
+    "flat_dtos": lambda size: round_trip(flat_dtos(size), list[Customer]),
+    "deep_nesting": lambda size: round_trip(deep_nesting(size), list[Level]),
+    "wide_unions": lambda size: round_trip(wide_unions(size), list[Drawing]),
+    "enum_records": lambda size: round_trip(enum_records(size), list[Ticket]),
+    "dict_of_dicts": lambda size: round_trip(dict_of_dicts(size), dict[str, dict[str, int]]),
+    "datetime_middleware": lambda size: round_trip(datetime_events(size), list[Event], DATETIME, DATETIME_BACK),
+    "serialize_into": lambda size: projection(records(size)),
+}
+
+
+def time_operation(operation: Callable[[], object], repeats: int) -> list[float]:
+    # Small payloads are run in batches of at least MIN_SAMPLE seconds, timer resolution and noise
+    # would drown single runs
+    loops = 1
+    while (sample := timeit.timeit(operation, number=loops)) < MIN_SAMPLE:
+        loops *= 2 if sample == 0 else max(2, min(int(MIN_SAMPLE / sample) + 1, 10))
+    return [timeit.timeit(operation, number=loops) / loops for _ in range(repeats)]
+
+
+def calibration():
+    # Plain Python work of the same flavour as the cases, timed along with them so that comparisons
+    # between runs can factor out how fast the machine happened to be
+    rows = [{"id": index, "name": str(index), "tags": ["a", "b"]} for index in range(1000)]
+    return [type(row)(row) for row in rows if isinstance(row["id"], int)]
+
+
+def run(cases: list[str], sizes: list[int], repeats: int = REPEATS, rounds: int = ROUNDS) -> dict:
+    """
+    Times every operation of the given cases at each size.
+
+    Operations are timed once per round, one after the other, so that a burst of load on the machine
+    only affects the samples of one round.
+
+    Args:
+        cases (list[str]): Names of entries in CASES
+        sizes (list[int]): Payload sizes, roughly the number of objects in a payload
+        repeats (int, optional): Timed samples per operation and round. Defaults to REPEATS.
+        rounds (int, optional): How many times every operation is timed. Defaults to ROUNDS.
+
+    Returns:
+        dict: The environment and, by "case/operation/size", the best and median time of a run in seconds,
+        with the best time of calibration taken along with it
+    """
+    operations = {}
+    for case in cases:
+        for size in sizes:
+            for operation, timed in CASES[case](size).items():
+                operations[f"{case}/{operation}/{size}"] = timed
+
+    samples = {name: [] for name in operations}
+    calibrations = {name: [] for name in operations}
+    for _ in range(rounds):
+        for name, timed in operations.items():
+            samples[name].extend(time_operation(timed, repeats))
+            calibrations[name].extend(time_operation(calibration, repeats))
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "rounds": rounds,
+        "results": {
+            name: {"best": min(timings), "median": statistics.median(timings), "calibration": min(calibrations[name])}
+            for name, timings in samples.items()
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = THRESHOLD, calibrated: bool = True) -> dict[str, tuple[float, bool]]:
+    """
+    Compares the best times of results against those of a baseline run.
+
+    Args:
+        results (dict): The output of run
+        baseline (dict): The output of an earlier run
+        threshold (float, optional): How much slower, as a fraction, counts as a regression. Defaults to THRESHOLD.
+        calibrated (bool, optional): Whether times are compared relative to the calibration timed along
+            with them, factoring out a machine that got faster or slower in between. Defaults to True.
+
+    Returns:
+        dict[str, tuple[float, bool]]: The ratio to the baseline, and whether it's a regression, of every
+        result the baseline also has
+    """
+    ratios = {}
+    for name, timing in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous["best"]:
+            continue
+        ratio = timing["best"] / previous["best"]
+        if calibrated:
+            ratio *= previous["calibration"] / timing["calibration"]
+        ratios[name] = (ratio, ratio > 1 + threshold)
+    return ratios
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n")[0])
+    parser.add_argument("--case", action="append", choices=list(CASES), help="run only this case, can be repeated")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help=f"payload sizes, defaults to {' '.join(map(str, SIZES))}")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"timed samples per operation and round, defaults to {REPEATS}")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"times every operation is timed, defaults to {ROUNDS}")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help=f"slowdown counted as a regression, defaults to {THRESHOLD}")
+    parser.add_argument("--absolute", action="store_true", help="compare raw times rather than times relative to the calibration")
+    options = parser.parse_args(arguments)
+
+    results = run(options.case or list(CASES), options.sizes, options.repeats, options.rounds)
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if not options.baseline:
+        return 0
+    with open(options.baseline) as file:
+        ratios = compare(results, json.load(file), options.threshold, not options.absolute)
+    for name, (ratio, regressed) in ratios.items():
+        best = results["results"][name]["best"]
+        print(f"{name:40} {best * 1000:9.2f} ms   {ratio:5.2f}x{'   REGRESSION' if regressed else ''}", file=sys.stderr)
+    regressions = sum(regressed for _, regressed in ratios.values())
+    print(f"{regressions} of {len(ratios)} results slower than the baseline by more than {options.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Cost of compiling deserialize plans for string annotated classes, with and without cached type hints.
+
+Every round deserializes with a fresh middleware dict, so plans are compiled again each time, as they
+are for short lived Deserializers with their own middleware.
+
+Run from the repository root with: python -m benchmarks.type_hints
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.pserialize import deserialize, type_hint_cache_info
+from src.pserialize.serialization_utils import type_hints
+
+
+ROUNDS = 2000
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+    country: Optional[str] = None
+
+
+@dataclass
+class Customer:
+    name: str
+    address: Address
+    previous: list[Address]
+    referrer: Optional[Customer] = None
+
+
+VALUE = {"name": "a", "address": {"street": "b", "city": "c"}, "previous": []}
+
+
+def rounds(cached: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if not cached:
+            type_hints.invalidate()
+        deserialize(VALUE, Customer, {bytes: lambda value, _: value})
+    return time.perf_counter() - start
+
+
+def main():
+    uncached = min(rounds(False) for _ in range(3))
+    cached = min(rounds(True) for _ in range(3))
+    print(f"{'uncached':24} {uncached * 1000:9.1f} ms for {ROUNDS} compiles")
+    print(f"{'cached':24} {cached * 1000:9.1f} ms for {ROUNDS} compiles   {cached / uncached:5.2f}x")
+    print(type_hint_cache_info())
+
+
+if __name__ == "__main__":
+    main()
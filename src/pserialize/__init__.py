@@ -8,33 +8,261 @@ The main package API exposes the Serializer and Deserializer convenience
 classes, along with the lower-level serialize and deserialize functions.
 """
 
-from typing import Any, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Union
 
-from .serialize import serialize
-from .deserialize import deserialize
+from .serialize import (
+    _check_cycles_mode,
+    compile_serializer,
+    serialize,
+    serialize_async,
+    serialize_columnar,
+    serialize_iterative,
+    serialize_references
+)
+from .deserialize import (
+    deserialize,
+    deserialize_async,
+    deserialize_columnar,
+    deserialize_iterative,
+    deserialize_references,
+    materialize
+)
+from .serialization_utils import Discriminator, invalidate_type_hints, type_hint_cache_info
+from .parallel import PARALLEL_THRESHOLD, deserialize_parallel, serialization_executor, serialize_parallel
+from .stream import dump, iter_encode, iter_load
+from .packed import pack, unpack
 
 
 SerializationMiddleware = dict[type, Callable[[object], type]]
 
 
 class Serializer:
-    """Serialize Python objects using optional type-specific middleware."""
+    """Serialize Python objects using optional type-specific middleware.
 
-    def __init__(self, middleware: Optional[SerializationMiddleware] = None):
+    With iterative=True values are serialized with an explicit work stack, which supports object
+    graphs nested deeper than the interpreter recursion limit at some cost in speed.
+
+    With parallel=N, top-level lists and tuples of at least parallel_threshold items are split across
+    a pool of N workers, which is kept until close() is called. Workers are processes set up once with
+    the middleware, or threads on free-threaded builds. Items then have to be picklable.
+
+    With preserve_references=True every distinct object is written once, later occurrences becoming
+    {"$ref": id} back-references, which also supports cyclic object graphs. This takes precedence over
+    iterative and parallel. Read the output back with Deserializer(preserve_references=True).
+
+    With columnar=True lists of objects of one class are written as {"$columns": {field: [values]}}, low
+    cardinality string columns dictionary encoded. This takes precedence over iterative and parallel.
+    Read the output back with Deserializer(columnar=True).
+
+    With check_cycles=False or "depth", which mean the same, visits aren't tracked to detect cycles, which
+    saves time on graphs known to be acyclic, like freshly deserialized DTOs. Graphs nested deeper than
+    MAX_DEPTH still raise SerializeCycleException, so cyclic ones fail instead of running forever. Any other
+    check_cycles raises ValueError.
+    """
+
+    def __init__(
+        self,
+        middleware: Optional[SerializationMiddleware] = None,
+        iterative: bool = False,
+        parallel: int = 0,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        preserve_references: bool = False,
+        check_cycles: Union[bool, str] = True,
+        columnar: bool = False
+    ):
         self.middleware = middleware if middleware is not None else {}
+        self.iterative = iterative
+        self.parallel = parallel
+        self.parallel_threshold = parallel_threshold
+        self.preserve_references = preserve_references
+        self.check_cycles = _check_cycles_mode(check_cycles)
+        self.columnar = columnar
+        self.executor = None
+        self.preconfigured = False
 
     def serialize(self, value: Any):
-        return serialize(value, self.middleware)
+        if self.preserve_references:
+            return serialize_references(value, self.middleware)
+        if self.columnar:
+            return serialize_columnar(value, self.middleware)
+        if self.parallel > 1 and not self.iterative:
+            if self.executor is None:
+                self.executor, self.preconfigured = serialization_executor(self.parallel, self.middleware)
+            return serialize_parallel(
+                value, self.executor, self.middleware, self.parallel * 2, self.parallel_threshold, self.preconfigured
+            )
+        if self.iterative:
+            return serialize_iterative(value, self.middleware, self.check_cycles)
+        return serialize(value, self.middleware, self.check_cycles)
+
+    def close(self):
+        """Shut down the workers used by parallel serialization."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_encode(self, value: Any, chunk_size: int = 65536):
+        """Serialize value straight to JSON text, yielded in chunks of about chunk_size characters."""
+        return iter_encode(value, self.middleware, chunk_size)
+
+    def dump(self, value: Any, fp: Any, chunk_size: int = 65536):
+        """Serialize value as JSON straight into the file-like object fp."""
+        dump(value, fp, self.middleware, chunk_size)
+
+    def pack(self, value: Any) -> bytes:
+        """Serialize value straight to the compact binary format read by Deserializer.unpack."""
+        return pack(value, self.middleware)
+
+    def compile(self, classType: type):
+        """Generate the specialized serializer for classType ahead of its first use."""
+        return compile_serializer(classType, self.check_cycles is True)
 
 
 class Deserializer:
-    """Deserialize primitive values into typed Python objects."""
+    """Deserialize primitive values into typed Python objects.
+
+    With iterative=True values are deserialized with an explicit work stack, which supports values
+    nested deeper than the interpreter recursion limit at some cost in speed.
+
+    With parallel=N, top-level lists, sets and dicts of at least parallel_threshold items are split
+    across a pool of N worker processes, which is kept until close() is called. Middleware and the
+    deserialized objects then have to be picklable.
+
+    With lazy=True, nested objects, collections and dicts inside objects are only deserialized when
+    their field is first read. Use materialize() to deserialize every deferred field of an object.
+
+    With preserve_references=True values written by Serializer(preserve_references=True) are read back
+    with their shared and cyclic references restored. This takes precedence over the other modes.
+
+    With columnar=True values written by Serializer(columnar=True) are read back, lists of objects a
+    column at a time. This takes precedence over lazy, iterative and parallel.
+
+    With intern_strings=True, equal values deserialized as str share one str object within a call, which
+    saves memory on repeated values. It applies to the default and lazy modes.
+    """
 
-    def __init__(self, middleware: Optional[SerializationMiddleware] = None):
+    def __init__(
+        self,
+        middleware: Optional[SerializationMiddleware] = None,
+        iterative: bool = False,
+        parallel: int = 0,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        lazy: bool = False,
+        preserve_references: bool = False,
+        columnar: bool = False,
+        intern_strings: bool = False
+    ):
         self.middleware = middleware if middleware is not None else {}
+        self.iterative = iterative
+        self.parallel = parallel
+        self.parallel_threshold = parallel_threshold
+        self.lazy = lazy
+        self.preserve_references = preserve_references
+        self.columnar = columnar
+        self.intern_strings = intern_strings
+        self.executor = None
 
     def deserialize(self, value: Any, classType: type, strict: bool = False):
-        return deserialize(value, classType, self.middleware, strict)
+        if self.preserve_references:
+            return deserialize_references(value, classType, self.middleware, strict)
+        if self.columnar:
+            return deserialize_columnar(value, classType, self.middleware, strict)
+        if self.lazy:
+            return deserialize(value, classType, self.middleware, strict, lazy=True, intern_strings=self.intern_strings)
+        if self.parallel > 1 and not self.iterative:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.parallel)
+            return deserialize_parallel(
+                value, classType, self.executor, self.middleware, strict, self.parallel * 2, self.parallel_threshold
+            )
+        if self.iterative:
+            return deserialize_iterative(value, classType, self.middleware, strict)
+        return deserialize(value, classType, self.middleware, strict, intern_strings=self.intern_strings)
+
+    def close(self):
+        """Shut down the worker processes used by parallel deserialization."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_deserialize(self, fp: Any, classType: type, strict: bool = False, chunk_size: int = 65536):
+        """Deserialize the items of a top-level JSON array read from fp one at a time, classType being like list[T]."""
+        return iter_load(fp, classType, self.middleware, strict, chunk_size)
+
+    def unpack(self, data: Any, classType: type, strict: bool = False):
+        """Deserialize a binary document written by Serializer.pack into classType."""
+        return unpack(data, classType, self.middleware, strict)
+
+
+class AsyncSerializer:
+    """Serialize Python objects without blocking the event loop.
+
+    Control is handed back to the loop every yield_every nodes, and also after time_slice seconds when
+    given. Middleware may return awaitables. The output is the same as Serializer's.
+    """
+
+    def __init__(self, middleware: Optional[SerializationMiddleware] = None, yield_every: int = 1000, time_slice: Optional[float] = None):
+        self.middleware = middleware if middleware is not None else {}
+        self.yield_every = yield_every
+        self.time_slice = time_slice
+
+    async def serialize(self, value: Any):
+        return await serialize_async(value, self.middleware, self.yield_every, self.time_slice)
+
+
+class AsyncDeserializer:
+    """Deserialize primitive values into typed Python objects without blocking the event loop.
+
+    Control is handed back to the loop every yield_every nodes, and also after time_slice seconds when
+    given. Middleware may be coroutine functions. The output is the same as Deserializer's.
+    """
+
+    def __init__(self, middleware: Optional[SerializationMiddleware] = None, yield_every: int = 1000, time_slice: Optional[float] = None):
+        self.middleware = middleware if middleware is not None else {}
+        self.yield_every = yield_every
+        self.time_slice = time_slice
+
+    async def deserialize(self, value: Any, classType: type, strict: bool = False):
+        return await deserialize_async(value, classType, self.middleware, strict, self.yield_every, self.time_slice)
 
 
-__all__ = ["Serializer", "Deserializer", "serialize", "deserialize"]
+__all__ = [
+    "Serializer",
+    "Deserializer",
+    "AsyncSerializer",
+    "AsyncDeserializer",
+    "Discriminator",
+    "serialize",
+    "serialize_async",
+    "serialize_columnar",
+    "serialize_iterative",
+    "serialize_parallel",
+    "serialize_references",
+    "deserialize",
+    "deserialize_async",
+    "deserialize_columnar",
+    "deserialize_iterative",
+    "deserialize_parallel",
+    "deserialize_references",
+    "materialize",
+    "dump",
+    "iter_encode",
+    "iter_load",
+    "pack",
+    "unpack",
+    "invalidate_type_hints",
+    "type_hint_cache_info",
+]
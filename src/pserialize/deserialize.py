@@ -7,6 +7,12 @@ from .deserialize_impl import (
     DeserializeDictValueException,
     DeserializeListException,
     deserialize,
+    deserialize_async,
+    deserialize_columnar,
+    deserialize_iterative,
+    deserialize_references,
+    is_lazy,
+    materialize,
     type_args_string,
 )
 
@@ -17,5 +23,11 @@ __all__ = [
     "DeserializeDictValueException",
     "DeserializeListException",
     "deserialize",
+    "deserialize_async",
+    "deserialize_columnar",
+    "deserialize_iterative",
+    "deserialize_references",
+    "is_lazy",
+    "materialize",
     "type_args_string",
 ]
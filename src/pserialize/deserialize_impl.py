@@ -1,7 +1,32 @@
+import asyncio
 import dataclasses
-from typing import Any, Callable, Literal, Optional, get_args, get_origin, get_type_hints
-
-from .serialization_utils import get_attributes, is_enum, is_optional, is_primitive, is_union
+import inspect
+from array import array
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Literal, Optional, get_args, get_origin
+
+from .serialization_utils import (
+    Discriminator,
+    Kind,
+    Pacer,
+    TypeCache,
+    add_invalidation_hook,
+    annotation_classes,
+    array_from_bytes,
+    classify,
+    decode_base64,
+    depends_on_class,
+    get_attributes,
+    get_init_type_hints,
+    get_slots,
+    get_subclasses,
+    get_tags,
+    is_named_tuple,
+    is_type_var,
+    is_union,
+    primitiveTypes
+)
 
 
 DeserializationMiddleware = dict[type, Callable[[object], type]]
@@ -15,10 +40,6 @@ def __is_literal(type_hint: type) -> bool:
     return get_origin(type_hint) is Literal
 
 
-def __is_type_var(type_hint: type) -> bool:
-    return hasattr(type_hint, "__constraints__") and hasattr(type_hint, "__bound__")
-
-
 def __literal_matches(value: Any, literal_value: Any) -> bool:
     return value == literal_value and type(value) is type(literal_value)
 
@@ -28,7 +49,7 @@ def type_args_string(type: type):
         name = "Union"
     elif __is_literal(type):
         name = "Literal"
-    elif __is_type_var(type):
+    elif is_type_var(type):
         name = getattr(type, "__name__", str(type))
     elif hasattr(type, "__name__"):
         name = type.__name__
@@ -46,240 +67,1772 @@ class BaseDeserializationException(Exception):
     error: Exception
     value: Any
 
+    def _describe(self) -> tuple[str, bool]:
+        """Returns the text for this level, and whether the nested error continues it without a ' -> '."""
+        return "", False
+
     def __repr__(self):
+        # Walk the chain instead of recursing, so errors from arbitrarily deep values can be printed
         s = ""
-        if isinstance(self.error, BaseDeserializationException):
-            s += " -> " + str(self.error)
-        else:
-            s += f"'{self.value}' |{str(self.error)}|"
-        return s
+        exception = self
+        while True:
+            text, inline = exception._describe()
+            s += text
+            if inline:
+                exception = exception.error
+            elif isinstance(exception.error, BaseDeserializationException):
+                s += " -> "
+                exception = exception.error
+            else:
+                return s + f"'{exception.value}' |{str(exception.error)}|"
 
     def __str__(self):
         return self.__repr__()
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(repr=False)
 class DeserializeDictKeyException(BaseDeserializationException):
     keyType: type
     valueType: type
 
-    def __repr__(self):
-        return f"dict[{type_args_string(self.keyType)},{type_args_string(self.valueType)}].key" + super().__repr__()
+    def _describe(self) -> tuple[str, bool]:
+        return f"dict[{type_args_string(self.keyType)},{type_args_string(self.valueType)}].key", False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(repr=False)
 class DeserializeDictValueException(BaseDeserializationException):
     keyType: type
     valueType: type
     key: Any
 
-    def __repr__(self):
-        return f"dict[{type_args_string(self.keyType)},{type_args_string(self.valueType)}].value" + super().__repr__()
+    def _describe(self) -> tuple[str, bool]:
+        return f"dict[{type_args_string(self.keyType)},{type_args_string(self.valueType)}].value", False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(repr=False)
 class DeserializeListException(BaseDeserializationException):
     itemType: type
     index: int
 
-    def __repr__(self):
-        return f"{type_args_string(self.itemType)}[{self.index}]" + super().__repr__()
+    def _describe(self) -> tuple[str, bool]:
+        return f"{type_args_string(self.itemType)}[{self.index}]", False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(repr=False)
 class DeserializeClassException(BaseDeserializationException):
     field_type: type
     field_name: str
 
-    def __repr__(self):
+    def _describe(self) -> tuple[str, bool]:
         s = ""
         if self.field_name:
             s += self.field_name + ":"
         if isinstance(self.error, (DeserializeListException, DeserializeDictKeyException, DeserializeDictValueException)):
-            s += self.error.__repr__()
+            return s, True
+        return s + type_args_string(self.field_type), False
+
+
+class _Plan:
+    """
+    A compiled deserialization step for a single target type.
+
+    run deserializes a value recursively. args holds the sub-plans of structured kinds (collections,
+    dicts, objects, optionals and bound type vars) so the plan can also be walked without recursion.
+    Plans without args are leaves, their run never descends into nested plans on its own.
+    """
+
+    __slots__ = ("kind", "classType", "run", "args", "leaf")
+
+    def __init__(self, kind: Optional[Kind], classType: type, run: Callable[[Any], Any], args: tuple = ()):
+        self.kind = kind
+        self.classType = classType
+        self.run = run
+        self.args = args
+        self.leaf = not args
+
+
+# Plans are cached per (middleware snapshot, strict). Each entry holds a private copy of the middleware
+# so later mutations of the caller's dict select a fresh entry instead of reusing stale plans.
+__plan_caches: dict[tuple, tuple[DeserializationMiddleware, "_Plans"]] = {}
+__MAX_PLAN_CACHES = 64
+# Plans hold their classes, so a plan set only keeps the most recently used ones and lets the classes
+# of evicted plans, like dynamically created ones, be collected
+__MAX_PLANS = 1024
+
+
+class _Plans(OrderedDict):
+    """
+    A set of compiled plans by type, in least to most recently used order.
+
+    strings is None, or the table interning str values for plans compiled with intern_strings. It only
+    lives for a deserialize call, the strings it holds are dropped once the call is done.
+
+    dependents maps the key of a plan to the keys of the plans compiled on top of it, which run it or
+    were compiled from the same type hints, so they are dropped along with it.
+    """
+
+    strings: Optional[dict[str, str]] = None
+
+    def __init__(self):
+        super().__init__()
+        self.dependents: dict[Any, set] = {}
+
+
+class _LazyPlans(_Plans):
+    """A plan set compiled for lazy deserialization, where objects defer their structured fields."""
+
+
+class _SharedPlans(_Plans):
+    """A plan set compiled for values written by serialize_references, resolving $id and $ref."""
+
+
+class _ColumnarPlans(_Plans):
+    """A plan set compiled for values written by serialize_columnar, reading lists of objects from columns."""
+
+
+def __new_plans(lazy: bool, shared: bool, columnar: bool, intern_strings: bool) -> _Plans:
+    plans = _LazyPlans() if lazy else _SharedPlans() if shared else _ColumnarPlans() if columnar else _Plans()
+    if intern_strings:
+        plans.strings = {}
+    return plans
+
+
+def __plans_for(
+    middleware: DeserializationMiddleware,
+    strict: bool,
+    lazy: bool = False,
+    shared: bool = False,
+    columnar: bool = False,
+    intern_strings: bool = False
+) -> tuple[DeserializationMiddleware, _Plans]:
+    key = (strict, lazy, shared, columnar, intern_strings, *middleware.items())
+    try:
+        entry = __plan_caches.get(key)
+    except TypeError:
+        # Unhashable middleware callables can't be keyed, compile without sharing plans
+        return dict(middleware), __new_plans(lazy, shared, columnar, intern_strings)
+
+    if entry is None:
+        if len(__plan_caches) >= __MAX_PLAN_CACHES:
+            __plan_caches.clear()
+        entry = __plan_caches[key] = (dict(middleware), __new_plans(lazy, shared, columnar, intern_strings))
+    return entry
+
+
+def __plan_key(classType: type):
+    # Unions compare equal regardless of member order, but the order decides which member wins,
+    # so parameterized types are keyed on their arguments in order as well
+    args = getattr(classType, "__args__", None)
+    if not args or not isinstance(args, tuple):
+        return classType
+    return (classType, tuple(__plan_key(arg) for arg in args))
+
+
+# Plans being compiled, with the plan set they are for and the keys of the plans being built. Plans
+# are registered before their fields or members are compiled, so self-referencing types resolve to
+# them, and only published to the plan set once the outermost compile is done, so other threads never
+# run a half built plan.
+__staged_plans: ContextVar[Optional[tuple[dict, dict, list]]] = ContextVar("staged_plans", default=None)
+
+
+def __cached_plan(plans: dict[type, _Plan], classType: type) -> Optional[_Plan]:
+    try:
+        key = __plan_key(classType)
+        staged = __staged_plans.get()
+        if staged is not None and staged[0] is plans and (plan := staged[1].get(key)) is not None:
+            return plan
+        plan = plans.get(key)
+        if plan is not None:
+            plans.move_to_end(key)
+        return plan
+    except (TypeError, KeyError):
+        # KeyError when another thread evicted the plan in between, it's compiled again
+        return None
+
+
+def __remember_plan(plans: dict[type, _Plan], classType: type, plan: _Plan):
+    staged = __staged_plans.get()
+    try:
+        if staged is not None and staged[0] is plans:
+            staged[1][__plan_key(classType)] = plan
         else:
-            s += type_args_string(self.field_type) + super().__repr__()
-        return s
+            plans[__plan_key(classType)] = plan
+            __evict_plans(plans)
+    except TypeError:
+        pass
 
 
-def __deserialize_simple_object(data: dict, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    middleware = __middleware_or_empty(middleware)
-    attributes = get_attributes(classType)
-    type_hints = get_type_hints(classType.__init__)
-    if dataclasses.is_dataclass(classType):
-        type_hints.pop("return", None)
+def __evict_plans(plans: _Plans):
+    evicted = []
+    while len(plans) > __MAX_PLANS:
+        try:
+            evicted.append(plans.popitem(last=False)[0])
+        except KeyError:
+            break
+    if evicted:
+        for key in evicted:
+            plans.dependents.pop(key, None)
+        for parents in list(plans.dependents.values()):
+            parents.difference_update(evicted)
+
+
+def __compile(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    staged = __staged_plans.get()
+    if staged is not None and staged[0] is plans and staged[2]:
+        try:
+            plans.dependents.setdefault(__plan_key(classType), set()).add(staged[2][-1])
+        except TypeError:
+            pass
+    if (plan := __cached_plan(plans, classType)) is not None:
+        return plan
+    try:
+        return __build_published(classType, plans, middleware, strict)
+    except Exception:
+        return __compile_failure(classType, plans, middleware, strict)
+
+
+def __build_published(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    staged = __staged_plans.get()
+    if staged is not None and staged[0] is plans:
+        return __build_staged(classType, plans, middleware, strict, staged[2])
+
+    staging = {}
+    building = []
+    token = __staged_plans.set((plans, staging, building))
+    try:
+        plan = __build_staged(classType, plans, middleware, strict, building)
+    finally:
+        __staged_plans.reset(token)
+    plans.update(staging)
+    __evict_plans(plans)
+    return plan
+
+
+def __build_staged(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool, building: list) -> _Plan:
+    try:
+        building.append(__plan_key(classType))
+        hash(building[-1])
+    except TypeError:
+        # Unhashable types aren't cached, nor tracked as depending on anything
+        building.append(None)
+    try:
+        plan = __build_plan(classType, plans, middleware, strict)
+    finally:
+        building.pop()
+    __remember_plan(plans, classType, plan)
+    return plan
+
+
+def __key_depends(key: Any, classType: type) -> bool:
+    if isinstance(key, tuple):
+        return any(__key_depends(part, classType) for part in key)
+    return any(depends_on_class(keyClass, classType) for keyClass in annotation_classes(key))
+
+
+def __drop_plans(classType: Optional[type]):
+    # Drops the plans of types referring to classType, and transitively the plans compiled on top of them
+    if classType is None:
+        __plan_caches.clear()
+        return
+    for _, plans in list(__plan_caches.values()):
+        pending = [key for key in list(plans) if __key_depends(key, classType)]
+        pending += [key for key in list(plans.dependents) if __key_depends(key, classType)]
+        dropped = set()
+        while pending:
+            key = pending.pop()
+            if key not in dropped:
+                dropped.add(key)
+                pending.extend(plans.dependents.get(key, ()))
+        for key in dropped:
+            plans.pop(key, None)
+            plans.dependents.pop(key, None)
+
+
+add_invalidation_hook(__drop_plans)
+
+
+def __compile_failure(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    # Types that can't be compiled yet (e.g. unresolved forward references) only fail once a value
+    # actually reaches them, and are retried on every call in case they have become resolvable.
+    def run(value):
+        if value is None:
+            return None
+        if (plan := __cached_plan(plans, classType)) is None:
+            plan = __build_published(classType, plans, middleware, strict)
+        return plan.run(value)
+
+    return _Plan(None, classType, run)
+
+
+def __build_plan(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    kind = classify(classType)
+    if middleware and kind not in __middleware_exempt_kinds and (deserializer := middleware.get(classType, None)) is not None:
+        return __compile_middleware(classType, deserializer, middleware)
+    return __plan_builders[kind](classType, plans, middleware, strict)
+
+
+def __identity(value: Any):
+    return value
+
+
+def __compile_any(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    return _Plan(Kind.ANY, classType, __identity)
+
+
+def __compile_none(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    def run(value):
+        if value is not None:
+            raise BaseDeserializationException(Exception("Expected None"), value)
+        return None
+
+    return _Plan(Kind.NONE, classType, run)
+
+
+def __compile_literal(literalType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    allowed_values = get_args(literalType)
+
+    def run(value):
+        for literal_value in allowed_values:
+            if __literal_matches(value, literal_value):
+                return value
+        raise BaseDeserializationException(Exception(f"Expected one of {allowed_values}"), value)
+
+    return _Plan(Kind.LITERAL, literalType, run)
+
+
+def __compile_type_var(typeVar: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    constraints = getattr(typeVar, "__constraints__", ())
+    if constraints:
+        return _Plan(Kind.TYPEVAR, typeVar, __union_runner(constraints, plans, middleware, strict))
+
+    bound = getattr(typeVar, "__bound__", None)
+    if bound is not None:
+        boundPlan = __compile(bound, plans, middleware, strict)
+        return _Plan(Kind.TYPEVAR, typeVar, boundPlan.run, (boundPlan,))
+
+    return _Plan(Kind.TYPEVAR, typeVar, __identity)
+
+
+def __compile_middleware(classType: type, deserializer: Callable, middleware: DeserializationMiddleware) -> _Plan:
+    def run(value):
+        return deserializer(value, middleware)
+
+    # Middleware is opaque to the planner, so its plan has no kind
+    plan = _Plan(None, classType, run)
+    # Coroutine middleware is handed back to the engine driver, which awaits it in deserialize_async
+    plan.leaf = not inspect.iscoroutinefunction(deserializer)
+    return plan
+
+
+def __enum_members(enumType: type) -> dict[Any, Any]:
+    # The same lookup Enum's constructor starts with, without going through its metaclass __call__
+    members = {}
+    for member in enumType.__members__.values():
+        try:
+            members.setdefault(member._value_, member)
+        except TypeError:
+            # Unhashable values are left to the constructor
+            pass
+    return members
+
+
+def __compile_primitive(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    kind = classify(classType)
+    if kind is Kind.ENUM:
+        members = __enum_members(classType)
+
+        def run(value):
+            if value is None:
+                return None
+            try:
+                return members[value]
+            except (KeyError, TypeError):
+                pass
+            try:
+                return classType(value)
+            except Exception as e:
+                raise BaseDeserializationException(e, value)
+
+        return _Plan(kind, classType, run)
+
+    if classType is str and plans.strings is not None:
+        intern = plans.strings.setdefault
+
+        def run(value):
+            if value is None:
+                return None
+            if value.__class__ is not str:
+                try:
+                    value = str(value)
+                except Exception as e:
+                    raise BaseDeserializationException(e, value)
+            return intern(value, value)
+
+        return _Plan(kind, classType, run)
+
+    # Constructing an exact bool/int/float/str from an instance of itself returns that same value
+    exact = classType in primitiveTypes
+
+    def run(value):
+        if value is None or (exact and value.__class__ is classType):
+            return value
+        try:
+            return classType(value)
+        except Exception as e:
+            raise BaseDeserializationException(e, value)
 
-    cls = object.__new__(classType)
+    return _Plan(kind, classType, run)
+
+
+def __compile_binary(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    # memoryview(value) views the value without copying it, bytes and bytearray copy exactly once
+    def run(value):
+        if value is None or value.__class__ is classType:
+            return value
+        try:
+            if isinstance(value, str):
+                value = decode_base64(value)
+                if value.__class__ is classType:
+                    return value
+            elif isinstance(value, int):
+                raise TypeError(f"Expected a bytes-like object or base64 string, got {type(value).__name__}")
+            return classType(value)
+        except Exception as e:
+            raise BaseDeserializationException(e, value)
 
-    for name, value in data.items():
-        field_type = attributes.pop(name) if name in attributes.keys() else None
-        field_type = type_hints.pop(name) if name in type_hints.keys() else field_type
+    return _Plan(Kind.BINARY, classType, run)
 
-        if strict and field_type is None:
-            continue
 
+def __compile_array(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    def run(value):
+        if value is None or value.__class__ is classType:
+            return value
         try:
-            cls.__dict__[name] = __deserialize_inner(value, field_type, middleware, strict) if field_type else value
+            if isinstance(value, array):
+                return classType(value.typecode, value)
+            data = value["data"]
+            return array_from_bytes(value["typecode"], decode_base64(data) if isinstance(data, str) else data, classType)
         except Exception as e:
-            raise DeserializeClassException(e, value, field_type, name)
+            raise BaseDeserializationException(e, value)
 
-    remaining = [name for name in attributes.keys()] + [name for name in type_hints.keys()]
-    for field in remaining:
-        cls.__dict__[field] = None
+    return _Plan(Kind.ARRAY, classType, run)
 
-    return cls
 
+def __compile_optional(optionalType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    realType = [arg for arg in get_args(optionalType) if arg is not type(None)][0]
+    realPlan = __compile(realType, plans, middleware, strict)
+    realRun = realPlan.run
 
-def __deserialize_collection_items(values, collectionType: type, itemType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    middleware = __middleware_or_empty(middleware)
-    deserialized = []
-    for index in range(len(values)):
-        value = values[index]
+    def run(value):
+        if value is None:
+            return None
+        return realRun(value)
+
+    return _Plan(Kind.OPTIONAL, optionalType, run, (realPlan,))
+
+
+def _convert_primitives(itemType: type, values: Any) -> Optional[list]:
+    """
+    Deserializes a whole list or tuple of primitives in one pass, like the primitive plan would item by item.
+
+    Returns None when that isn't possible, for None items or items that fail to convert, leaving the
+    item by item path to produce the exact result or error.
+    """
+    if values.__class__ is not list and values.__class__ is not tuple:
+        return None
+    # int(None) and float(None) raise, but str and bool would convert the None the item path keeps
+    if (itemType is str or itemType is bool) and None in values:
+        return None
+    try:
+        # Converting an exact primitive to its own type returns the same object, so this is a plain copy then
+        return list(map(itemType, values))
+    except Exception:
+        return None
+
+
+def __collection_runner(collectionType: type, itemPlan: _Plan, batch: bool = True) -> Callable[[Any], list]:
+    itemRun = itemPlan.run
+
+    def run(values):
+        deserialized = []
+        append = deserialized.append
+        items = enumerate(values)
         try:
-            deserialized.append(__deserialize_inner(value, itemType, middleware, strict))
+            for index, value in items:
+                append(itemRun(value))
         except Exception as e:
             raise DeserializeListException(e, value, collectionType, index)
+        return deserialized
+
+    if not batch or itemPlan.kind is not Kind.PRIMITIVE or itemPlan.classType not in primitiveTypes:
+        return run
+
+    itemType = itemPlan.classType
+
+    def run_primitives(values):
+        converted = _convert_primitives(itemType, values)
+        return converted if converted is not None else run(values)
+
+    return run_primitives
+
+
+class _ColumnFailure(Exception):
+    """Raised by __run_column for the first value of a column failing to deserialize."""
+
+    def __init__(self, error: Exception, value: Any, index: int):
+        self.error = error
+        self.value = value
+        self.index = index
+
+
+# Kinds whose deserialized values are immutable, so a value decoded once can stand for every row holding it
+__SHAREABLE_KINDS = {Kind.NONE, Kind.PRIMITIVE, Kind.EXTENDED_PRIMITIVE, Kind.ENUM, Kind.LITERAL}
+
+
+def __expand_column(column: Any) -> list:
+    if column.__class__ is dict:
+        values = column["$values"]
+        return [values[code] for code in column["$codes"]]
+    return column
+
+
+def __run_column(plan: _Plan, values: list) -> list:
+    if plan.kind is Kind.PRIMITIVE and plan.classType in primitiveTypes:
+        converted = _convert_primitives(plan.classType, values)
+        if converted is not None:
+            return converted
+
+    run = plan.run
+    deserialized = []
+    append = deserialized.append
+    items = enumerate(values)
+    try:
+        for index, value in items:
+            append(run(value))
+    except Exception as e:
+        raise _ColumnFailure(e, value, index)
     return deserialized
 
 
-def __deserialize_list(values: list, listType: list[type], middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    typeArg = get_args(listType)[0] if get_args(listType) else Any
-    return __deserialize_collection_items(values, listType, typeArg, middleware, strict)
+def __read_column(plan: _Plan, column: Any) -> list:
+    if column.__class__ is not dict:
+        return __run_column(plan, column)
+
+    # Dictionary encoded, immutable results are decoded once per distinct value
+    values, codes = column["$values"], column["$codes"]
+    if plan.kind not in __SHAREABLE_KINDS:
+        return __run_column(plan, [values[code] for code in codes])
+    try:
+        decoded = __run_column(plan, values)
+    except _ColumnFailure as failure:
+        failure.index = codes.index(failure.index)
+        raise
+    return [decoded[code] for code in codes]
+
+
+def __column_length(column: Any) -> int:
+    return len(column["$codes"]) if column.__class__ is dict else len(column)
+
+
+def __column_rows(columns: dict[str, Any]) -> list[dict]:
+    expanded = {name: __expand_column(column) for name, column in columns.items()}
+    names = tuple(expanded)
+    return [dict(zip(names, row)) for row in zip(*expanded.values())]
+
+
+def __columnar_runner(collectionType: type, itemPlan: _Plan, items: Callable[[Any], list]) -> Callable[[Any], list]:
+    # Lists of objects written as {"$columns": {field: [values]}} are deserialized a column at a time,
+    # anything else item by item as usual
+    objectPlan = itemPlan.args[0] if itemPlan.kind is Kind.OPTIONAL else itemPlan
+    # Objects keeping their fields in __dict__ are filled from a row directly, others through their plan's build
+    plain = objectPlan.kind is Kind.OBJECT and not objectPlan.args[4] and not get_slots(objectPlan.classType)
+    new = object.__new__
+
+    def run(values):
+        if values.__class__ is not dict:
+            return items(values)
+        columns = values["$columns"]
+        if objectPlan.kind is not Kind.OBJECT:
+            return items(__column_rows(columns))
+
+        field_plans, field_types, strict, build, _ = objectPlan.args
+        deserialized = {}
+        for name, column in columns.items():
+            fieldPlan = field_plans.get(name)
+            if fieldPlan is None:
+                if not strict:
+                    deserialized[name] = __expand_column(column)
+                continue
+            try:
+                deserialized[name] = __read_column(fieldPlan, column)
+            except _ColumnFailure as failure:
+                row = {field: __expand_column(column)[failure.index] for field, column in columns.items()}
+                error = DeserializeClassException(failure.error, failure.value, field_types[name], name)
+                raise DeserializeListException(error, row, collectionType, failure.index)
+
+        count = __column_length(next(iter(columns.values()))) if columns else 0
+        if not plain:
+            names = tuple(deserialized)
+            rows = zip(*deserialized.values()) if deserialized else [()] * count
+            return [build(dict(zip(names, row))) for row in rows]
+
+        for name in field_types:
+            if name not in deserialized:
+                deserialized[name] = [None] * count
+        names = tuple(deserialized)
+        classType = objectPlan.classType
+        objects = []
+        append = objects.append
+        for row in zip(*deserialized.values()):
+            instance = new(classType)
+            instance.__dict__.update(zip(names, row))
+            append(instance)
+        return objects
+
+    return run
+
+
+def __compile_collection(collectionType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    typeArgs = get_args(collectionType)
+    itemPlan = __compile(typeArgs[0] if typeArgs else Any, plans, middleware, strict)
+    # Interned strings are looked up one by one
+    items = __collection_runner(collectionType, itemPlan, plans.strings is None)
+    if isinstance(plans, _ColumnarPlans):
+        items = __columnar_runner(collectionType, itemPlan, items)
+    kind = classify(collectionType)
+
+    if kind is Kind.LIST:
+        def run(values):
+            if values is None:
+                return None
+            return items(values)
+    else:
+        originType = set if kind is Kind.SET else frozenset
+
+        def run(values):
+            if values is None:
+                return None
+            return originType(items(values))
+
+    return _Plan(kind, collectionType, run, (itemPlan,))
 
 
-def __deserialize_tuple(values: list, tupleType: tuple[type], middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+def __compile_tuple(tupleType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
     typeArgs = get_args(tupleType)
     if len(typeArgs) == 0:
-        return tuple(values)
-    if len(typeArgs) == 2 and typeArgs[1] is Ellipsis:
-        return tuple(__deserialize_collection_items(values, tupleType, typeArgs[0], middleware, strict))
+        def run(values):
+            if values is None:
+                return None
+            return tuple(values)
+        return _Plan(Kind.TUPLE, tupleType, run)
 
-    if len(values) != len(typeArgs):
-        raise BaseDeserializationException(Exception(f"Expected tuple of length {len(typeArgs)}, got {len(values)}"), values)
+    if len(typeArgs) == 2 and typeArgs[1] is Ellipsis:
+        itemPlan = __compile(typeArgs[0], plans, middleware, strict)
+        items = __collection_runner(tupleType, itemPlan, plans.strings is None)
+        if isinstance(plans, _ColumnarPlans):
+            items = __columnar_runner(tupleType, itemPlan, items)
+
+        def run(values):
+            if values is None:
+                return None
+            return tuple(items(values))
+        return _Plan(Kind.TUPLE, tupleType, run, ((itemPlan,), True))
+
+    itemPlans = tuple(__compile(typeArg, plans, middleware, strict) for typeArg in typeArgs)
+    itemRuns = [itemPlan.run for itemPlan in itemPlans]
+
+    columnar = isinstance(plans, _ColumnarPlans)
+
+    def run(values):
+        if values is None:
+            return None
+        if columnar and values.__class__ is dict:
+            values = __column_rows(values["$columns"])
+        if len(values) != len(itemRuns):
+            raise BaseDeserializationException(Exception(f"Expected tuple of length {len(itemRuns)}, got {len(values)}"), values)
+
+        deserialized = []
+        for index, itemRun in enumerate(itemRuns):
+            try:
+                deserialized.append(itemRun(values[index]))
+            except Exception as e:
+                raise DeserializeListException(e, values[index], tupleType, index)
+        return tuple(deserialized)
+
+    return _Plan(Kind.TUPLE, tupleType, run, (itemPlans, False))
+
+
+def __compile_dict(dictType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    typeArgs = get_args(dictType)
+    keyType = typeArgs[0] if len(typeArgs) > 0 else Any
+    valueType = typeArgs[1] if len(typeArgs) > 1 else Any
+    keyPlan = __compile(keyType, plans, middleware, strict)
+    valuePlan = __compile(valueType, plans, middleware, strict)
+    keyRun = keyPlan.run
+    valueRun = valuePlan.run
+
+    def run(data):
+        if data is None:
+            return None
+        deserializedDict = {}
+        for key, value in data.items():
+            try:
+                deserializedKey = keyRun(key)
+            except Exception as e:
+                raise DeserializeDictKeyException(e, key, keyType, valueType)
+
+            try:
+                deserializedValue = valueRun(value)
+            except Exception as e:
+                raise DeserializeDictValueException(e, value, keyType, valueType, key)
+
+            deserializedDict[deserializedKey] = deserializedValue
+
+        return deserializedDict
+
+    return _Plan(Kind.DICT, dictType, run, (keyPlan, valuePlan, keyType, valueType))
+
+
+def __union_runner(allowed_types: tuple, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> Callable[[Any], Any]:
+    accepts_any = any(allowed_type is Any for allowed_type in allowed_types)
+    memberPlans = [__compile(allowed_type, plans, middleware, strict) for allowed_type in allowed_types]
+    # Members worth trying per value class, worked out on first use once every member plan is complete
+    resolvers = {}
+
+    def run(value):
+        if accepts_any or type(value) in allowed_types:
+            return value
 
-    deserialized = []
-    for index, typeArg in enumerate(typeArgs):
+        resolve = resolvers.get(value.__class__)
+        if resolve is None:
+            if len(resolvers) >= __MAX_UNION_RESOLVERS:
+                resolvers.clear()
+            resolve = resolvers[value.__class__] = __union_resolver(memberPlans, value.__class__)
+
+        for memberRun in resolve(value):
+            try:
+                return memberRun(value)
+            except Exception:
+                pass
+
+        raise BaseDeserializationException(Exception("Could not deserialize union"), value)
+
+    return run
+
+
+__MAX_UNION_RESOLVERS = 64
+__NUMERIC_CONVERSIONS = ("__int__", "__index__", "__float__", "__trunc__")
+
+
+def __may_accept(plan: _Plan, valueClass: type) -> bool:
+    """
+    Whether plan could deserialize a value of valueClass without raising.
+
+    Only rules out members that are certain to fail, so skipping them never changes which member wins.
+    """
+    kind = plan.kind
+    if kind is Kind.OBJECT and plan.args[4]:
+        # Named tuples also read their fields by position
+        return hasattr(valueClass, "items") or issubclass(valueClass, (list, tuple))
+    if kind is Kind.OBJECT or kind is Kind.DICT:
+        return hasattr(valueClass, "items")
+    if kind in (Kind.LIST, Kind.SET, Kind.FROZENSET, Kind.TUPLE):
+        return hasattr(valueClass, "__iter__")
+    if kind is Kind.BINARY:
+        return not issubclass(valueClass, (int, float))
+    if kind is Kind.ARRAY:
+        return hasattr(valueClass, "items") or issubclass(valueClass, array)
+    if kind is Kind.PRIMITIVE and plan.classType in (int, float):
+        return issubclass(valueClass, (str, bytes, bytearray)) or any(hasattr(valueClass, name) for name in __NUMERIC_CONVERSIONS)
+    return True
+
+
+def __literal_tags(plan: _Plan) -> dict[str, frozenset]:
+    # Literal typed fields of an object plan, as the (type, value) keys each of them accepts
+    if plan.kind is not Kind.OBJECT:
+        return {}
+    field_plans = plan.args[0]
+    return {
+        name: frozenset((type(literal_value), literal_value) for literal_value in get_args(fieldPlan.classType))
+        for name, fieldPlan in field_plans.items()
+        if fieldPlan.kind is Kind.LITERAL
+    }
+
+
+def __union_resolver(memberPlans: list[_Plan], valueClass: type) -> Callable[[Any], tuple]:
+    """
+    Builds a function returning, for a value of valueClass, the runs of the union members worth trying in order.
+
+    Members that can't accept valueClass at all are dropped. For mappings, a Literal typed field shared by
+    the object members acts as a tag: its value selects the members through a dict, skipping members whose
+    Literal rejects it. Members without that field, or values without the tag, keep every candidate.
+    """
+    viable = [plan for plan in memberPlans if __may_accept(plan, valueClass)]
+    runs = tuple(plan.run for plan in viable)
+    if not hasattr(valueClass, "items"):
+        return lambda value: runs
+
+    tags = [__literal_tags(plan) for plan in viable]
+    counts = {}
+    for memberTags in tags:
+        for name in memberTags:
+            counts[name] = counts.get(name, 0) + 1
+    if not counts:
+        return lambda value: runs
+
+    tagField = max(counts, key=counts.get)
+    untagged = tuple(plan.run for plan, memberTags in zip(viable, tags) if tagField not in memberTags)
+    table = {}
+    for key in frozenset().union(*(memberTags.get(tagField, ()) for memberTags in tags)):
+        table[key] = tuple(
+            plan.run for plan, memberTags in zip(viable, tags)
+            if tagField not in memberTags or key in memberTags[tagField]
+        )
+
+    def resolve(value):
         try:
-            deserialized.append(__deserialize_inner(values[index], typeArg, middleware, strict))
-        except Exception as e:
-            raise DeserializeListException(e, values[index], tupleType, index)
-    return tuple(deserialized)
+            tag = value[tagField]
+        except Exception:
+            return runs
+        try:
+            return table.get((type(tag), tag), untagged)
+        except TypeError:
+            # Unhashable tags match no Literal
+            return untagged
 
+    return resolve
 
-def __deserialize_set(values: list, setType: set[type], middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    typeArg = get_args(setType)[0] if get_args(setType) else Any
-    return set(__deserialize_collection_items(values, setType, typeArg, middleware, strict))
 
+def __compile_union(unionType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    members = __union_runner(get_args(unionType), plans, middleware, strict)
 
-def __deserialize_frozenset(values: list, frozenSetType: frozenset[type], middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    typeArg = get_args(frozenSetType)[0] if get_args(frozenSetType) else Any
-    return frozenset(__deserialize_collection_items(values, frozenSetType, typeArg, middleware, strict))
+    def run(value):
+        if value is None:
+            return None
+        return members(value)
 
+    return _Plan(Kind.UNION, unionType, run)
 
-def __deserialize_dict(data: dict, keyType: type, valueType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    middleware = __middleware_or_empty(middleware)
-    deserializedDict = {}
-    for key, value in data.items():
-        try:
-            deserializedKey = __deserialize_inner(key, keyType, middleware, strict)
-        except Exception as e:
-            raise DeserializeDictKeyException(e, key, keyType, valueType)
 
-        try:
-            deserializedValue = __deserialize_inner(value, valueType, middleware, strict)
-        except Exception as e:
-            raise DeserializeDictValueException(e, value, keyType, valueType, key)
+def _object_field_types(classType: type) -> dict[str, type]:
+    """Returns the fields deserialize reads for a simple object, with their types."""
+    attributes = get_attributes(classType)
+    type_hints = get_init_type_hints(classType, include_extras=True)
+    if dataclasses.is_dataclass(classType):
+        type_hints.pop("return", None)
+
+    # Constructor hints take precedence over class level annotations
+    return {**attributes, **type_hints}
+
+
+def __compile_simple_object(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    field_types = _object_field_types(classType)
+    fields = {}
+    field_plans = {}
+
+    named_tuple = is_named_tuple(classType)
+    slots = [] if named_tuple else get_slots(classType)
+    if named_tuple:
+        # Untyped namedtuple fields take any value
+        field_types = {name: field_types.get(name, Any) for name in classType._fields}
+        run = __named_tuple_runner(classType, fields, field_types)
+        build = __named_tuple_builder(classType, field_types)
+    elif slots:
+        run = __slotted_object_runner(classType, slots, fields, field_types, strict)
+        build = __slotted_object_builder(classType, slots, field_types)
+    else:
+        if isinstance(plans, _LazyPlans):
+            run = __lazy_object_runner(classType, fields, field_types, strict)
+        else:
+            run = __object_runner(classType, fields, field_types, strict)
+        build = __object_builder(classType, field_types)
+    if isinstance(plans, _SharedPlans):
+        run = __shared_object_runner(classType, fields, strict, build, run, named_tuple)
+
+    plan = _Plan(Kind.OBJECT, classType, run, (field_plans, field_types, strict, build, named_tuple))
+    # Registered before compiling fields so self-referencing classes resolve to this plan
+    __remember_plan(plans, classType, plan)
+    for name, field_type in field_types.items():
+        # Fields without a usable annotation are copied through as unknown fields
+        if field_type:
+            field_plans[name] = __compile(field_type, plans, middleware, strict)
+            fields[name] = (field_plans[name].run, field_type, field_plans[name].leaf)
+
+    return plan
+
+
+def __object_runner(classType: type, fields: dict, field_types: dict[str, type], strict: bool) -> Callable[[Any], Any]:
+    field_names = set(field_types)
+    new = object.__new__
+
+    def run(data):
+        if data is None:
+            return None
+        cls = new(classType)
+        instance_dict = cls.__dict__
+
+        for name, value in data.items():
+            field = fields.get(name)
+            if field is None:
+                if not strict:
+                    instance_dict[name] = value
+                continue
+
+            fieldRun, field_type, _ = field
+            try:
+                instance_dict[name] = fieldRun(value)
+            except Exception as e:
+                raise DeserializeClassException(e, value, field_type, name)
+
+        if not field_names <= instance_dict.keys():
+            for field in field_types:
+                if field not in instance_dict:
+                    instance_dict[field] = None
+
+        return cls
+
+    return run
+
+
+def __object_builder(classType: type, field_types: dict[str, type]) -> Callable[..., Any]:
+    # Builds an instance from already deserialized fields, for the iterative engine and shared references.
+    # An instance created up front can be passed in, so it can be referenced before its fields are built.
+    def build(values, instance=None):
+        if instance is None:
+            instance = object.__new__(classType)
+        instance_dict = instance.__dict__
+        instance_dict.update(values)
+        if not field_types.keys() <= instance_dict.keys():
+            for field in field_types:
+                if field not in instance_dict:
+                    instance_dict[field] = None
+        return instance
+
+    return build
+
+
+def __slot_setters(classType: type, slots: list[str]) -> dict[str, Callable[[Any, Any], None]]:
+    # The slot descriptors' own setters, which also bypass __setattr__ of frozen dataclasses
+    setters = {}
+    for type in inspect.getmro(classType):
+        for name in slots:
+            descriptor = vars(type).get(name)
+            if name not in setters and hasattr(descriptor, "__set__") and hasattr(descriptor, "__objclass__"):
+                setters[name] = descriptor.__set__
+    return setters
+
+
+def __slotted_object_runner(classType: type, slots: list[str], fields: dict, field_types: dict[str, type], strict: bool) -> Callable[[Any], Any]:
+    setters = __slot_setters(classType, slots)
+    has_dict = bool(getattr(classType, "__dictoffset__", 0))
+    # Fields that can't be stored, because they are neither a slot nor allowed in a __dict__, are dropped
+    field_names = {name for name in field_types if name in setters or has_dict}
+    new = object.__new__
+
+    def run(data):
+        if data is None:
+            return None
+        instance = new(classType)
+
+        for name, value in data.items():
+            field = fields.get(name)
+            if field is not None:
+                fieldRun, field_type, _ = field
+                try:
+                    value = fieldRun(value)
+                except Exception as e:
+                    raise DeserializeClassException(e, value, field_type, name)
+            elif strict:
+                continue
+
+            if (setter := setters.get(name)) is not None:
+                setter(instance, value)
+            elif has_dict:
+                instance.__dict__[name] = value
+
+        if not field_names <= data.keys():
+            for name in field_names - data.keys():
+                if (setter := setters.get(name)) is not None:
+                    setter(instance, None)
+                else:
+                    instance.__dict__[name] = None
+
+        return instance
+
+    return run
+
+
+def __slotted_object_builder(classType: type, slots: list[str], field_types: dict[str, type]) -> Callable[..., Any]:
+    setters = __slot_setters(classType, slots)
+    has_dict = bool(getattr(classType, "__dictoffset__", 0))
+
+    def build(values, instance=None):
+        if instance is None:
+            instance = object.__new__(classType)
+        for name in field_types:
+            values.setdefault(name, None)
+        for name, value in values.items():
+            if (setter := setters.get(name)) is not None:
+                setter(instance, value)
+            elif has_dict:
+                instance.__dict__[name] = value
+        return instance
+
+    return build
+
+
+def __named_tuple_runner(classType: type, fields: dict, field_types: dict[str, type]) -> Callable[[Any], Any]:
+    defaults = classType._field_defaults
+    names = tuple(field_types)
+    new = tuple.__new__
+
+    def run(data):
+        if data is None:
+            return None
+        # Read from a mapping by field name, or from a sequence by position
+        if hasattr(data, "items"):
+            get = data.get
+            values = [get(name, defaults.get(name)) for name in names]
+        else:
+            values = list(data)
+            if len(values) > len(names):
+                raise BaseDeserializationException(Exception(f"Expected at most {len(names)} values, got {len(values)}"), data)
+            values += [defaults.get(name) for name in names[len(values):]]
 
-        deserializedDict[deserializedKey] = deserializedValue
+        for index, name in enumerate(names):
+            fieldRun, field_type, _ = fields[name]
+            value = values[index]
+            try:
+                values[index] = fieldRun(value)
+            except Exception as e:
+                raise DeserializeClassException(e, value, field_type, name)
+        return new(classType, values)
 
-    return deserializedDict
+    return run
 
 
-def __deserialize_union(value: Any, allowed_types: list[type], middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    middleware = __middleware_or_empty(middleware)
-    value_type = type(value)
-    for allowed_type in allowed_types:
-        if allowed_type is Any or value_type is allowed_type:
-            return value
+def __named_tuple_builder(classType: type, field_types: dict[str, type]) -> Callable[..., Any]:
+    defaults = classType._field_defaults
+
+    # Tuples can't be created before their items, so an instance is never passed in
+    def build(values, instance=None):
+        return tuple.__new__(classType, [values.get(name, defaults.get(name)) for name in field_types])
+
+    return build
+
+
+# The objects of the deserialize_references call in progress, by their $id
+__shared_objects: ContextVar[Optional[dict]] = ContextVar("shared_objects", default=None)
+
+
+def __is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and "$ref" in value
+
+
+def __resolve_reference(value: dict) -> Any:
+    objects = __shared_objects.get()
+    reference = value["$ref"]
+    try:
+        return objects[reference]
+    except (KeyError, TypeError):
+        raise BaseDeserializationException(Exception(f"Unknown reference {reference!r}"), value)
+
+
+def __shared_object_runner(classType: type, fields: dict, strict: bool, build: Callable[..., Any], plainRun: Callable[[Any], Any], named_tuple: bool) -> Callable[[Any], Any]:
+    def run(data):
+        if not isinstance(data, dict):
+            return plainRun(data)
+        if "$ref" in data:
+            return __resolve_reference(data)
+
+        reference = data.get("$id")
+        # Registered before the fields are built, so references back to it (cycles) resolve
+        instance = None if named_tuple else object.__new__(classType)
+        if reference is not None and instance is not None:
+            __shared_objects.get()[reference] = instance
+
+        values = {}
+        for name, value in data.items():
+            field = fields.get(name)
+            if field is None:
+                if not strict and name != "$id":
+                    values[name] = value
+                continue
+
+            fieldRun, field_type, _ = field
+            try:
+                values[name] = fieldRun(value)
+            except Exception as e:
+                raise DeserializeClassException(e, value, field_type, name)
+
+        instance = build(values, instance)
+        if reference is not None and named_tuple:
+            __shared_objects.get()[reference] = instance
+        return instance
+
+    return run
+
+
+def __lazy_object_runner(classType: type, fields: dict, field_types: dict[str, type], strict: bool) -> Callable[[Any], Any]:
+    lazyClass = __lazy_class(classType, list(field_types))
+    # Set through the slot descriptor, which also works for frozen dataclasses
+    setPending = lazyClass._pending.__set__
+    new = object.__new__
+
+    def run(data):
+        if data is None:
+            return None
+        cls = new(lazyClass)
+        instance_dict = cls.__dict__
+        pending = {}
+
+        for name, value in data.items():
+            field = fields.get(name)
+            if field is None:
+                if not strict:
+                    instance_dict[name] = value
+                continue
+
+            fieldRun, field_type, leaf = field
+            if not leaf and value is not None:
+                pending[name] = value
+                continue
+            try:
+                instance_dict[name] = fieldRun(value)
+            except Exception as e:
+                raise DeserializeClassException(e, value, field_type, name)
+
+        for field in field_types:
+            if field not in instance_dict and field not in pending:
+                instance_dict[field] = None
+
+        setPending(cls, (fields, tuple(data), pending) if pending else None)
+        return cls
+
+    return run
+
+
+def _materialize_field(instance: Any, name: str) -> Any:
+    fields, _, pending = instance._pending
+    value = pending.pop(name)
+    instance_dict = instance.__dict__
+    if name in instance_dict:
+        # Assigned since it was deferred, the raw value is stale
+        return instance_dict[name]
+    fieldRun, field_type, _ = fields[name]
+    try:
+        result = fieldRun(value)
+    except Exception as e:
+        # Wrapped like a failure of deserialize(data, classType) on the whole object would be
+        pending[name] = value
+        raise DeserializeClassException(DeserializeClassException(e, value, field_type, name), value, instance.__class__, None)
+    instance_dict[name] = result
+    return result
+
+
+class _LazyField:
+    """
+    Non-data descriptor deserializing a deferred field on first read.
+
+    It sits on the lazy subclass, so it shadows class level defaults of the field, while the
+    deserialized value it stores in the instance __dict__ shadows it on every later read. Values
+    assigned to the field before its first read shadow it the same way, and are kept by materialize.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type):
+        name = self.name
+        if instance is None:
+            return getattr(owner.__mro__[1], name)
+        pending = instance._pending
+        if pending is not None and name in pending[2]:
+            return _materialize_field(instance, name)
+        raise AttributeError(f"'{owner.__mro__[1].__name__}' object has no attribute '{name}'")
+
+
+def __lazy_reduce_ex(self, protocol: int):
+    # Pickled and copied as a plain, fully deserialized instance of the real class
+    materialize(self)
+    return (object.__new__, (self.__class__,), dict(self.__dict__))
+
+
+__lazy_classes = TypeCache()
+
+
+def __lazy_class(classType: type, field_names: list[str]) -> type:
+    """
+    Returns the subclass lazily deserialized instances of classType are created as.
+
+    It keeps the raw values of deferred fields in a slot, deserializes them through a _LazyField on first read,
+    and reports classType as its __class__ so equality and isinstance checks treat it as classType.
+    """
+    lazyClass = __lazy_classes.lookup(classType)
+    if lazyClass is None:
+        lazyClass = type(classType.__name__, (classType,), {
+            "__slots__": ("_pending",),
+            "__module__": classType.__module__,
+            "__qualname__": classType.__qualname__,
+            "__pserialize_lazy__": True,
+            "__class__": property(lambda self: classType),
+            "__reduce_ex__": __lazy_reduce_ex,
+            **{name: _LazyField(name) for name in field_names},
+        })
+        __lazy_classes.remember(classType, lazyClass)
+    return lazyClass
+
+
+def is_lazy(value: Any) -> bool:
+    """Whether value is a lazily deserialized object."""
+    return type(value) is not value.__class__ and getattr(type(value), "__pserialize_lazy__", False)
+
 
-    for allowed_type in allowed_types:
+def materialize(value: Any) -> Any:
+    """
+    Deserializes every deferred field of a lazily deserialized object, restoring the field order of its data.
+
+    Nested lazy objects stay lazy. Values that aren't lazy are returned unchanged.
+    """
+    if not is_lazy(value) or value._pending is None:
+        return value
+    _, order, pending = value._pending
+    for name in list(pending):
+        _materialize_field(value, name)
+    type(value)._pending.__set__(value, None)
+
+    instance_dict = value.__dict__
+    ordered = {name: instance_dict[name] for name in order if name in instance_dict}
+    ordered.update(instance_dict)
+    instance_dict.clear()
+    instance_dict.update(ordered)
+    return value
+
+
+def __compile_object(classType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    # Only the class declaring the discriminator dispatches, its subclasses deserialize as themselves
+    discriminator = vars(classType).get("__discriminator__")
+    if isinstance(discriminator, Discriminator):
+        return __compile_tagged(classType, discriminator.field, lambda: get_subclasses(classType), plans, middleware, strict)
+    return __compile_simple_object(classType, plans, middleware, strict)
+
+
+def __compile_annotated(annotatedType: type, plans: dict[type, _Plan], middleware: DeserializationMiddleware, strict: bool) -> _Plan:
+    realType = annotatedType.__origin__
+    for metadata in annotatedType.__metadata__:
+        if isinstance(metadata, Discriminator):
+            members = get_args(realType) if is_union(realType) else (realType,)
+            members = [member for member in members if member is not type(None)]
+            return __compile_tagged(annotatedType, metadata.field, lambda: members, plans, middleware, strict)
+    # Other metadata doesn't affect deserialization
+    return __compile(realType, plans, middleware, strict)
+
+
+def __compile_tagged(
+    classType: type,
+    field: str,
+    members: Callable[[], list[type]],
+    plans: dict[type, _Plan],
+    middleware: DeserializationMiddleware,
+    strict: bool
+) -> _Plan:
+    """
+    Compiles a plan reading the tag in value[field] and handing the value to the member class it names.
+
+    The tag is dropped from the value for members that don't declare field themselves. Members are
+    looked up again when a tag is unknown, to pick up subclasses defined after compiling.
+    """
+    table = {}
+
+    def add_members():
+        for member in members():
+            plan = __compile(member, plans, middleware, strict)
+            strip = plan.kind is Kind.OBJECT and field not in plan.args[1]
+            for tag in get_tags(member, field):
+                table.setdefault(tag, (plan.run, strip))
+
+    shared = isinstance(plans, _SharedPlans)
+
+    def run(value):
+        if value is None:
+            return None
+        if shared and __is_reference(value):
+            return __resolve_reference(value)
         try:
-            return __deserialize_inner(value, allowed_type, middleware, strict)
+            tag = value[field]
         except Exception:
-            pass
+            raise BaseDeserializationException(Exception(f"Expected discriminator field '{field}'"), value)
+        try:
+            entry = table.get(tag)
+            if entry is None:
+                add_members()
+                entry = table.get(tag)
+        except TypeError:
+            entry = None
+        if entry is None:
+            raise BaseDeserializationException(Exception(f"Unknown {field} {tag!r} for {type_args_string(classType)}"), value)
+
+        memberRun, strip = entry
+        if strip:
+            value = {key: item for key, item in value.items() if key != field}
+        return memberRun(value)
+
+    plan = _Plan(Kind.UNION, classType, run)
+    # Registered before compiling members so members referring back to classType resolve to this plan
+    __remember_plan(plans, classType, plan)
+    add_members()
+    return plan
+
+
+__middleware_exempt_kinds = {Kind.ANY, Kind.LITERAL, Kind.TYPEVAR}
+
+__plan_builders = {
+    Kind.ANY: __compile_any,
+    Kind.NONE: __compile_none,
+    Kind.PRIMITIVE: __compile_primitive,
+    Kind.EXTENDED_PRIMITIVE: __compile_primitive,
+    Kind.ENUM: __compile_primitive,
+    Kind.LIST: __compile_collection,
+    Kind.TUPLE: __compile_tuple,
+    Kind.SET: __compile_collection,
+    Kind.FROZENSET: __compile_collection,
+    Kind.DICT: __compile_dict,
+    Kind.UNION: __compile_union,
+    Kind.OPTIONAL: __compile_optional,
+    Kind.LITERAL: __compile_literal,
+    Kind.TYPEVAR: __compile_type_var,
+    Kind.ANNOTATED: __compile_annotated,
+    Kind.BINARY: __compile_binary,
+    Kind.ARRAY: __compile_array,
+    Kind.OBJECT: __compile_object,
+}
+
+
+# Sentinel for "no value yet" in the iterative engine
+_PENDING = object()
+
+
+class _CollectionFrame:
+    """Iterative deserialization state of a list, set, frozenset or tuple[T, ...]."""
+
+    __slots__ = ("plan", "itemPlan", "items", "output", "index", "value")
+
+    def __init__(self, plan: _Plan, values: Any):
+        self.plan = plan
+        self.itemPlan = plan.args[0][0] if plan.kind is Kind.TUPLE else plan.args[0]
+        self.items = enumerate(values)
+        self.output = []
+        if self.itemPlan.kind is Kind.PRIMITIVE and self.itemPlan.classType in primitiveTypes:
+            converted = _convert_primitives(self.itemPlan.classType, values)
+            if converted is not None:
+                self.items = enumerate(())
+                self.output = converted
+        self.index = None
+        self.value = None
+
+    def next_child(self):
+        itemPlan = self.itemPlan
+        if itemPlan.leaf:
+            append = self.output.append
+            run = itemPlan.run
+            index = value = None
+            try:
+                for index, value in self.items:
+                    append(run(value))
+            except Exception:
+                self.index, self.value = index, value
+                raise
+            return _PENDING
+
+        for self.index, self.value in self.items:
+            return self.value, itemPlan
+        return _PENDING
+
+    def store(self, result: Any):
+        self.output.append(result)
+
+    def close(self):
+        kind = self.plan.kind
+        if kind is Kind.LIST:
+            return self.output
+        if kind is Kind.SET:
+            return set(self.output)
+        if kind is Kind.FROZENSET:
+            return frozenset(self.output)
+        return tuple(self.output)
+
+    def wrap(self, error: Exception) -> Exception:
+        return DeserializeListException(error, self.value, self.plan.classType, self.index)
+
+
+class _TupleFrame:
+    """Iterative deserialization state of a fixed length tuple."""
+
+    __slots__ = ("plan", "values", "output", "index", "value")
+
+    def __init__(self, plan: _Plan, values: Any):
+        itemPlans = plan.args[0]
+        if len(values) != len(itemPlans):
+            raise BaseDeserializationException(Exception(f"Expected tuple of length {len(itemPlans)}, got {len(values)}"), values)
+        self.plan = plan
+        self.values = values
+        self.output = []
+        self.index = -1
+        self.value = None
+
+    def next_child(self):
+        itemPlans = self.plan.args[0]
+        while self.index + 1 < len(itemPlans):
+            self.index += 1
+            self.value = None
+            self.value = self.values[self.index]
+            itemPlan = itemPlans[self.index]
+            if not itemPlan.leaf:
+                return self.value, itemPlan
+            self.output.append(itemPlan.run(self.value))
+        return _PENDING
+
+    def store(self, result: Any):
+        self.output.append(result)
+
+    def close(self):
+        return tuple(self.output)
+
+    def wrap(self, error: Exception) -> Exception:
+        return DeserializeListException(error, self.value, self.plan.classType, self.index)
+
+
+class _DictFrame:
+    """Iterative deserialization state of a dict. Keys are hashable and shallow, so they use run."""
+
+    __slots__ = ("plan", "items", "output", "key", "value", "deserializedKey", "in_key")
+
+    def __init__(self, plan: _Plan, data: Any):
+        self.plan = plan
+        self.items = iter(data.items())
+        self.output = {}
+        self.key = self.value = self.deserializedKey = None
+        self.in_key = False
+
+    def next_child(self):
+        keyPlan, valuePlan = self.plan.args[:2]
+        for self.key, self.value in self.items:
+            self.in_key = True
+            deserializedKey = keyPlan.run(self.key)
+            self.in_key = False
+            if not valuePlan.leaf:
+                self.deserializedKey = deserializedKey
+                return self.value, valuePlan
+            self.output[deserializedKey] = valuePlan.run(self.value)
+        return _PENDING
+
+    def store(self, result: Any):
+        self.output[self.deserializedKey] = result
+
+    def close(self):
+        return self.output
+
+    def wrap(self, error: Exception) -> Exception:
+        _, _, keyType, valueType = self.plan.args
+        if self.in_key:
+            return DeserializeDictKeyException(error, self.key, keyType, valueType)
+        return DeserializeDictValueException(error, self.value, keyType, valueType, self.key)
+
+
+class _ObjectFrame:
+    """Iterative deserialization state of a simple object, slotted object or NamedTuple."""
+
+    __slots__ = ("plan", "values", "items", "name", "value")
+
+    def __init__(self, plan: _Plan, data: Any):
+        _, field_types, _, _, named_tuple = plan.args
+        self.plan = plan
+        self.values = {}
+        if named_tuple and not hasattr(data, "items"):
+            data = list(data)
+            if len(data) > len(field_types):
+                raise BaseDeserializationException(Exception(f"Expected at most {len(field_types)} values, got {len(data)}"), data)
+            self.items = zip(field_types, data)
+        else:
+            self.items = iter(data.items())
+        self.name = self.value = None
 
-    raise BaseDeserializationException(Exception("Could not deserialize union"), value)
+    def next_child(self):
+        field_plans, _, strict, _, _ = self.plan.args
+        values = self.values
+        for name, value in self.items:
+            fieldPlan = field_plans.get(name)
+            if fieldPlan is None:
+                if not strict:
+                    values[name] = value
+                continue
 
+            self.name, self.value = name, value
+            if not fieldPlan.leaf:
+                return value, fieldPlan
+            values[name] = fieldPlan.run(value)
+        return _PENDING
 
-def __deserialize_literal(value: Any, literalType: type):
-    allowed_values = get_args(literalType)
-    for literal_value in allowed_values:
-        if __literal_matches(value, literal_value):
-            return value
-    raise BaseDeserializationException(Exception(f"Expected one of {allowed_values}"), value)
+    def store(self, result: Any):
+        self.values[self.name] = result
 
+    def close(self):
+        return self.plan.args[3](self.values)
 
-def __deserialize_type_var(value: Any, typeVar: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    constraints = getattr(typeVar, "__constraints__", ())
-    if constraints:
-        return __deserialize_union(value, constraints, middleware, strict)
+    def wrap(self, error: Exception) -> Exception:
+        field_types = self.plan.args[1]
+        return DeserializeClassException(error, self.value, field_types[self.name], self.name)
 
-    bound = getattr(typeVar, "__bound__", None)
-    if bound is not None:
-        return __deserialize_inner(value, bound, middleware, strict)
 
-    return value
+def __open_tuple(plan: _Plan, values: Any):
+    _, variadic = plan.args
+    return _CollectionFrame(plan, values) if variadic else _TupleFrame(plan, values)
+
 
+__frames = {
+    Kind.LIST: _CollectionFrame,
+    Kind.SET: _CollectionFrame,
+    Kind.FROZENSET: _CollectionFrame,
+    Kind.TUPLE: __open_tuple,
+    Kind.DICT: _DictFrame,
+    Kind.OBJECT: _ObjectFrame,
+}
 
-def deserialize(value: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+
+def __run_iterative(plan: _Plan, value: Any):
+    steps = __run_steps(plan, value, None)
+    try:
+        next(steps)
+    except StopIteration as done:
+        return done.value
+
+
+def __run_steps(plan: _Plan, value: Any, pacer: Optional[Pacer]):
+    # Structured plans push a frame, leaf plans run directly. On failure the error is wrapped by every
+    # open frame from the innermost outwards, rebuilding the exception chain of the recursive plans.
+    # Without a pacer this never yields, with one it yields None when due to pause and yields the
+    # awaitables returned by coroutine middleware to get them resolved.
+    stack = []
     try:
-        return __deserialize_inner(value, classType, __middleware_or_empty(middleware), strict)
+        while True:
+            if pacer is not None and pacer.due():
+                yield None
+
+            result = _PENDING
+            while True:
+                if plan.leaf:
+                    result = plan.run(value)
+                    break
+                kind = plan.kind
+                if kind is None:
+                    result = plan.run(value)
+                    if pacer is not None:
+                        result = yield result
+                    break
+                if kind is Kind.OPTIONAL:
+                    if value is None:
+                        result = None
+                        break
+                    plan = plan.args[0]
+                elif kind is Kind.TYPEVAR:
+                    plan = plan.args[0]
+                elif value is None:
+                    result = None
+                    break
+                else:
+                    stack.append(__frames[kind](plan, value))
+                    break
+
+            while True:
+                if result is not _PENDING:
+                    if not stack:
+                        return result
+                    stack[-1].store(result)
+
+                child = stack[-1].next_child()
+                if child is not _PENDING:
+                    value, plan = child
+                    break
+                result = stack.pop().close()
     except Exception as e:
-        raise DeserializeClassException(e, value, classType, None)
+        for frame in reversed(stack):
+            e = frame.wrap(e)
+        raise e
+
+
+def __plan_for(
+    classType: type,
+    middleware: Optional[DeserializationMiddleware],
+    strict: bool,
+    lazy: bool = False,
+    shared: bool = False,
+    columnar: bool = False
+) -> _Plan:
+    middleware, plans = __plans_for(__middleware_or_empty(middleware), strict, lazy, shared, columnar)
+    return __compile(classType, plans, middleware, strict)
+
 
+def __hit_recursion_limit(error: Exception) -> bool:
+    while isinstance(error, BaseDeserializationException):
+        error = error.error
+    return isinstance(error, RecursionError)
 
-def __deserialize_inner(value: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
-    middleware = __middleware_or_empty(middleware)
 
-    def deserialize_primitive(classType: type, value: Any):
+def _plan_kind(classType: type, middleware: Optional[DeserializationMiddleware], strict: bool) -> Optional[Kind]:
+    """Returns the kind classType deserializes as, or None when middleware or a compile failure handles it."""
+    return __plan_for(classType, middleware, strict).kind
+
+
+def _plan(classType: type, middleware: Optional[DeserializationMiddleware], strict: bool) -> _Plan:
+    """Returns the plan deserialize runs for classType, for readers that walk it over their own input."""
+    return __plan_for(classType, middleware, strict)
+
+
+def _item_deserializer(listType: type, middleware: Optional[DeserializationMiddleware], strict: bool) -> Callable[[Any], Any]:
+    """
+    Returns a function deserializing single items of listType, for callers that feed items one at a time.
+
+    Raises TypeError when listType does not deserialize as a list.
+    """
+    plan = __plan_for(listType, middleware, strict)
+    if plan.kind is not Kind.LIST:
+        raise TypeError(f"Expected a list type, got {type_args_string(listType)}")
+    itemPlan = plan.args[0]
+    itemRun = itemPlan.run
+
+    def run(value):
         try:
-            return classType(value)
+            return itemRun(value)
         except Exception as e:
-            raise BaseDeserializationException(e, value)
+            if __hit_recursion_limit(e):
+                return __run_iterative(itemPlan, value)
+            raise
+
+    return run
+
+
+def deserialize(
+    value: Any,
+    classType: type,
+    middleware: Optional[DeserializationMiddleware] = None,
+    strict: bool = False,
+    lazy: bool = False,
+    intern_strings: bool = False
+):
+    """
+    Deserializes a value into classType.
+
+    bytes, bytearray and memoryview accept any bytes-like value or a base64 string, array.array accepts
+    the {"typecode": ..., "data": ...} form serialize writes.
+
+    With lazy=True, structured fields of objects (nested objects, collections, dicts) are kept as the raw
+    value and only deserialized when first read, failing then with the same DeserializeClassException
+    a full deserialize of that object would raise.
+
+    With intern_strings=True, equal values deserialized as str share a single str object within the call,
+    so repeated values like names or codes are only kept in memory once.
+    """
+    middleware, plans = __plans_for(__middleware_or_empty(middleware), strict, lazy, intern_strings=intern_strings)
+    plan = __compile(classType, plans, middleware, strict)
+    try:
+        return plan.run(value)
+    except Exception as e:
+        if __hit_recursion_limit(e):
+            # Values nested deeper than the recursion limit are retried without recursion
+            return deserialize_iterative(value, classType, middleware, strict)
+        raise DeserializeClassException(e, value, classType, None)
+    finally:
+        if plans.strings:
+            plans.strings.clear()
 
-    if classType is Any:
-        return value
-    if __is_literal(classType):
-        return __deserialize_literal(value, classType)
-    if __is_type_var(classType):
-        return __deserialize_type_var(value, classType, middleware, strict)
-    if (deserializer := middleware.get(classType, None)) is not None:
-        return deserializer(value, middleware)
-    if value is None:
-        return None
-    if is_primitive(classType):
-        return deserialize_primitive(classType, value)
-    if is_enum(classType):
-        return deserialize_primitive(classType, value)
-    if is_optional(classType):
-        realType = [arg for arg in get_args(classType) if arg is not type(None)][0]
-        return __deserialize_inner(value, realType, middleware, strict)
-
-    originType = get_origin(classType)
-    typeArgs = get_args(classType)
-    if originType is list:
-        return __deserialize_list(value, classType, middleware, strict)
-    if originType is tuple:
-        return __deserialize_tuple(value, classType, middleware, strict)
-    if originType is set:
-        return __deserialize_set(value, classType, middleware, strict)
-    if originType is frozenset:
-        return __deserialize_frozenset(value, classType, middleware, strict)
-    if originType is dict:
-        keyType = typeArgs[0] if len(typeArgs) > 0 else Any
-        valueType = typeArgs[1] if len(typeArgs) > 1 else Any
-        return __deserialize_dict(value, keyType, valueType, middleware, strict)
-    if is_union(classType):
-        return __deserialize_union(value, get_args(classType), middleware, strict)
-
-    return __deserialize_simple_object(value, classType, middleware, strict)
+
+def deserialize_references(value: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+    """
+    Deserializes a value written by serialize_references, restoring shared and cyclic references.
+
+    An object with an "$id" is built once and every {"$ref": id} resolves to that same instance, including
+    references back to an object whose fields are still being built. NamedTuples are only registered once
+    complete, so references to them can't be cyclic. Values are deserialized recursively.
+    """
+    plan = __plan_for(classType, middleware, strict, shared=True)
+    token = __shared_objects.set({})
+    try:
+        return plan.run(value)
+    except Exception as e:
+        raise DeserializeClassException(e, value, classType, None)
+    finally:
+        __shared_objects.reset(token)
+
+
+def deserialize_columnar(value: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+    """
+    Deserializes a value written by serialize_columnar.
+
+    Lists, sets and tuples of objects written as {"$columns": {...}} are read a column at a time, each
+    field's values converted in one loop and dictionary encoded columns decoded once per distinct value,
+    before the objects are built. Columns are only expected where classType has a collection type, values
+    read as Any or through unannotated fields are returned as written. Values are deserialized recursively.
+    """
+    plan = __plan_for(classType, middleware, strict, columnar=True)
+    try:
+        return plan.run(value)
+    except Exception as e:
+        raise DeserializeClassException(e, value, classType, None)
+
+
+def deserialize_iterative(value: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+    """
+    Deserializes a value like deserialize, using an explicit work stack instead of recursion.
+
+    Arbitrarily deep values can be deserialized, and failures raise the same exception chain as
+    deserialize. Dict keys, union members and middleware are still run recursively.
+    """
+    try:
+        return __run_iterative(__plan_for(classType, middleware, strict), value)
+    except Exception as e:
+        raise DeserializeClassException(e, value, classType, None)
+
+
+async def deserialize_async(
+    value: Any,
+    classType: type,
+    middleware: Optional[DeserializationMiddleware] = None,
+    strict: bool = False,
+    yield_every: int = 1000,
+    time_slice: Optional[float] = None
+):
+    """
+    Deserializes a value like deserialize_iterative, handing control back to the event loop as it goes.
+
+    Middleware may be coroutine functions, which are awaited. Dict keys and union members are still
+    deserialized synchronously, so their middleware can't be asynchronous. Lists of leaf items, like
+    list[int], are deserialized in one step.
+
+    Args:
+        value (Any): The value to deserialize
+        classType (type): The type to deserialize into
+        yield_every (int, optional): Number of nodes deserialized between yields. Defaults to 1000.
+        time_slice (float, optional): Also yield once this many seconds passed since the last yield. Defaults to None.
+    """
+    try:
+        steps = __run_steps(__plan_for(classType, middleware, strict), value, Pacer(yield_every, time_slice))
+        try:
+            awaitable = next(steps)
+            while True:
+                if awaitable is None:
+                    await asyncio.sleep(0)
+                    awaitable = steps.send(None)
+                    continue
+                try:
+                    result = await awaitable
+                except Exception as e:
+                    # Raised inside the walk so it fails exactly like synchronous middleware would
+                    awaitable = steps.throw(e)
+                    continue
+                awaitable = steps.send(result)
+        except StopIteration as done:
+            return done.value
+    except Exception as e:
+        raise DeserializeClassException(e, value, classType, None)
@@ -0,0 +1,73 @@
+from typing import Any, Callable
+
+try:
+    import numpy
+    from numpy.lib.format import descr_to_dtype, dtype_to_descr
+except ImportError:
+    # numpy is optional, the middleware below is only registered when it is installed
+    numpy = None
+
+from ..serialization_utils import decode_base64
+
+
+class _ndarray:
+    """
+    Middleware for numpy.ndarray.
+
+    serializer writes a {"dtype", "shape", "data"} record whose data is a view of the array's own buffer,
+    so it is passed through like any other buffer and only text targets encode it (as base64).
+    list_serializer writes nested lists through the vectorized tolist() instead.
+    deserializer reads either form into a new array without looping over the elements in Python.
+    """
+    @staticmethod
+    def serializer(obj: Any, middleware: dict[type, Callable[[object], type]] = {}) -> Any:
+        if obj.dtype.hasobject:
+            # Python objects have no raw buffer to write
+            return obj.tolist()
+        # Only arrays that aren't C-contiguous yet are copied, once
+        contiguous = obj if obj.flags.c_contiguous else obj.copy(order="C")
+        return {
+            "dtype": dtype_to_descr(contiguous.dtype),
+            "shape": list(contiguous.shape),
+            "data": memoryview(contiguous.reshape(-1).view(numpy.uint8)),
+        }
+
+    @staticmethod
+    def list_serializer(obj: Any, middleware: dict[type, Callable[[object], type]] = {}) -> list:
+        return obj.tolist()
+
+    @staticmethod
+    def deserializer(value: Any, middleware: dict[type, Callable[[object], type]] = {}) -> Any:
+        return _ndarray.__read(value, copy=True)
+
+    @staticmethod
+    def view_deserializer(value: Any, middleware: dict[type, Callable[[object], type]] = {}) -> Any:
+        """Like deserializer, but returns a view of the record's buffer, which is read-only for bytes and base64."""
+        return _ndarray.__read(value, copy=False)
+
+    @staticmethod
+    def __read(value: Any, copy: bool) -> Any:
+        if not isinstance(value, dict):
+            return numpy.array(value) if copy else numpy.asarray(value)
+
+        data = value["data"]
+        if isinstance(data, str):
+            data = decode_base64(data)
+        dtype = descr_to_dtype(_ndarray.__descr(value["dtype"]))
+        array = numpy.frombuffer(data, dtype=dtype).reshape(value["shape"])
+        # The buffer belongs to the serialized value, a single copy gives the array its own memory
+        return array.copy() if copy else array
+
+    @staticmethod
+    def __descr(descr: Any) -> Any:
+        # Structured dtypes are described by (name, format[, shape]) tuples, which JSON turns into lists
+        if not isinstance(descr, list):
+            return descr
+        fields = []
+        for name, format, *shape in descr:
+            fields.append((tuple(name) if isinstance(name, list) else name, _ndarray.__descr(format), *map(tuple, shape)))
+        return fields
+
+
+SERIALIZATION_MIDDLEWARE = {numpy.ndarray: _ndarray.serializer} if numpy is not None else {}
+DESERIALIZATION_MIDDLEWARE = {numpy.ndarray: _ndarray.deserializer} if numpy is not None else {}
@@ -0,0 +1,443 @@
+import struct
+from typing import Any, Callable, Optional
+
+from .deserialize_impl import (
+    DeserializeClassException,
+    DeserializeDictKeyException,
+    DeserializeDictValueException,
+    DeserializeListException,
+    _Plan,
+    _plan
+)
+from .serialize import SerializeCycleException, _Tagged, _object_fields, _serialize_inner, _with_tag
+from .serialization_utils import Kind, array_to_bytes, classify
+
+
+SerializationMiddleware = dict[type, Callable[[object], type]]
+DeserializationMiddleware = dict[type, Callable[[object], object]]
+
+# Every value starts with a tag byte:
+#   0x00 - 0x7f  int 0 to 127
+#   0x80 - 0x9f  str of up to 31 UTF-8 bytes, which follow
+#   0xa0 - 0xaf  list of up to 15 items, which follow
+#   0xb0 - 0xbf  map of up to 15 key and value pairs, which follow
+#   0xc0         None
+#   0xc1         map key written before, followed by its index
+#   0xc2, 0xc3   False, True
+#   0xc4, 0xc5   bytes, str, followed by their length and their bytes
+#   0xc6, 0xc7   list, map, followed by their number of items and the items
+#   0xc8         int, followed by its zigzag encoding
+#   0xc9         float, followed by its 8 byte big-endian IEEE 754 double
+#   0xe0 - 0xff  int -32 to -1
+# Lengths, counts and indices are varints, 7 bits per byte starting with the lowest. Strings used as map
+# keys are numbered in the order they first appear, later occurrences are written as that number.
+__FIXSTR = 0x80
+__FIXLIST = 0xa0
+__FIXMAP = 0xb0
+__NONE = 0xc0
+__KEY = 0xc1
+__FALSE = 0xc2
+__TRUE = 0xc3
+__BYTES = 0xc4
+__STR = 0xc5
+__LIST = 0xc6
+__MAP = 0xc7
+__INT = 0xc8
+__FLOAT = 0xc9
+
+__ITERABLE_KINDS = {Kind.LIST, Kind.TUPLE, Kind.SET, Kind.FROZENSET}
+__COLLECTION_TYPES = {Kind.LIST: list, Kind.SET: set, Kind.FROZENSET: frozenset}
+__NO_MIDDLEWARE = {}
+__pack_float = struct.Struct(">Bd").pack
+__unpack_float = struct.Struct(">d").unpack_from
+
+
+def __middleware_or_empty(middleware: Optional[dict]) -> dict:
+    return middleware if middleware is not None else {}
+
+
+def __write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def __write_int(out: bytearray, value: int):
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -0x20 <= value < 0:
+        out.append(value & 0xff)
+    else:
+        out.append(__INT)
+        __write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def __write_str(out: bytearray, value: str):
+    # surrogatepass keeps lone surrogates, which JSON would write as escapes
+    data = value.encode("utf-8", "surrogatepass")
+    size = len(data)
+    if size < 0x20:
+        out.append(__FIXSTR | size)
+    else:
+        out.append(__STR)
+        __write_varint(out, size)
+    out += data
+
+
+def __write_header(out: bytearray, size: int, fixed: int, tag: int):
+    if size < 0x10:
+        out.append(fixed | size)
+    else:
+        out.append(tag)
+        __write_varint(out, size)
+
+
+def __write_key(out: bytearray, key: str, keys: dict[str, bytes]):
+    reference = keys.get(key)
+    if reference is None:
+        # The bytes referring back to the key are built once, when it is first written
+        reference = bytearray([__KEY])
+        __write_varint(reference, len(keys))
+        keys[key] = bytes(reference)
+        __write_str(out, key)
+    else:
+        out += reference
+
+
+def __write(out: bytearray, value: Any, middleware: SerializationMiddleware, visited: set[int], keys: dict[str, bytes]):
+    classType = type(value)
+    if middleware and (serializer := middleware.get(classType, None)) is not None:
+        # Middleware output is already serialized, so it is written as plain values
+        __write(out, serializer(value, middleware), __NO_MIDDLEWARE, visited, keys)
+    elif classType is str:
+        __write_str(out, value)
+    elif classType is int:
+        __write_int(out, value)
+    elif classType is float:
+        out += __pack_float(__FLOAT, value)
+    elif classType is bool:
+        out.append(__TRUE if value else __FALSE)
+    elif value is None:
+        out.append(__NONE)
+    else:
+        tag = None
+        if classType is _Tagged:
+            # Objects read from a discriminated field are written with their tag ahead of their fields
+            value, tag = value.value, value.tag
+            classType = type(value)
+            if middleware and (serializer := middleware.get(classType, None)) is not None:
+                __write(out, _with_tag(serializer(value, middleware), tag), __NO_MIDDLEWARE, visited, keys)
+                return
+        kind = classify(classType)
+        if kind is Kind.OBJECT or kind is Kind.DICT or kind in __ITERABLE_KINDS:
+            reference = id(value)
+            if reference in visited:
+                raise SerializeCycleException("Cannot serialize cyclic object graph")
+            visited.add(reference)
+            try:
+                if kind is Kind.OBJECT:
+                    fields = _with_tag(_object_fields(value), tag)
+                    __write_header(out, len(fields), __FIXMAP, __MAP)
+                    for name, field in fields.items():
+                        if (written := keys.get(name)) is not None:
+                            out += written
+                        else:
+                            __write_key(out, name, keys)
+                        __write(out, field, middleware, visited, keys)
+                elif kind is Kind.DICT:
+                    __write_header(out, len(value), __FIXMAP, __MAP)
+                    for key, item in value.items():
+                        if key.__class__ is not str:
+                            key = _serialize_inner(key, middleware, visited)
+                        if isinstance(key, str):
+                            __write_key(out, key, keys)
+                        else:
+                            __write(out, key, __NO_MIDDLEWARE, visited, keys)
+                        __write(out, item, middleware, visited, keys)
+                else:
+                    __write_header(out, len(value), __FIXLIST, __LIST)
+                    for item in value:
+                        __write(out, item, middleware, visited, keys)
+            finally:
+                visited.remove(reference)
+        elif kind is Kind.ENUM:
+            __write(out, value.value, middleware, visited, keys)
+        elif kind is Kind.BINARY:
+            if classType is memoryview:
+                value = value.cast("B") if value.c_contiguous else value.tobytes()
+            out.append(__BYTES)
+            __write_varint(out, len(value))
+            out += value
+        elif kind is Kind.ARRAY:
+            __write(out, {"typecode": value.typecode, "data": array_to_bytes(value)}, __NO_MIDDLEWARE, visited, keys)
+        elif isinstance(value, str):
+            __write_str(out, value)
+        elif isinstance(value, int):
+            __write_int(out, value)
+        elif isinstance(value, float):
+            out += __pack_float(__FLOAT, value)
+        else:
+            __write(out, _serialize_inner(value, middleware, visited), __NO_MIDDLEWARE, visited, keys)
+
+
+def pack(value: Any, middleware: Optional[SerializationMiddleware] = None) -> bytes:
+    """
+    Serializes an object straight to a compact binary document.
+
+    The object graph is written as it is walked, without building the primitive tree serialize returns.
+    The document holds the same values, but ints and lengths are written as varints, binary values as
+    raw bytes, and each map key string only once, later occurrences referring back to it.
+    Middleware and cycle detection behave as in serialize. Values are written recursively.
+
+    Args:
+        value (Any): The value to serialize
+
+    Returns:
+        bytes: The binary document, read back with unpack
+    """
+    out = bytearray()
+    __write(out, value, __middleware_or_empty(middleware), set(), {})
+    return bytes(out)
+
+
+def __truncated() -> ValueError:
+    return ValueError("Truncated packed data")
+
+
+def __read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    try:
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            return byte, pos
+        value = byte & 0x7f
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value, pos
+            shift += 7
+    except IndexError:
+        raise __truncated() from None
+
+
+def __read_bytes(data: bytes, pos: int, size: int) -> tuple[bytes, int]:
+    end = pos + size
+    if end > len(data):
+        raise __truncated()
+    return data[pos:end], end
+
+
+def __read_count(data: bytes, pos: int, tag: int) -> tuple[int, int]:
+    # pos is the position of the list or map tag
+    if tag < __NONE:
+        return tag & 0x0f, pos + 1
+    return __read_varint(data, pos + 1)
+
+
+def __read(data: bytes, pos: int, keys: list[str]) -> tuple[Any, int]:
+    """Reads the value at pos as serialize would have returned it, with the position following it."""
+    try:
+        tag = data[pos]
+    except IndexError:
+        raise __truncated() from None
+
+    if tag < __FIXSTR:
+        return tag, pos + 1
+    if tag < __FIXLIST:
+        value, pos = __read_bytes(data, pos + 1, tag & 0x1f)
+        return value.decode("utf-8", "surrogatepass"), pos
+    if tag < __FIXMAP or tag == __LIST:
+        count, pos = __read_count(data, pos, tag)
+        values = []
+        append = values.append
+        for _ in range(count):
+            value, pos = __read(data, pos, keys)
+            append(value)
+        return values, pos
+    if tag < __NONE or tag == __MAP:
+        count, pos = __read_count(data, pos, tag)
+        values = {}
+        for _ in range(count):
+            key, pos = __read_key(data, pos, keys)
+            values[key], pos = __read(data, pos, keys)
+        return values, pos
+    if tag >= 0xe0:
+        return tag - 0x100, pos + 1
+    if tag == __NONE:
+        return None, pos + 1
+    if tag == __FALSE:
+        return False, pos + 1
+    if tag == __TRUE:
+        return True, pos + 1
+    if tag == __FLOAT:
+        if pos + 9 > len(data):
+            raise __truncated()
+        return __unpack_float(data, pos + 1)[0], pos + 9
+    if tag == __INT:
+        value, pos = __read_varint(data, pos + 1)
+        return (value >> 1) ^ -(value & 1), pos
+    if tag == __STR or tag == __BYTES:
+        size, pos = __read_varint(data, pos + 1)
+        value, pos = __read_bytes(data, pos, size)
+        return (value.decode("utf-8", "surrogatepass") if tag == __STR else value), pos
+    raise ValueError(f"Invalid packed value tag {tag:#04x} at position {pos}")
+
+
+def __read_key(data: bytes, pos: int, keys: list[str]) -> tuple[Any, int]:
+    try:
+        tag = data[pos]
+    except IndexError:
+        raise __truncated() from None
+    if tag == __KEY:
+        index, pos = __read_varint(data, pos + 1)
+        try:
+            return keys[index], pos
+        except IndexError:
+            raise ValueError(f"Invalid packed key index {index}") from None
+    key, pos = __read(data, pos, keys)
+    if isinstance(key, str):
+        keys.append(key)
+    return key, pos
+
+
+def __value_at(data: bytes, pos: int, keys: list[str]) -> Any:
+    # Only read again to report a failure with the raw value, like deserialize would
+    try:
+        return __read(data, pos, keys)[0]
+    except Exception:
+        return None
+
+
+class _ItemError(Exception):
+    """Carries the failure of a field or item to the object, collection or dict reading it, with its raw value."""
+
+    def __init__(self, error: Exception, value: Any):
+        self.error = error
+        self.value = value
+
+
+def __read_item(data: bytes, pos: int, keys: list[str], plan: _Plan) -> tuple[Any, int]:
+    # Leaf plans run on the value as read, so a failure can be reported with it like deserialize would
+    if plan.leaf:
+        value, pos = __read(data, pos, keys)
+        try:
+            return plan.run(value), pos
+        except Exception as e:
+            raise _ItemError(e, value)
+    try:
+        return __read_typed(data, pos, keys, plan)
+    except Exception as e:
+        raise _ItemError(e, __value_at(data, pos, keys))
+
+
+def __read_object(data: bytes, pos: int, keys: list[str], plan: _Plan, tag: int) -> tuple[Any, int]:
+    field_plans, field_types, strict, build, _ = plan.args
+    count, pos = __read_count(data, pos, tag)
+    values = {}
+    for _ in range(count):
+        name, pos = __read_key(data, pos, keys)
+        fieldPlan = field_plans.get(name)
+        if fieldPlan is None:
+            value, pos = __read(data, pos, keys)
+            if not strict:
+                values[name] = value
+            continue
+
+        try:
+            values[name], pos = __read_item(data, pos, keys, fieldPlan)
+        except _ItemError as e:
+            raise DeserializeClassException(e.error, e.value, field_types[name], name)
+    return build(values), pos
+
+
+def __read_collection(data: bytes, pos: int, keys: list[str], plan: _Plan, tag: int) -> tuple[Any, int]:
+    itemPlan = plan.args[0]
+    count, pos = __read_count(data, pos, tag)
+    items = []
+    append = items.append
+    for index in range(count):
+        try:
+            item, pos = __read_item(data, pos, keys, itemPlan)
+        except _ItemError as e:
+            raise DeserializeListException(e.error, e.value, plan.classType, index)
+        append(item)
+    return (items if plan.kind is Kind.LIST else __COLLECTION_TYPES[plan.kind](items)), pos
+
+
+def __read_dict(data: bytes, pos: int, keys: list[str], plan: _Plan, tag: int) -> tuple[Any, int]:
+    keyPlan, valuePlan, keyType, valueType = plan.args
+    count, pos = __read_count(data, pos, tag)
+    values = {}
+    for _ in range(count):
+        key, pos = __read_key(data, pos, keys)
+        try:
+            deserializedKey = keyPlan.run(key)
+        except Exception as e:
+            raise DeserializeDictKeyException(e, key, keyType, valueType)
+
+        try:
+            values[deserializedKey], pos = __read_item(data, pos, keys, valuePlan)
+        except _ItemError as e:
+            raise DeserializeDictValueException(e.error, e.value, keyType, valueType, key)
+    return values, pos
+
+
+def __read_typed(data: bytes, pos: int, keys: list[str], plan: _Plan) -> tuple[Any, int]:
+    """
+    Reads the value at pos into the type of plan, with the position following it.
+
+    Objects, and collections and dicts of structured items, are built as they are read. Anything else
+    is read as serialize would have returned it and handed to the plan like deserialize would.
+    """
+    kind = plan.kind
+    while kind is Kind.OPTIONAL or (kind is Kind.TYPEVAR and plan.args):
+        if pos < len(data) and data[pos] == __NONE:
+            return None, pos + 1
+        plan = plan.args[0]
+        kind = plan.kind
+
+    if not plan.leaf and pos < len(data):
+        tag = data[pos]
+        if kind is Kind.OBJECT:
+            if __FIXMAP <= tag < __NONE or tag == __MAP:
+                return __read_object(data, pos, keys, plan, tag)
+        elif kind in __COLLECTION_TYPES:
+            if (__FIXLIST <= tag < __FIXMAP or tag == __LIST) and not plan.args[0].leaf:
+                return __read_collection(data, pos, keys, plan, tag)
+        elif kind is Kind.DICT:
+            if (__FIXMAP <= tag < __NONE or tag == __MAP) and not plan.args[1].leaf:
+                return __read_dict(data, pos, keys, plan, tag)
+
+    value, pos = __read(data, pos, keys)
+    return plan.run(value), pos
+
+
+def unpack(data: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False):
+    """
+    Deserializes a binary document written by pack into classType.
+
+    Objects are built straight from the document through the plans deserialize uses, so the result and
+    the exceptions raised are the same as deserialize would give for serialize's output of the value.
+    Values are read recursively.
+
+    Args:
+        data (Any): A bytes-like document
+        classType (type): The type to deserialize into
+
+    Returns:
+        Any: The deserialized value
+    """
+    if data.__class__ is not bytes:
+        data = bytes(data)
+    keys = []
+    try:
+        value, pos = __read_typed(data, 0, keys, _plan(classType, middleware, strict))
+        if pos != len(data):
+            raise ValueError(f"Extra data after the packed value at position {pos}")
+        return value
+    except Exception as e:
+        raise DeserializeClassException(e, __value_at(data, 0, []), classType, None)
@@ -0,0 +1,154 @@
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
+from typing import Any, Callable, Optional
+
+from .deserialize_impl import _plan_kind, deserialize
+from .serialize import serialize
+from .serialization_utils import Kind
+
+
+SerializationMiddleware = dict[type, Callable[[object], type]]
+DeserializationMiddleware = dict[type, Callable[[object], object]]
+
+# Below this many items pickling chunks to and from the workers costs more than it saves
+PARALLEL_THRESHOLD = 20000
+
+__PARALLEL_KINDS = {Kind.LIST, Kind.SET, Kind.FROZENSET, Kind.DICT}
+
+
+def __deserialize_chunk(values: Any, classType: type, middleware: Optional[DeserializationMiddleware], strict: bool) -> tuple[bool, Any]:
+    # Runs in the worker processes, whose plan caches stay warm between calls.
+    # Failures are only flagged, the caller reruns the whole value to raise the error with its global position.
+    try:
+        return True, deserialize(values, classType, middleware, strict)
+    except Exception:
+        return False, None
+
+
+def __split(value: Any, kind: Kind, chunks: int) -> list:
+    size = -(-len(value) // chunks)
+    if kind is Kind.DICT:
+        items = iter(value.items())
+        return [dict(islice(items, size)) for _ in range(-(-len(value) // size))]
+    if not isinstance(value, (list, tuple)):
+        value = list(value)
+    return [value[start:start + size] for start in range(0, len(value), size)]
+
+
+def deserialize_parallel(
+    value: Any,
+    classType: type,
+    executor: Executor,
+    middleware: Optional[DeserializationMiddleware] = None,
+    strict: bool = False,
+    chunks: int = 8,
+    threshold: int = PARALLEL_THRESHOLD
+):
+    """
+    Deserializes a large top-level list, set or dict by splitting it into chunks run on executor.
+
+    Values of other types, or with fewer than threshold items, are deserialized in the calling process.
+    The result and any raised exception are the same as deserialize's, list errors carry the index into
+    the whole value. With a process pool, middleware and the deserialized objects have to be picklable.
+
+    Args:
+        value (Any): The value to deserialize
+        classType (type): The type to deserialize into
+        executor (Executor): Runs the chunks, usually a ProcessPoolExecutor
+        chunks (int, optional): Number of chunks to split the value into. Defaults to 8.
+        threshold (int, optional): Minimum number of items worth splitting. Defaults to PARALLEL_THRESHOLD.
+    """
+    kind = _plan_kind(classType, middleware, strict)
+    if kind not in __PARALLEL_KINDS or not isinstance(value, (list, tuple, set, frozenset, dict)) or len(value) < max(threshold, 2):
+        return deserialize(value, classType, middleware, strict)
+    if (kind is Kind.DICT) != isinstance(value, dict):
+        # Mismatched values fail in deserialize with the usual exception
+        return deserialize(value, classType, middleware, strict)
+
+    pieces = __split(value, kind, chunks)
+    results = []
+    for ok, result in executor.map(__deserialize_chunk, pieces, repeat(classType), repeat(middleware), repeat(strict)):
+        if not ok:
+            return deserialize(value, classType, middleware, strict)
+        results.append(result)
+
+    if kind is Kind.LIST:
+        return list(chain.from_iterable(results))
+    if kind is Kind.DICT:
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return merged
+    return (set if kind is Kind.SET else frozenset)().union(*results)
+
+
+# Middleware installed in each worker by configure_serialization_worker when its pool starts
+__worker_middleware: Optional[SerializationMiddleware] = None
+
+
+def configure_serialization_worker(middleware: Optional[SerializationMiddleware]):
+    """Pool initializer installing the middleware used for chunks sent with preconfigured=True."""
+    global __worker_middleware
+    __worker_middleware = middleware
+
+
+def __serialize_chunk(values: list, middleware: Optional[SerializationMiddleware], preconfigured: bool) -> tuple[bool, Any]:
+    # Failures are only flagged, the caller reruns the whole value to raise the same error serialize would
+    try:
+        return True, serialize(values, __worker_middleware if preconfigured else middleware)
+    except Exception:
+        return False, None
+
+
+def serialize_parallel(
+    value: Any,
+    executor: Executor,
+    middleware: Optional[SerializationMiddleware] = None,
+    chunks: int = 8,
+    threshold: int = PARALLEL_THRESHOLD,
+    preconfigured: bool = False
+):
+    """
+    Serializes a large top-level list or tuple by splitting it into chunks run on executor.
+
+    Other values, or ones with fewer than threshold items, are serialized in the calling process.
+    The result and any raised exception, like SerializeCycleException, are the same as serialize's.
+    With a process pool, the items and their serialized form have to be picklable.
+
+    Args:
+        value (Any): The value to serialize
+        executor (Executor): Runs the chunks, a ProcessPoolExecutor or on free-threaded builds a ThreadPoolExecutor
+        chunks (int, optional): Number of chunks to split the value into. Defaults to 8.
+        threshold (int, optional): Minimum number of items worth splitting. Defaults to PARALLEL_THRESHOLD.
+        preconfigured (bool, optional): Whether the workers were started with configure_serialization_worker,
+            in which case middleware isn't sent along with every chunk. Defaults to False.
+    """
+    if type(value) not in (list, tuple) or len(value) < max(threshold, 2) or (middleware and type(value) in middleware):
+        return serialize(value, middleware)
+
+    pieces = __split(value, Kind.LIST, chunks)
+    results = []
+    chunkMiddleware = None if preconfigured else middleware
+    for ok, result in executor.map(__serialize_chunk, pieces, repeat(chunkMiddleware), repeat(preconfigured)):
+        if not ok:
+            return serialize(value, middleware)
+        results.append(result)
+    return list(chain.from_iterable(results))
+
+
+def free_threaded() -> bool:
+    """Whether the interpreter runs without the GIL, so threads can serialize in parallel."""
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def serialization_executor(workers: int, middleware: Optional[SerializationMiddleware]) -> tuple[Executor, bool]:
+    """
+    Starts a pool for serialize_parallel, threads on free-threaded builds and processes otherwise.
+
+    Returns:
+        tuple[Executor, bool]: The pool and whether its workers were preconfigured with middleware
+    """
+    if free_threaded():
+        return ThreadPoolExecutor(max_workers=workers), False
+    return ProcessPoolExecutor(max_workers=workers, initializer=configure_serialization_worker, initargs=(middleware,)), True
@@ -1,15 +1,32 @@
 from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    NamedTuple,
+    Optional,
     Union,
     get_args,
-    get_origin
+    get_origin,
+    get_type_hints
 )
 
+from array import array
+from collections import OrderedDict
 from enum import Enum
 
+import base64
+import binascii
+import dataclasses
 import inspect
+import sys
+import threading
+import time
 import types
+import weakref
 
 primitiveTypes = set([bool, int, float, str])
+binaryTypes = set([bytes, bytearray, memoryview])
 
 
 def is_primitive(type: type):
@@ -41,6 +58,159 @@ def is_union(type: type):
     return origin is Union or (union_type is not None and origin is union_type)
 
 
+def is_type_var(type: type):
+    return hasattr(type, "__constraints__") and hasattr(type, "__bound__")
+
+
+class Kind(str, Enum):
+    """How a type is handled by serialization and deserialization."""
+    ANY = "any"
+    NONE = "none"
+    PRIMITIVE = "primitive"
+    EXTENDED_PRIMITIVE = "extended_primitive"
+    ENUM = "enum"
+    LIST = "list"
+    TUPLE = "tuple"
+    SET = "set"
+    FROZENSET = "frozenset"
+    DICT = "dict"
+    UNION = "union"
+    OPTIONAL = "optional"
+    LITERAL = "literal"
+    TYPEVAR = "typevar"
+    ANNOTATED = "annotated"
+    BINARY = "binary"
+    ARRAY = "array"
+    OBJECT = "object"
+
+
+containerKinds = {
+    list: Kind.LIST,
+    tuple: Kind.TUPLE,
+    set: Kind.SET,
+    frozenset: Kind.FROZENSET,
+    dict: Kind.DICT,
+    bytes: Kind.BINARY,
+    bytearray: Kind.BINARY,
+    memoryview: Kind.BINARY,
+    array: Kind.ARRAY,
+}
+
+
+class TypeCache:
+    """
+    A per-type memo keyed by id(type).
+
+    Entries for weakly referenceable types (classes and most typing constructs) are dropped together
+    with the type, so dynamically created classes aren't kept alive by the cache. Hot paths can read
+    the entries dict directly: cache.entries.get(id(typeT)). Types that can't be weakly referenced
+    (e.g. PEP 604 unions) are kept in a small bounded table instead, reachable through lookup().
+    """
+
+    def __init__(self, max_strong_entries: int = 1024):
+        self.entries: dict[int, Any] = {}
+        self.references: dict[int, weakref.ref] = {}
+        self.strong_entries: dict[Any, Any] = {}
+        self.max_strong_entries = max_strong_entries
+
+    def lookup(self, typeT: type, default: Any = None) -> Any:
+        value = self.entries.get(id(typeT), default)
+        if value is default:
+            try:
+                return self.strong_entries.get(typeT, default)
+            except TypeError:
+                return default
+        return value
+
+    def remember(self, typeT: type, value: Any) -> Any:
+        reference = id(typeT)
+        try:
+            if reference not in self.references:
+                self.references[reference] = weakref.ref(typeT, lambda _: self.__forget(reference))
+            self.entries[reference] = value
+            return value
+        except TypeError:
+            pass
+
+        try:
+            if len(self.strong_entries) >= self.max_strong_entries:
+                del self.strong_entries[next(iter(self.strong_entries))]
+            self.strong_entries[typeT] = value
+        except TypeError:
+            pass
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.references.clear()
+        self.strong_entries.clear()
+
+    def items(self) -> list[tuple[Any, Any]]:
+        """Returns the (type, value) pairs held, for types that are still alive."""
+        items = [(reference(), self.entries.get(key)) for key, reference in list(self.references.items())]
+        return [(typeT, value) for typeT, value in items if typeT is not None] + list(self.strong_entries.items())
+
+    def discard(self, typeT: type):
+        self.__forget(id(typeT))
+        try:
+            self.strong_entries.pop(typeT, None)
+        except TypeError:
+            pass
+
+    def __forget(self, reference: int):
+        self.entries.pop(reference, None)
+        self.references.pop(reference, None)
+
+
+__kinds = TypeCache()
+__kind_entries = __kinds.entries
+
+
+def classify(typeT: type) -> Kind:
+    """
+    Returns the Kind of a type, computing it only once per type.
+
+    Args:
+        typeT (type): A runtime class or a type annotation
+
+    Returns:
+        Kind: The kind used to dispatch serialization and deserialization
+    """
+    kind = __kind_entries.get(id(typeT))
+    if kind is None and (kind := __kinds.lookup(typeT)) is None:
+        kind = __kinds.remember(typeT, __classify(typeT))
+    return kind
+
+
+def __classify(typeT: type) -> Kind:
+    if typeT is Any:
+        return Kind.ANY
+    if get_origin(typeT) is Literal:
+        return Kind.LITERAL
+    if get_origin(typeT) is Annotated:
+        return Kind.ANNOTATED
+    if is_type_var(typeT):
+        return Kind.TYPEVAR
+    if typeT is type(None):
+        return Kind.NONE
+    try:
+        if typeT in primitiveTypes:
+            return Kind.PRIMITIVE
+    except TypeError:
+        return Kind.OBJECT
+    if is_extended_primitive(typeT):
+        return Kind.EXTENDED_PRIMITIVE
+    if is_enum(typeT):
+        return Kind.ENUM
+    if is_union(typeT):
+        return Kind.OPTIONAL if is_optional(typeT) else Kind.UNION
+    if inspect.isclass(typeT) and issubclass(typeT, (bytes, bytearray, array)) and typeT not in containerKinds:
+        return Kind.BINARY if issubclass(typeT, (bytes, bytearray)) else Kind.ARRAY
+
+    origin = get_origin(typeT)
+    return containerKinds.get(origin if origin is not None else typeT, Kind.OBJECT)
+
+
 def get_type_hierarchy(classType: type):
     '''
     Returns the type hierarchy in method/variable resolution order
@@ -74,7 +244,195 @@ def get_type_hierarchy(classType: type):
     return typeHierarchy
 
 
+class TypeHintCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def annotation_classes(annotation: Any) -> set[type]:
+    """Returns the classes an annotation refers to, including those nested in its arguments."""
+    classes = set()
+    pending = [annotation]
+    while pending:
+        annotation = pending.pop()
+        if inspect.isclass(annotation):
+            classes.add(annotation)
+        pending.extend(getattr(annotation, "__args__", None) or ())
+    return classes
+
+
+def depends_on_class(candidate: Any, classType: type) -> bool:
+    """
+    Whether caches built for candidate have to be dropped when classType is invalidated.
+
+    That is classType itself, a class of the same name in the same module, which a reload of the
+    module defines in its place, and the subclasses and bases of classType, which dispatch between
+    each other under a discriminator.
+    """
+    if not inspect.isclass(candidate) or candidate is object:
+        return False
+    if candidate is classType:
+        return True
+    if (getattr(candidate, "__module__", None), getattr(candidate, "__qualname__", None)) == (classType.__module__, classType.__qualname__):
+        return True
+    try:
+        return issubclass(candidate, classType) or issubclass(classType, candidate)
+    except TypeError:
+        return False
+
+
+class TypeHintCache:
+    """
+    A bounded LRU memo of the type hints read from classes, by (class, what was read).
+
+    Resolving string annotations and forward references evaluates them, so each class is only resolved
+    once until it's evicted or invalidated. Entries only weakly reference their class, and are dropped
+    once it's collected.
+
+    Cached hints aren't checked against later changes to the modules they were resolved in. Classes
+    redefined at runtime have to be announced with invalidate_type_hints.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries: OrderedDict[tuple[int, str], tuple[weakref.ref, dict]] = OrderedDict()
+        self.lock = threading.Lock()
+        # Ids of collected classes, dropped on the next miss rather than from the weakref callback
+        self.collected: list[int] = []
+
+    def get(self, classType: type, what: str, resolve: Callable[[type], dict]) -> dict:
+        """
+        Returns a copy of resolve(classType), resolving it only on a miss.
+
+        Args:
+            classType (type): The class the hints are read from
+            what (str): Names what resolve reads, one entry is kept per class and name
+            resolve (Callable[[type], dict]): Reads the hints of classType
+
+        Returns:
+            dict: The hints, which the caller is free to change
+        """
+        key = (id(classType), what)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0]() is classType:
+            with self.lock:
+                self.hits += 1
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+            return dict(entry[1])
+
+        # Failures, like forward references that don't resolve yet, aren't cached
+        hints = resolve(classType)
+        with self.lock:
+            self.misses += 1
+        try:
+            reference = weakref.ref(classType, self.__collector(key[0]))
+        except TypeError:
+            return dict(hints)
+        with self.lock:
+            while self.collected:
+                classId = self.collected.pop()
+                for dead in [cached for cached in self.entries if cached[0] == classId]:
+                    if self.entries[dead][0]() is None:
+                        del self.entries[dead]
+            self.entries[key] = (reference, hints)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return dict(hints)
+
+    def invalidate(self, classType: Optional[type] = None):
+        """
+        Drops the entries of the classes depending on classType, and of those with hints referring to
+        one of them, or every entry.
+        """
+        with self.lock:
+            if classType is None:
+                self.entries.clear()
+                return
+            for key, (reference, hints) in list(self.entries.items()):
+                cached = reference()
+                if cached is None or depends_on_class(cached, classType) or any(
+                    depends_on_class(hinted, classType) for hint in hints.values() for hinted in annotation_classes(hint)
+                ):
+                    del self.entries[key]
+
+    def info(self) -> TypeHintCacheInfo:
+        return TypeHintCacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def __collector(self, classId: int) -> Callable[[weakref.ref], None]:
+        return lambda _: self.collected.append(classId)
+
+
+type_hints = TypeHintCache()
+__invalidation_hooks: list[Callable[[Optional[type]], None]] = []
+
+
+def type_hint_cache_info() -> TypeHintCacheInfo:
+    """
+    Returns the hits, misses and evictions of the type hint cache, with its size.
+
+    Hints are read when plans and serializers are compiled, so the counters only move while new types,
+    or new middleware configurations, are being compiled.
+
+    Returns:
+        TypeHintCacheInfo: The counters since the process started
+    """
+    return type_hints.info()
+
+
+def invalidate_type_hints(classType: Optional[type] = None):
+    """
+    Drops the cached type hints, and the plans and serializers compiled from them, that depend on classType.
+
+    Cached hints and compiled plans keep the classes they were resolved to. Call this after redefining a
+    class at runtime, e.g. on a hot reload, with either the old or the new class, so every class annotated
+    with it picks up the new definition. Classes depending on it through their annotations, directly or
+    through other classes, are dropped too, as are its subclasses and bases.
+
+    Args:
+        classType (type, optional): The redefined class. Defaults to None, dropping everything.
+    """
+    type_hints.invalidate(classType)
+    for hook in __invalidation_hooks:
+        hook(classType)
+
+
+def add_invalidation_hook(hook: Callable[[Optional[type]], None]):
+    """Registers hook to drop what it compiled from type hints depending on a class, or everything for None."""
+    __invalidation_hooks.append(hook)
+
+
+def get_init_type_hints(classType: type, include_extras: bool = False) -> dict[str, Any]:
+    """
+    Returns the resolved type hints of classType.__init__, cached.
+
+    Args:
+        classType (type): The class to read the constructor hints of
+        include_extras (bool, optional): Whether Annotated metadata is kept. Defaults to False.
+
+    Returns:
+        dict[str, Any]: The hints by parameter name, including "return" when annotated
+    """
+    return type_hints.get(
+        classType,
+        "init_extras" if include_extras else "init",
+        lambda classType: get_type_hints(classType.__init__, include_extras=include_extras)
+    )
+
+
 def get_attributes(classType: type) -> dict[str, type]:
+    return type_hints.get(classType, "attributes", __read_attributes)
+
+
+def __read_attributes(classType: type) -> dict[str, type]:
     attributes = {}
     # Use the python defined method/variable resolution order to get the correct type for each attribute
     for type in inspect.getmro(classType):
@@ -82,4 +440,114 @@ def get_attributes(classType: type) -> dict[str, type]:
             if attrName not in attributes.keys():
                 attributes[attrName] = attrType
 
-    return attributes
\ No newline at end of file
+    return attributes
+
+
+def is_named_tuple(classType: type) -> bool:
+    return inspect.isclass(classType) and issubclass(classType, tuple) and hasattr(classType, "_fields")
+
+
+def get_slots(classType: type) -> list[str]:
+    """Returns the names of the instance slots of classType, base classes first."""
+    slots = []
+    for type in reversed(inspect.getmro(classType)):
+        declared = vars(type).get("__slots__", ())
+        for name in (declared,) if isinstance(declared, str) else declared:
+            if name.startswith("__") and not name.endswith("__"):
+                # Private slot names are mangled like any other private attribute
+                name = f"_{type.__name__.lstrip('_')}{name}"
+            if name not in ("__dict__", "__weakref__") and name not in slots:
+                slots.append(name)
+    return slots
+
+
+def encode_base64(value: Any) -> str:
+    """Encodes a bytes-like value as base64 text, for targets that can only hold text."""
+    if isinstance(value, memoryview) and not value.c_contiguous:
+        value = value.tobytes()
+    return binascii.b2a_base64(value, newline=False).decode("ascii")
+
+
+def decode_base64(value: str) -> bytes:
+    return base64.b64decode(value, validate=True)
+
+
+def array_to_bytes(value: array) -> bytes:
+    """Returns the items of an array as little-endian machine values, in one copy."""
+    if sys.byteorder == "big" and value.itemsize > 1:
+        value = array(value.typecode, value)
+        value.byteswap()
+    return value.tobytes()
+
+
+def array_from_bytes(typecode: str, data: Any, arrayType: type = array) -> array:
+    """Builds an array from the little-endian machine values written by array_to_bytes."""
+    value = arrayType(typecode)
+    value.frombytes(data)
+    if sys.byteorder == "big" and value.itemsize > 1:
+        value.byteswap()
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class Discriminator:
+    """
+    Marks values as tagged with their concrete class in the field named field.
+
+    Used as Annotated[Union[A, B], Discriminator("kind")] to dispatch a union on the tag, or set as
+    __discriminator__ on a base class to dispatch that base class to its subclasses. Classes of a
+    base with __discriminator__ also write their tag when serialized.
+
+    A class's tag is its __tag__ attribute, else the values of its Literal annotation for field,
+    else its __name__.
+    """
+    field: str
+
+
+def get_discriminator(classType: type) -> Optional[Discriminator]:
+    discriminator = getattr(classType, "__discriminator__", None)
+    return discriminator if isinstance(discriminator, Discriminator) else None
+
+
+def get_tags(classType: type, field: str) -> tuple:
+    if "__tag__" in vars(classType):
+        return (classType.__tag__,)
+    try:
+        annotation = type_hints.get(classType, "class", get_type_hints).get(field)
+    except Exception:
+        # Classes with unresolvable annotations can still tag through a Literal that isn't a string
+        annotation = get_attributes(classType).get(field)
+    if get_origin(annotation) is Literal:
+        return get_args(annotation)
+    return (classType.__name__,)
+
+
+def get_subclasses(classType: type) -> list[type]:
+    subclasses = []
+    for subclass in classType.__subclasses__():
+        if vars(subclass).get("__pserialize_lazy__"):
+            continue
+        subclasses.append(subclass)
+        subclasses.extend(get_subclasses(subclass))
+    return subclasses
+
+
+class Pacer:
+    """Decides when an asynchronous walk should yield to the event loop, after a number of nodes or a time slice."""
+
+    __slots__ = ("every", "time_slice", "count", "deadline")
+
+    def __init__(self, every: int, time_slice: Optional[float]):
+        self.every = max(every, 1)
+        self.time_slice = time_slice
+        self.count = 0
+        self.deadline = None if time_slice is None else time.perf_counter() + time_slice
+
+    def due(self) -> bool:
+        self.count += 1
+        if self.count < self.every and (self.deadline is None or time.perf_counter() < self.deadline):
+            return False
+        self.count = 0
+        if self.time_slice is not None:
+            self.deadline = time.perf_counter() + self.time_slice
+        return True
@@ -1,10 +1,29 @@
-from typing import Any, Callable, Optional, Union
+import asyncio
+import inspect
+from array import array
+from enum import Enum
+from typing import Any, Callable, ClassVar, Optional, Union, get_args, get_origin
 
-from .deserialize import deserialize
+from .deserialize import deserialize, is_lazy, materialize
+from .deserialize_impl import BaseDeserializationException, _object_field_types
 
 from .serialization_utils import (
-    is_primitive,
-    is_enum
+    Discriminator,
+    Kind,
+    Pacer,
+    TypeCache,
+    add_invalidation_hook,
+    annotation_classes,
+    array_to_bytes,
+    classify,
+    depends_on_class,
+    get_attributes,
+    get_discriminator,
+    get_init_type_hints,
+    get_slots,
+    get_tags,
+    is_named_tuple,
+    primitiveTypes
 )
 
 # Make all methods static
@@ -31,6 +50,193 @@ def __track_reference(value: object, visited: set[int]) -> int:
     return reference
 
 
+class _Untracked:
+    """Stands in for the visited set when cycles aren't checked, tracking nothing."""
+
+    __slots__ = ()
+
+    def __contains__(self, reference: int) -> bool:
+        return False
+
+    def add(self, reference: int):
+        pass
+
+    def remove(self, reference: int):
+        pass
+
+
+__UNTRACKED = _Untracked()
+# Stack depth at which the iterative serializer without tracked visits assumes the graph is cyclic
+MAX_DEPTH = 100000
+
+
+def _check_cycles_mode(check_cycles: Union[bool, str]) -> Union[bool, str]:
+    """Returns check_cycles, raising ValueError unless it is True, False or "depth"."""
+    if check_cycles is not True and check_cycles is not False and check_cycles != "depth":
+        raise ValueError(f'check_cycles must be True, False or "depth", got {check_cycles!r}')
+    return check_cycles
+
+
+def __visited_for(check_cycles: Union[bool, str]) -> set[int]:
+    return set() if _check_cycles_mode(check_cycles) is True else __UNTRACKED
+
+
+# Per class, how to read its fields and the (field, tag) written ahead of them for classes under a
+# base with __discriminator__. Classes with fields under Annotated[..., Discriminator(field)] read the
+# objects in those fields as _Tagged, so every engine walking the fields writes their tag.
+__object_layouts = TypeCache()
+__object_layout_entries = __object_layouts.entries
+
+
+class _Tagged:
+    """An object read from a field under Annotated[..., Discriminator(field)], with the (field, tag) it is written with."""
+
+    __slots__ = ("value", "tag")
+
+    def __init__(self, value: object, tag: tuple):
+        self.value = value
+        self.tag = tag
+
+
+def _with_tag(serialized: Any, tag: Optional[tuple]) -> Any:
+    """Returns serialized with the (field, tag) written ahead of its fields, when it's a dict without the field."""
+    if tag is None or serialized.__class__ is not dict or tag[0] in serialized:
+        return serialized
+    return {tag[0]: tag[1], **serialized}
+
+
+def __slot_reader(slots: list[str], has_dict: bool) -> Callable[[object], dict]:
+    def read(value):
+        fields = {}
+        for name in slots:
+            try:
+                fields[name] = getattr(value, name)
+            except AttributeError:
+                # Unset slots are left out like unset attributes are
+                pass
+        if has_dict:
+            fields.update(vars(value))
+        return fields
+
+    return read
+
+
+def __named_tuple_reader(value: tuple) -> dict:
+    return dict(zip(value._fields, value))
+
+
+def __object_layout(classType: type) -> tuple[Callable[[object], dict], tuple]:
+    layout = __object_layout_entries.get(id(classType))
+    if layout is None:
+        discriminator = get_discriminator(classType)
+        tag = () if discriminator is None else (discriminator.field, get_tags(classType, discriminator.field)[0])
+        if is_named_tuple(classType):
+            read = __named_tuple_reader
+        elif slots := get_slots(classType):
+            read = __slot_reader(slots, bool(getattr(classType, "__dictoffset__", 0)))
+        else:
+            read = vars
+        if taggers := __field_taggers(classType):
+            read = __tagging_reader(read, taggers)
+        layout = __object_layouts.remember(classType, (read, tag))
+    return layout
+
+
+def __field_taggers(classType: type) -> dict[str, Callable[[Any], Any]]:
+    try:
+        field_types = __object_field_types(classType)
+    except Exception:
+        return {}
+    __remember_field_classes(classType, field_types)
+    return {name: __field_tagger(field_type) for name, field_type in field_types.items() if field_type is not None and __has_discriminator(field_type)}
+
+
+def __tagging_reader(read: Callable[[object], dict], taggers: dict[str, Callable[[Any], Any]]) -> Callable[[object], dict]:
+    def tagging_read(value):
+        fields = dict(read(value))
+        for name, tagger in taggers.items():
+            if name in fields:
+                fields[name] = tagger(fields[name])
+        return fields
+
+    return tagging_read
+
+
+def __field_tagger(annotation: Any) -> Callable[[Any], Any]:
+    """
+    Returns what reads a field value annotated with annotation, wrapping the objects under an
+    Annotated[..., Discriminator(field)] in it as _Tagged, like __discriminating_serializer tags them.
+
+    Lists, tuples, sets, dict values and Optional of those are copied with their items read the same way.
+    """
+    if not __has_discriminator(annotation):
+        return __untagged
+    kind = classify(annotation)
+    args = get_args(annotation)
+
+    if kind is Kind.ANNOTATED:
+        realTagger = __field_tagger(annotation.__origin__)
+        discriminators = [metadata for metadata in annotation.__metadata__ if isinstance(metadata, Discriminator)]
+        if not discriminators:
+            return realTagger
+        field = discriminators[-1].field
+
+        def tagger(value):
+            value = realTagger(value)
+            classType = value.__class__
+            if classType is not _Tagged and classify(classType) is Kind.OBJECT:
+                return _Tagged(value, (field, get_tags(classType, field)[0]))
+            return value
+
+        return tagger
+
+    if kind is Kind.OPTIONAL and len(args) == 2:
+        realTagger = __field_tagger(args[0] if args[1] is type(None) else args[1])
+        return lambda value: None if value is None else realTagger(value)
+
+    collectionType = get_origin(annotation)
+    if kind is Kind.DICT:
+        itemTagger = __field_tagger(args[1]) if len(args) == 2 else __untagged
+        return lambda value: {key: itemTagger(item) for key, item in value.items()} if value.__class__ is dict else value
+    if kind is Kind.TUPLE and not (len(args) == 2 and args[1] is Ellipsis):
+        itemTaggers = tuple(map(__field_tagger, args))
+
+        def tagger(value):
+            if value.__class__ is not tuple:
+                return value
+            return tuple(itemTagger(item) for itemTagger, item in zip(itemTaggers, value)) + value[len(itemTaggers):]
+
+        return tagger
+    if kind in __ITERABLE_KINDS:
+        itemTagger = __field_tagger(args[0]) if args else __untagged
+        return lambda value: collectionType(map(itemTagger, value)) if value.__class__ is collectionType else value
+    return __untagged
+
+
+def __untagged(value: Any) -> Any:
+    return value
+
+
+def __serialize_tagged(value: _Tagged, middleware: SerializationMiddleware, visited: set[int]) -> Any:
+    return _with_tag(_serialize_inner(value.value, middleware, visited), value.tag)
+
+
+def _object_fields(value: object) -> dict:
+    """
+    Returns the fields to serialize for an object, plus its tag for tagged classes.
+
+    Fields are read from __dict__, from slots or from the items of a NamedTuple.
+    """
+    classType = value.__class__
+    if type(value) is not classType and is_lazy(value):
+        materialize(value)
+    read, tag = __object_layout(classType)
+    fields = read(value)
+    if tag and tag[0] not in fields:
+        return {tag[0]: tag[1], **fields}
+    return fields
+
+
 def __serialize_basic_object(object: object, middleware: Optional[SerializationMiddleware] = None, visited: Optional[set[int]] = None) -> dict:
     """
     Serializes an object using the fields set on its __dict__
@@ -45,7 +251,7 @@ def __serialize_basic_object(object: object, middleware: Optional[SerializationM
     visited = visited if visited is not None else set()
     reference = __track_reference(object, visited)
     try:
-        return __serialize_dict(vars(object), middleware, visited)
+        return __serialize_dict(_object_fields(object), middleware, visited)
     finally:
         visited.remove(reference)
 
@@ -75,6 +281,16 @@ def __serialize_dict(dict: dict, middleware: Optional[SerializationMiddleware] =
         visited.remove(reference)
 
 
+__LEAF_TYPES = frozenset([*primitiveTypes, type(None)])
+# Below this many items a collection is cheaper to serialize item by item than to check up front
+__BATCH_MIN = 8
+
+
+def __leaves(middleware: SerializationMiddleware) -> frozenset:
+    # The classes serialize returns as they are, unless middleware is registered for them
+    return __LEAF_TYPES.difference(middleware) if middleware else __LEAF_TYPES
+
+
 def __serialize_iterable(iterable: Union[list, tuple, set, frozenset], middleware: Optional[SerializationMiddleware] = None, visited: Optional[set[int]] = None) -> list:
     """
     Serializes an iterable collection as a list of serialized elements.
@@ -86,6 +302,10 @@ def __serialize_iterable(iterable: Union[list, tuple, set, frozenset], middlewar
         list: The serialized collection elements
     """
     middleware = __middleware_or_empty(middleware)
+    if len(iterable) >= __BATCH_MIN and __leaves(middleware).issuperset(map(type, iterable)):
+        # Primitives serialize to themselves, so the whole collection is a single copy
+        return list(iterable)
+
     visited = visited if visited is not None else set()
     reference = __track_reference(iterable, visited)
     try:
@@ -98,7 +318,7 @@ def __serialize_iterable(iterable: Union[list, tuple, set, frozenset], middlewar
         visited.remove(reference)
 
 
-def serialize(value: Any, middleware: Optional[SerializationMiddleware] = None):
+def serialize(value: Any, middleware: Optional[SerializationMiddleware] = None, check_cycles: Union[bool, str] = True):
     """
     Serializes an object.
 
@@ -110,17 +330,353 @@ def serialize(value: Any, middleware: Optional[SerializationMiddleware] = None):
         Sets
         Frozensets
         Dicts
+        bytes, bytearray and memoryview, passed through as they are
+        array.array, as {"typecode": ..., "data": <little-endian bytes>}
         Basic objects
 
     Any custom serialization logic can be added using middleware
 
+    Object graphs nested deeper than the recursion limit are serialized with serialize_iterative.
+
+    By default every object and container visited is tracked to detect cycles. For graphs known to be
+    acyclic, check_cycles=False or "depth", which mean the same, skip that tracking, with object serializers
+    generated without it. The recursion limit then serves as the depth guard: graphs hitting it are serialized
+    iteratively, raising SerializeCycleException past MAX_DEPTH levels.
+
     Args:
         value (Any): The value to serialize
+        check_cycles (bool | str, optional): True, False or "depth". Defaults to True.
 
     Returns:
         object: The serialized value
+
+    Raises:
+        ValueError: For any other check_cycles
+    """
+    middleware = __middleware_or_empty(middleware)
+    try:
+        return _serialize_inner(value, middleware, __visited_for(check_cycles))
+    except RecursionError:
+        return serialize_iterative(value, middleware, check_cycles)
+
+
+def serialize_references(value: Any, middleware: Optional[SerializationMiddleware] = None):
     """
-    return _serialize_inner(value, __middleware_or_empty(middleware), set())
+    Serializes an object like serialize, writing every distinct object only once.
+
+    Each object is written as a dict starting with an "$id" number, and every later occurrence of the same
+    object as {"$ref": <that number>}. Shared objects are therefore serialized once, and cyclic references
+    through objects are written as back-references instead of raising SerializeCycleException. Cycles made
+    of lists, sets or dicts alone still raise. Read the output back with deserialize_references.
+
+    Args:
+        value (Any): The value to serialize
+
+    Returns:
+        object: The serialized value
+    """
+    return __serialize_shared(value, __middleware_or_empty(middleware), {}, set())
+
+
+def __serialize_shared(value: Any, middleware: SerializationMiddleware, ids: dict[int, int], visited: set[int]):
+    # ids maps id(obj) to its $id, for every object written so far. The objects stay alive in the graph
+    # being serialized, so their ids can't be reused during the call.
+    classType = type(value)
+    tag = None
+    if classType is _Tagged:
+        value, tag = value.value, value.tag
+        classType = type(value)
+    if (serializer := middleware.get(classType, None)) is not None:
+        return _with_tag(serializer(value, middleware), tag)
+
+    kind = classify(classType)
+    if kind is Kind.OBJECT:
+        reference = ids.get(id(value))
+        if reference is not None:
+            return _with_tag({"$ref": reference}, tag)
+        reference = ids[id(value)] = len(ids) + 1
+        serialized = {"$id": reference}
+        for key, field in _with_tag(_object_fields(value), tag).items():
+            serialized[key] = __serialize_shared(field, middleware, ids, visited)
+        return serialized
+    if kind is Kind.ENUM:
+        return __serialize_shared(value.value, middleware, ids, visited)
+    if kind is not Kind.DICT and kind not in __ITERABLE_KINDS:
+        return _serialize_inner(value, middleware, visited)
+
+    reference = __track_reference(value, visited)
+    try:
+        if kind is Kind.DICT:
+            return {
+                _serialize_inner(key, middleware, visited): __serialize_shared(item, middleware, ids, visited)
+                for key, item in value.items()
+            }
+        return [__serialize_shared(item, middleware, ids, visited) for item in value]
+    finally:
+        visited.remove(reference)
+
+
+def serialize_columnar(value: Any, middleware: Optional[SerializationMiddleware] = None):
+    """
+    Serializes an object like serialize, writing lists of objects as columns.
+
+    A list, tuple or set whose items are all instances of the same class with the same fields is written as
+    {"$columns": {field: [value of each item]}} instead of one dict per item, so field names aren't repeated.
+    Columns of strings (including enums with string values) with at most half as many distinct values as
+    items are dictionary encoded, as {"$values": [distinct values], "$codes": [index of each item's value]}.
+    Anything else is written like serialize does. Read the output back with deserialize_columnar.
+
+    Args:
+        value (Any): The value to serialize
+
+    Returns:
+        object: The serialized value
+    """
+    return __serialize_columnar(value, __middleware_or_empty(middleware), set())
+
+
+def __serialize_columnar(value: Any, middleware: SerializationMiddleware, visited: set[int]):
+    classType = type(value)
+    tag = None
+    if classType is _Tagged:
+        value, tag = value.value, value.tag
+        classType = type(value)
+    if (serializer := middleware.get(classType, None)) is not None:
+        return _with_tag(serializer(value, middleware), tag)
+
+    kind = classify(classType)
+    if kind is Kind.ENUM:
+        return __serialize_columnar(value.value, middleware, visited)
+    if kind is not Kind.OBJECT and kind is not Kind.DICT and kind not in __ITERABLE_KINDS:
+        return _serialize_inner(value, middleware, visited)
+
+    reference = __track_reference(value, visited)
+    try:
+        if kind is Kind.OBJECT:
+            return {key: __serialize_columnar(field, middleware, visited) for key, field in _with_tag(_object_fields(value), tag).items()}
+        if kind is Kind.DICT:
+            return {
+                _serialize_inner(key, middleware, visited): __serialize_columnar(item, middleware, visited)
+                for key, item in value.items()
+            }
+        if value and (columns := __serialize_columns(value, middleware, visited)) is not None:
+            return columns
+        return [__serialize_columnar(item, middleware, visited) for item in value]
+    finally:
+        visited.remove(reference)
+
+
+def __serialize_columns(items: Union[list, tuple, set, frozenset], middleware: SerializationMiddleware, visited: set[int]) -> Optional[dict]:
+    """Returns the columns of items, or None unless they are objects of one class with the same fields."""
+    first = next(iter(items))
+    fieldTag = None
+    if first.__class__ is _Tagged:
+        # Objects read from a discriminated field, which are all tagged alike when they share a class
+        if any(item.__class__ is not _Tagged for item in items):
+            return None
+        fieldTag = first.tag
+        items = [item.value for item in items]
+        first = items[0]
+    classType = type(first)
+    if classType in middleware or classify(classType) is not Kind.OBJECT:
+        return None
+    for item in items:
+        if type(item) is not classType:
+            return None
+    read, tag = __object_layout(classType)
+    if first.__class__ is not classType:
+        # Lazily deserialized objects are read through _object_fields, which loads them and adds the tag
+        read, tag = _object_fields, ()
+    rows = list(map(read, items))
+    names = rows[0].keys()
+    if not names or any(row.keys() != names for row in rows):
+        return None
+    for rowTag in (tag, fieldTag):
+        if rowTag and rowTag[0] not in names:
+            rows = [{rowTag[0]: rowTag[1], **row} for row in rows]
+            names = rows[0].keys()
+
+    # Each row's objects are tracked while its fields are serialized one by one, a column at a time they
+    # can't be, but a cycle through them is still caught when the object is reached again from its fields
+    return {"$columns": {name: __serialize_column([row[name] for row in rows], middleware, visited) for name in names}}
+
+
+def __serialize_column(values: list, middleware: SerializationMiddleware, visited: set[int]) -> Union[list, dict]:
+    classes = set(map(type, values))
+    if classes.isdisjoint(middleware) and all(classify(classType) is Kind.ENUM for classType in classes):
+        # Each member is serialized once
+        members = {member: __serialize_columnar(member, middleware, visited) for member in set(values)}
+        values = list(map(members.__getitem__, values))
+        classes = set(map(type, values))
+    elif not classes <= __LEAF_TYPES or not classes.isdisjoint(middleware):
+        values = [__serialize_columnar(value, middleware, visited) for value in values]
+        classes = set(map(type, values))
+
+    if classes == {str}:
+        codes = {value: code for code, value in enumerate(dict.fromkeys(values))}
+        if len(codes) * 2 <= len(values):
+            return {"$values": list(codes), "$codes": list(map(codes.__getitem__, values))}
+    return values
+
+
+__LEAF_KINDS = {Kind.NONE, Kind.PRIMITIVE, Kind.EXTENDED_PRIMITIVE, Kind.BINARY}
+__ITERABLE_KINDS = {Kind.LIST, Kind.TUPLE, Kind.SET, Kind.FROZENSET}
+__NO_RESULT = object()
+
+
+def serialize_iterative(value: Any, middleware: Optional[SerializationMiddleware] = None, check_cycles: Union[bool, str] = True):
+    """
+    Serializes an object like serialize, using an explicit work stack instead of recursion.
+
+    The output is identical to serialize, but arbitrarily deep object graphs can be serialized
+    without hitting the interpreter recursion limit. Cyclic graphs still raise SerializeCycleException.
+    Dict keys are hashable and shallow, so they are still serialized recursively.
+
+    With check_cycles=False or "depth", which mean the same, visits aren't tracked, and graphs nested
+    deeper than MAX_DEPTH raise SerializeCycleException instead.
+
+    Args:
+        value (Any): The value to serialize
+        check_cycles (bool | str, optional): True, False or "depth". Defaults to True.
+
+    Returns:
+        object: The serialized value
+
+    Raises:
+        ValueError: For any other check_cycles
+    """
+    steps = __serialize_steps(value, __middleware_or_empty(middleware), None, check_cycles)
+    try:
+        next(steps)
+    except StopIteration as done:
+        return done.value
+
+
+async def serialize_async(value: Any, middleware: Optional[SerializationMiddleware] = None, yield_every: int = 1000, time_slice: Optional[float] = None):
+    """
+    Serializes an object like serialize_iterative, handing control back to the event loop as it goes.
+
+    Middleware may return awaitables, which are awaited before their result is used. Dict keys are
+    serialized synchronously, so their middleware can't be asynchronous.
+
+    Args:
+        value (Any): The value to serialize
+        yield_every (int, optional): Number of nodes serialized between yields. Defaults to 1000.
+        time_slice (float, optional): Also yield once this many seconds passed since the last yield. Defaults to None.
+
+    Returns:
+        object: The serialized value
+    """
+    steps = __serialize_steps(value, __middleware_or_empty(middleware), Pacer(yield_every, time_slice))
+    try:
+        awaitable = next(steps)
+        while True:
+            if awaitable is None:
+                await asyncio.sleep(0)
+                awaitable = steps.send(None)
+                continue
+            try:
+                result = await awaitable
+            except Exception as e:
+                # Raised inside the walk so it fails exactly like synchronous middleware would
+                awaitable = steps.throw(e)
+                continue
+            awaitable = steps.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+def __serialize_steps(value: Any, middleware: SerializationMiddleware, pacer: Optional[Pacer], check_cycles: Union[bool, str] = True):
+    # Generator behind serialize_iterative and serialize_async. Without a pacer it never yields, with
+    # one it yields None when due to pause and yields awaitable middleware results to get them resolved.
+    # Paced walks visit every child as a node, so large flat containers are split across pauses too.
+    leafKeys = __leaves(middleware)
+    leaves = leafKeys if pacer is None else frozenset()
+    visited = __visited_for(check_cycles)
+    # Untracked walks still stop cycles, by their depth
+    maxDepth = None if check_cycles is True else MAX_DEPTH
+    # Frames are [is a dict, remaining children, output, pending dict key, tracked references]
+    stack = []
+
+    while True:
+        if pacer is not None and pacer.due():
+            yield None
+
+        result = __NO_RESULT
+        tag = None
+        while result is __NO_RESULT:
+            classType = type(value)
+            if classType is _Tagged:
+                value, tag = value.value, value.tag
+                classType = type(value)
+            if (serializer := middleware.get(classType, None)) is not None:
+                result = serializer(value, middleware)
+                if pacer is not None and inspect.isawaitable(result):
+                    result = yield result
+                result = _with_tag(result, tag)
+                break
+
+            kind = classify(classType)
+            if kind in __LEAF_KINDS:
+                result = value
+            elif kind is Kind.ENUM:
+                value = value.value
+            elif kind is Kind.ARRAY:
+                result = __serialize_array(value, middleware, visited)
+            elif maxDepth is not None and len(stack) >= maxDepth:
+                raise SerializeCycleException(f"Object graph nested deeper than {maxDepth} levels, it is likely cyclic")
+            elif kind in __ITERABLE_KINDS:
+                if len(value) >= __BATCH_MIN and leaves and leaves.issuperset(map(type, value)):
+                    result = list(value)
+                    break
+                stack.append([False, iter(value), [], None, (__track_reference(value, visited),)])
+                break
+            else:
+                references = (__track_reference(value, visited),)
+                if kind is not Kind.DICT:
+                    value = _with_tag(_object_fields(value), tag)
+                    references += (__track_reference(value, visited),)
+                stack.append([True, iter(value.items()), {}, None, references])
+                break
+
+        while True:
+            if result is not __NO_RESULT:
+                if not stack:
+                    return result
+                frame = stack[-1]
+                if frame[0]:
+                    frame[2][frame[3]] = result
+                else:
+                    frame[2].append(result)
+
+            frame = stack[-1]
+            is_dict, children, output, _, references = frame
+            value = __NO_RESULT
+            if is_dict:
+                for key, child in children:
+                    if key.__class__ not in leafKeys:
+                        key = _serialize_inner(key, middleware, visited)
+                    if child.__class__ in leaves:
+                        output[key] = child
+                        continue
+                    frame[3] = key
+                    value = child
+                    break
+            else:
+                for child in children:
+                    if child.__class__ in leaves:
+                        output.append(child)
+                        continue
+                    value = child
+                    break
+
+            if value is not __NO_RESULT:
+                break
+
+            stack.pop()
+            for reference in references:
+                visited.remove(reference)
+            result = output
 
 
 def _serialize_inner(value: Any, middleware: Optional[SerializationMiddleware] = None, visited: Optional[set[int]] = None):
@@ -130,18 +686,583 @@ def _serialize_inner(value: Any, middleware: Optional[SerializationMiddleware] =
     classType = type(value)
     if (serializer := middleware.get(classType, None)) is not None:
         return serializer(value, middleware)
-    if value is None:
+    if visited.__class__ is _Untracked:
+        if (serializer := __untracked_serializer_entries.get(id(classType))) is None:
+            serializer = __serializer_for(classType, False)
+    elif (serializer := __serializer_entries.get(id(classType))) is None:
+        serializer = __serializer_for(classType, True)
+    return serializer(value, middleware, visited)
+
+
+def __serializer_for(classType: type, check_cycles: bool) -> Callable[[Any, SerializationMiddleware, set[int]], Any]:
+    if classType is _Tagged:
+        return (__serializers if check_cycles else __untracked_serializers).remember(classType, __serialize_tagged)
+    kind = classify(classType)
+    if kind is Kind.OBJECT:
+        return compile_serializer(classType, check_cycles)
+    serializers = __serializers if check_cycles else __untracked_serializers
+    if kind is Kind.ENUM:
+        return serializers.remember(classType, __enum_serializer(classType))
+    return serializers.remember(classType, __serializers_by_kind.get(kind, __serialize_basic_object))
+
+
+def __serialize_none(value: None, middleware: SerializationMiddleware, visited: set[int]) -> None:
+    return None
+
+
+def __serialize_primitive(value: Any, middleware: SerializationMiddleware, visited: set[int]) -> Any:
+    return value
+
+
+def __serialize_enum(value: Enum, middleware: SerializationMiddleware, visited: set[int]) -> Any:
+    return _serialize_inner(value.value, middleware, visited)
+
+
+def __enum_serializer(enumType: type) -> Callable[[Enum, SerializationMiddleware, set[int]], Any]:
+    # Members of enums with primitive values serialize to their value as it is, unless middleware is
+    # registered for one of the value types
+    valueTypes = frozenset(type(member._value_) for member in enumType.__members__.values())
+    if not valueTypes <= __LEAF_TYPES:
+        return __serialize_enum
+
+    def serializer(value, middleware, visited):
+        if middleware and not valueTypes.isdisjoint(middleware):
+            return __serialize_enum(value, middleware, visited)
+        return value._value_
+
+    return serializer
+
+
+def __serialize_array(value: array, middleware: SerializationMiddleware, visited: set[int]) -> dict:
+    # The items are copied out in one block, never boxed one by one
+    return {"typecode": value.typecode, "data": array_to_bytes(value)}
+
+
+ObjectSerializer = Callable[[object, SerializationMiddleware, set[int]], dict]
+
+# Serializer per runtime class, either a generic one for its Kind or a compiled object serializer.
+# Object serializers are generated with and without tracking visits for cycle detection.
+__serializers = TypeCache()
+__serializer_entries = __serializers.entries
+__untracked_serializers = TypeCache()
+__untracked_serializer_entries = __untracked_serializers.entries
+
+
+def compile_serializer(classType: type, check_cycles: bool = True) -> ObjectSerializer:
+    """
+    Generates (once) a straight-line serializer for instances of classType.
+
+    The generated function emits the dict for the class's annotated fields directly, calling a
+    specialized sub-serializer per field. Instances whose __dict__ doesn't match the annotated
+    fields, or middleware overriding any of the specialized types, fall back to the generic path.
+
+    Args:
+        classType (type): The class to compile a serializer for
+        check_cycles (bool, optional): Whether the serializer tracks visited objects. Defaults to True.
+
+    Returns:
+        ObjectSerializer: A function taking (object, middleware, visited)
+    """
+    if classify(classType) is not Kind.OBJECT:
+        raise TypeError(f"{classType.__name__} is not serialized as an object")
+    serializers = __serializers if check_cycles else __untracked_serializers
+    serializer = serializers.lookup(classType)
+    if serializer is None:
+        serializer = serializers.remember(classType, __generate_object_serializer(classType, check_cycles))
+    return serializer
+
+
+def __object_field_types(classType: type) -> dict[str, type]:
+    field_types = get_init_type_hints(classType, include_extras=True)
+    field_types.pop("return", None)
+    for name, attrType in get_attributes(classType).items():
+        if name not in field_types and get_origin(attrType) is not ClassVar:
+            field_types[name] = attrType
+    return field_types
+
+
+def __generate_object_serializer(classType: type, check_cycles: bool = True) -> ObjectSerializer:
+    # Instances carrying a __dict__, NamedTuples and slotted classes without a __dict__ can be specialized
+    named_tuple = is_named_tuple(classType)
+    slotted = not named_tuple and not getattr(classType, "__dictoffset__", 0)
+    try:
+        field_types = __object_field_types(classType)
+    except Exception:
+        return __serialize_basic_object
+    __remember_field_classes(classType, field_types)
+    if named_tuple:
+        field_types = {name: field_types.get(name) for name in classType._fields}
+    elif slotted:
+        field_types = {name: field_types.get(name) for name in get_slots(classType)}
+    if not field_types:
+        return __serialize_basic_object
+
+    namespace = {
+        "SerializeCycleException": SerializeCycleException,
+        "check_cycles": check_cycles,
+        "fallback": __serialize_basic_object,
+        "inner": _serialize_inner,
+        "keys": tuple(field_types),
+    }
+    specialized = set()
+    items = []
+    taggers = {name: __discriminating_serializer(field_type) for name, field_type in field_types.items() if __has_discriminator(field_type)}
+    _, tag = __object_layout(classType)
+    if tag and tag[0] not in field_types:
+        namespace["tag"] = tag[1]
+        items.append(f"{tag[0]!r}: tag")
+    for index, (name, field_type) in enumerate(field_types.items()):
+        if field_type is None:
+            expression = f"inner(v{index}, middleware, visited)"
+        elif name in taggers:
+            namespace[f"d{index}"] = taggers[name]
+            expression = f"d{index}(v{index}, middleware, visited)"
+        else:
+            expression = __field_expression(f"v{index}", field_type, index, namespace, specialized)
+        items.append(f"{name!r}: {expression}")
+    namespace["specialized"] = frozenset(specialized)
+
+    variables = [f"v{index}" for index in range(len(field_types))]
+    if named_tuple:
+        loads = ["    " + ", ".join(variables) + ", = value"]
+    elif slotted:
+        # Unset slots are left out by the generic path, so they fall back to it
+        loads = [
+            "    try:",
+            *(f"        {var} = value.{name}" for var, name in zip(variables, field_types)),
+            "    except AttributeError:",
+            "        return fallback(value, middleware, visited)",
+        ]
+    else:
+        loads = [
+            "    d = value.__dict__",
+            "    if tuple(d) != keys:",
+            "        return fallback(value, middleware, visited)",
+            *(f"    {var} = d[{name!r}]" for var, name in zip(variables, field_types)),
+        ]
+
+    if check_cycles:
+        body = [
+            "    reference = id(value)",
+            "    if reference in visited:",
+            "        raise SerializeCycleException('Cannot serialize cyclic object graph')",
+            "    visited.add(reference)",
+            "    try:",
+            "        return {" + ", ".join(items) + "}",
+            "    finally:",
+            "        visited.remove(reference)",
+        ]
+    else:
+        body = ["    return {" + ", ".join(items) + "}"]
+
+    source = "\n".join([
+        "def serializer(value, middleware, visited):",
+        "    if middleware and not specialized.isdisjoint(middleware):",
+        "        return fallback(value, middleware, visited)",
+        *loads,
+        *body,
+    ])
+    exec(compile(source, f"<serializer {classType.__qualname__}>", "exec"), namespace)
+    serializer = namespace["serializer"]
+    serializer.__qualname__ = serializer.__name__ = f"serialize_{classType.__name__}"
+    return serializer
+
+
+def __has_discriminator(annotation: Any) -> bool:
+    if classify(annotation) is Kind.ANNOTATED and any(isinstance(metadata, Discriminator) for metadata in annotation.__metadata__):
+        return True
+    return any(__has_discriminator(arg) for arg in getattr(annotation, "__args__", None) or ())
+
+
+def __discriminating_serializer(annotation: Any) -> Callable[[Any, SerializationMiddleware, set[int]], Any]:
+    """
+    Returns a serializer for values annotated with annotation, writing the tag of the values under an
+    Annotated[..., Discriminator(field)] ahead of their fields, like the __discriminator__ base marker does.
+
+    Values annotated as lists, tuples, sets, dict values or Optional of those are walked to reach them.
+    Anything else, or values middleware is registered for, goes through _serialize_inner.
+    """
+    if not __has_discriminator(annotation):
+        return _serialize_inner
+    kind = classify(annotation)
+    args = get_args(annotation)
+
+    if kind is Kind.ANNOTATED:
+        realSerializer = __discriminating_serializer(annotation.__origin__)
+        discriminators = [metadata for metadata in annotation.__metadata__ if isinstance(metadata, Discriminator)]
+        if not discriminators:
+            return realSerializer
+        field = discriminators[-1].field
+
+        def serializer(value, middleware, visited):
+            result = realSerializer(value, middleware, visited)
+            if result.__class__ is dict and field not in result and classify(value.__class__) is Kind.OBJECT:
+                result = {field: get_tags(value.__class__, field)[0], **result}
+            return result
+
+        return serializer
+
+    if kind is Kind.OPTIONAL and len(args) == 2:
+        realSerializer = __discriminating_serializer(args[0] if args[1] is type(None) else args[1])
+        return lambda value, middleware, visited: None if value is None else realSerializer(value, middleware, visited)
+
+    if kind in __ITERABLE_KINDS or kind is Kind.DICT:
+        if kind is Kind.DICT:
+            itemSerializer = __discriminating_serializer(args[1]) if len(args) == 2 else _serialize_inner
+        elif kind is Kind.TUPLE and not (len(args) == 2 and args[1] is Ellipsis):
+            itemSerializers = tuple(__discriminating_serializer(arg) for arg in args)
+        else:
+            itemSerializer = __discriminating_serializer(args[0]) if args else _serialize_inner
+        collectionType = get_origin(annotation)
+
+        def serializer(value, middleware, visited):
+            if not isinstance(value, collectionType) or (middleware and value.__class__ in middleware):
+                return _serialize_inner(value, middleware, visited)
+            reference = __track_reference(value, visited)
+            try:
+                if kind is Kind.DICT:
+                    return {_serialize_inner(key, middleware, visited): itemSerializer(item, middleware, visited) for key, item in value.items()}
+                if kind is Kind.TUPLE and not (len(args) == 2 and args[1] is Ellipsis):
+                    return [itemSerializer(item, middleware, visited) for itemSerializer, item in zip(itemSerializers, value)] + [
+                        _serialize_inner(item, middleware, visited) for item in value[len(itemSerializers):]
+                    ]
+                return [itemSerializer(item, middleware, visited) for item in value]
+            finally:
+                visited.remove(reference)
+
+        return serializer
+
+    return _serialize_inner
+
+
+def __field_expression(var: str, field_type: type, index: int, namespace: dict, specialized: set) -> str:
+    """
+    Builds the expression serializing one field value held in var.
+
+    Every specialization is guarded on the exact runtime class, anything else goes through the
+    generic _serialize_inner. Types added to specialized disable the compiled function when
+    middleware is registered for them.
+    """
+    generic = f"inner({var}, middleware, visited)"
+    typeName = f"t{index}"
+    kind = classify(field_type)
+
+    if kind is Kind.ANNOTATED:
+        return __field_expression(var, field_type.__origin__, index, namespace, specialized)
+
+    if kind is Kind.OPTIONAL and len(get_args(field_type)) == 2:
+        realType = [arg for arg in get_args(field_type) if arg is not type(None)][0]
+        expression = __field_expression(var, realType, index, namespace, specialized)
+        if expression == generic:
+            return generic
+        specialized.add(type(None))
+        return f"(None if {var} is None else {expression})"
+
+    if kind is Kind.PRIMITIVE:
+        namespace[typeName] = field_type
+        specialized.add(field_type)
+        return f"({var} if {var}.__class__ is {typeName} else {generic})"
+
+    if kind is Kind.ENUM:
+        valueTypes = {type(member.value) for member in field_type}
+        if not valueTypes <= primitiveTypes:
+            return generic
+        namespace[typeName] = field_type
+        specialized.update(valueTypes, [field_type])
+        return f"({var}._value_ if {var}.__class__ is {typeName} else {generic})"
+
+    if kind is Kind.LIST and get_args(field_type) and classify(get_args(field_type)[0]) is Kind.PRIMITIVE:
+        itemType = get_args(field_type)[0]
+        namespace[typeName] = itemType
+        specialized.update([list, itemType])
+        itemGeneric = "inner(x, middleware, visited)"
+        return f"([x if x.__class__ is {typeName} else {itemGeneric} for x in {var}] if {var}.__class__ is list else {generic})"
+
+    if kind is Kind.OBJECT and inspect.isclass(field_type) and get_origin(field_type) is None:
+        serializerName = f"s{index}"
+        namespace[typeName] = field_type
+        namespace[serializerName] = __lazy_object_serializer(namespace, serializerName, field_type)
+        specialized.add(field_type)
+        return f"({serializerName}({var}, middleware, visited) if {var}.__class__ is {typeName} else {generic})"
+
+    return generic
+
+
+def __lazy_object_serializer(namespace: dict, name: str, classType: type) -> ObjectSerializer:
+    # Nested classes are compiled on first use, which also lets self-referencing classes compile
+    def serializer(value, middleware, visited):
+        compiled = namespace[name] = compile_serializer(classType, namespace["check_cycles"])
+        return compiled(value, middleware, visited)
+
+    return serializer
+
+
+__serializers_by_kind = {
+    Kind.NONE: __serialize_none,
+    Kind.PRIMITIVE: __serialize_primitive,
+    Kind.EXTENDED_PRIMITIVE: __serialize_primitive,
+    Kind.ENUM: __serialize_enum,
+    Kind.LIST: __serialize_iterable,
+    Kind.TUPLE: __serialize_iterable,
+    Kind.SET: __serialize_iterable,
+    Kind.FROZENSET: __serialize_iterable,
+    Kind.DICT: __serialize_dict,
+    # Buffers are passed through by reference, text targets encode them as base64
+    Kind.BINARY: __serialize_primitive,
+    Kind.ARRAY: __serialize_array,
+}
+
+
+# Projections onto a target class, mapping source fields straight to the output of serialize_into
+__projections = TypeCache()
+__projection_entries = __projections.entries
+
+
+# Per class compiled from its type hints, the classes its field types refer to
+__field_classes = TypeCache()
+
+
+def __remember_field_classes(classType: type, field_types: dict[str, type]):
+    classes = set()
+    for field_type in field_types.values():
+        if field_type is not None:
+            classes |= annotation_classes(field_type)
+    __field_classes.remember(classType, frozenset(classes))
+
+
+def __drop_compiled(classType: Optional[type]):
+    # Layouts, serializers and projections are all derived from the type hints of the classes, so the
+    # ones of classes referring to classType, directly or through their fields, are dropped with it
+    if classType is None:
+        for cache in (__object_layouts, __serializers, __untracked_serializers, __projections, __field_classes):
+            cache.clear()
+        return
+
+    fieldClasses = __field_classes.items()
+    dropped = {id(candidate) for candidate, _ in fieldClasses if depends_on_class(candidate, classType)}
+    droppedClasses = [classType] + [candidate for candidate, _ in fieldClasses if id(candidate) in dropped]
+    grown = True
+    while grown:
+        grown = False
+        for candidate, classes in fieldClasses:
+            if id(candidate) not in dropped and any(depends_on_class(field, other) for field in classes for other in droppedClasses):
+                dropped.add(id(candidate))
+                droppedClasses.append(candidate)
+                grown = True
+
+    def affected(candidate: Any) -> bool:
+        return id(candidate) in dropped or depends_on_class(candidate, classType)
+
+    for cache in (__object_layouts, __serializers, __untracked_serializers, __field_classes):
+        for candidate, _ in cache.items():
+            if affected(candidate):
+                cache.discard(candidate)
+    for target, (_, sources) in __projections.items():
+        if affected(target) or any(affected(source) for source, _ in sources.items()):
+            __projections.discard(target)
+
+
+add_invalidation_hook(__drop_compiled)
+
+Projector = Callable[[Any, SerializationMiddleware, SerializationMiddleware], Any]
+
+
+def __projectable(classType: type) -> bool:
+    # Target classes deserialize builds through their __dict__ and serialize reads back the same way
+    if not inspect.isclass(classType) or classify(classType) is not Kind.OBJECT:
+        return False
+    if not getattr(classType, "__dictoffset__", 0) or is_named_tuple(classType) or get_slots(classType):
+        return False
+    return get_discriminator(classType) is None
+
+
+def __field_projector(field_type: type) -> Projector:
+    """
+    Returns what serialize_into makes of one source field value for a target field of field_type.
+
+    Values that already have the target type are copied or projected directly, anything else goes
+    through serialize, deserialize and serialize like the whole object would.
+    """
+    # Target fields under a Discriminator are written with their tag, like serialize writes the target's fields
+    tagged = __discriminating_serializer(field_type) if __has_discriminator(field_type) else None
+
+    def generic(raw, s_middleware, d_middleware):
+        value = deserialize(_serialize_inner(raw, s_middleware, set()), field_type, d_middleware, strict=True)
+        return serialize(value) if tagged is None else tagged(value, {}, set())
+
+    kind = classify(field_type)
+    if kind is Kind.OPTIONAL and len(get_args(field_type)) == 2:
+        realType = [arg for arg in get_args(field_type) if arg is not type(None)][0]
+        real = __field_projector(realType)
+
+        def project(raw, s_middleware, d_middleware):
+            if field_type in d_middleware:
+                return generic(raw, s_middleware, d_middleware)
+            if raw is None:
+                return None if type(None) not in s_middleware else generic(raw, s_middleware, d_middleware)
+            return real(raw, s_middleware, d_middleware)
+
+        return project
+
+    if kind is Kind.PRIMITIVE:
+        def project(raw, s_middleware, d_middleware):
+            if field_type in d_middleware:
+                return generic(raw, s_middleware, d_middleware)
+            if raw.__class__ is not field_type or field_type in s_middleware:
+                # Enums and middleware output often already serialize to the target type
+                raw = _serialize_inner(raw, s_middleware, set())
+                if raw.__class__ is not field_type:
+                    return serialize(deserialize(raw, field_type, d_middleware, strict=True))
+            return raw
+
+        return project
+
+    if kind is Kind.LIST and get_args(field_type):
+        item = __field_projector(get_args(field_type)[0])
+
+        def project(raw, s_middleware, d_middleware):
+            if raw.__class__ is list and list not in s_middleware and field_type not in d_middleware:
+                return [item(value, s_middleware, d_middleware) for value in raw]
+            return generic(raw, s_middleware, d_middleware)
+
+        return project
+
+    if __projectable(field_type):
+        def project(raw, s_middleware, d_middleware):
+            classType = raw.__class__
+            # Tagged objects of discriminated source fields take the full walks, which write their tag
+            if classType is not _Tagged and classType not in s_middleware and field_type not in d_middleware and classify(classType) is Kind.OBJECT:
+                if (projection := __source_projection(classType, field_type)) is not None:
+                    return projection(raw, s_middleware, d_middleware)
+            return generic(raw, s_middleware, d_middleware)
+
+        return project
+
+    return generic
+
+
+def __source_projection(source: type, target: type) -> Optional[Projector]:
+    """
+    Returns the projection of source instances onto target, generated once per pair of classes.
+
+    Returns None for targets serialize_into can't project onto, which always take the full walks.
+    """
+    projections = __projection_entries.get(id(target))
+    if projections is None:
+        try:
+            projection = __compile_projection(target) if __projectable(target) else None
+        except NameError:
+            # Targets with unresolved forward references take the full walks until they resolve
+            return None
+        projections = __projections.remember(target, (projection, TypeCache()))
+    projection, sources = projections
+    if projection is None:
         return None
-    if is_primitive(classType):
-        return value
-    if is_enum(classType):
-        return _serialize_inner(value.value, middleware, visited)
-    if classType in (list, tuple, set, frozenset):
-        return __serialize_iterable(value, middleware, visited)
-    if classType is dict:
-        return __serialize_dict(value, middleware, visited)
+    sourceProjection = sources.entries.get(id(source))
+    if sourceProjection is None:
+        sourceProjection = sources.remember(source, __generate_projection(source, target, projection))
+    return sourceProjection
+
+
+def __compile_projection(classType: type) -> Projector:
+    field_types = _object_field_types(classType)
+    __remember_field_classes(classType, field_types)
+    # Fields without a usable type are dropped by the strict deserialize, then filled in as None
+    projectors = {name: __field_projector(field_type) for name, field_type in field_types.items() if field_type}
+    names = tuple(field_types)
 
-    return __serialize_basic_object(value, middleware, visited)
+    def projection(value, s_middleware, d_middleware):
+        output = {}
+        for name, raw in _object_fields(value).items():
+            if (projector := projectors.get(name)) is not None:
+                output[name] = projector(raw, s_middleware, d_middleware)
+        if len(output) != len(names):
+            for name in names:
+                if name not in output:
+                    output[name] = None
+        return output
+
+    projection.field_types = field_types
+    projection.projectors = projectors
+    return projection
+
+
+def __generate_projection(source: type, target: type, projection: Projector) -> Projector:
+    # Like compile_serializer, source instances whose __dict__ matches the annotated fields get a
+    # straight-line function, anything else goes through the generic projection
+    try:
+        keys = tuple(__object_field_types(source))
+    except Exception:
+        return projection
+    if not keys or __object_layout(source) != (vars, ()):
+        return projection
+
+    field_types = projection.field_types
+    projectors = projection.projectors
+    namespace = {"projection": projection, "keys": keys}
+    specialized = set()
+    targets = set()
+    variables = []
+    items = []
+    for index, name in enumerate(keys):
+        if name in projectors:
+            namespace[f"p{index}"] = projectors[name]
+            variables.append((f"v{index}", name))
+            items.append(f"{name!r}: {__projection_expression(f'v{index}', field_types[name], index, namespace, specialized, targets)}")
+    items += [f"{name!r}: None" for name in field_types if name not in projectors or name not in keys]
+    namespace["specialized"] = frozenset(specialized)
+    namespace["targets"] = frozenset(targets)
+
+    source_code = "\n".join([
+        "def projection_into(value, s_middleware, d_middleware):",
+        "    if s_middleware and not specialized.isdisjoint(s_middleware) or d_middleware and not targets.isdisjoint(d_middleware):",
+        "        return projection(value, s_middleware, d_middleware)",
+        "    d = value.__dict__",
+        "    if tuple(d) != keys:",
+        "        return projection(value, s_middleware, d_middleware)",
+        *(f"    {var} = d[{name!r}]" for var, name in variables),
+        "    return {" + ", ".join(items) + "}",
+    ])
+    exec(compile(source_code, f"<projection {source.__qualname__} -> {target.__qualname__}>", "exec"), namespace)
+    return namespace["projection_into"]
+
+
+def __projection_expression(var: str, field_type: type, index: int, namespace: dict, specialized: set, targets: set) -> str:
+    """
+    Builds the expression projecting one source field value held in var, like __field_expression.
+
+    Source types added to specialized, and target types added to targets, disable the generated
+    function when middleware is registered for them.
+    """
+    projector = f"p{index}({var}, s_middleware, d_middleware)"
+    typeName = f"t{index}"
+    kind = classify(field_type)
+
+    if kind is Kind.OPTIONAL and len(get_args(field_type)) == 2:
+        realType = [arg for arg in get_args(field_type) if arg is not type(None)][0]
+        expression = __projection_expression(var, realType, index, namespace, specialized, targets)
+        if expression == projector:
+            return projector
+        specialized.add(type(None))
+        targets.add(field_type)
+        return f"(None if {var} is None else {expression})"
+
+    if kind is Kind.PRIMITIVE:
+        namespace[typeName] = field_type
+        specialized.add(field_type)
+        targets.add(field_type)
+        return f"({var} if {var}.__class__ is {typeName} else {projector})"
+
+    if kind is Kind.LIST and get_args(field_type) and classify(get_args(field_type)[0]) is Kind.PRIMITIVE:
+        itemType = get_args(field_type)[0]
+        namespace[typeName] = itemType
+        namespace[f"i{index}"] = __field_projector(itemType)
+        specialized.update([list, itemType])
+        targets.update([field_type, itemType])
+        itemProjector = f"i{index}(x, s_middleware, d_middleware)"
+        return f"([x if x.__class__ is {typeName} else {itemProjector} for x in {var}] if {var}.__class__ is list else {projector})"
+
+    return projector
 
 
 def serialize_into(value: Any, c_type: type, s_middleware: Optional[SerializationMiddleware] = None, d_middleware: Optional[SerializationMiddleware] = None):
@@ -149,6 +1270,9 @@ def serialize_into(value: Any, c_type: type, s_middleware: Optional[Serializatio
     Serializes an object into another object, which may have different field/types.
     Useful for turning a DB object into a DTO
 
+    Objects projected onto a plain class are mapped field by field in a single pass, going through
+    middleware and conversions only for fields whose value doesn't already have the target type.
+
     Args:
         value (Any): The value to serialize
         c_type (type): The desired output type
@@ -157,6 +1281,16 @@ def serialize_into(value: Any, c_type: type, s_middleware: Optional[Serializatio
     Returns:
         c_type: A c_type instance
     """
+    s_middleware = __middleware_or_empty(s_middleware)
+    d_middleware = __middleware_or_empty(d_middleware)
+    classType = type(value)
+    if classType not in s_middleware and c_type not in d_middleware and classify(classType) is Kind.OBJECT:
+        try:
+            if (projection := __source_projection(classType, c_type)) is not None:
+                return projection(value, s_middleware, d_middleware)
+        except (BaseDeserializationException, SerializeCycleException, RecursionError):
+            # The projection has no errors of its own, the full walks below report the actual one
+            pass
 
     serialized = serialize(value, s_middleware)
     # Strict is true here so that we only add the fields defined in c_type to the new object
@@ -0,0 +1,363 @@
+import codecs
+import io
+import json
+from json.encoder import c_make_encoder, encode_basestring_ascii
+from typing import Any, Callable, Iterator, Optional
+
+from .deserialize_impl import DeserializeClassException, DeserializeListException, _item_deserializer
+from .serialize import SerializeCycleException, _Tagged, _object_fields, _serialize_inner, _with_tag
+
+from .serialization_utils import (
+    Kind,
+    binaryTypes,
+    classify,
+    encode_base64,
+    primitiveTypes
+)
+
+
+SerializationMiddleware = dict[type, Callable[[object], type]]
+DeserializationMiddleware = dict[type, Callable[[object], object]]
+
+__ITERABLE_KINDS = {Kind.LIST, Kind.TUPLE, Kind.SET, Kind.FROZENSET}
+__LEAF_KINDS = {Kind.NONE, Kind.PRIMITIVE, Kind.EXTENDED_PRIMITIVE}
+__LEAF_TYPES = frozenset([*primitiveTypes, type(None)])
+__NO_CHILD = object()
+
+
+def __encode_default(value: Any) -> str:
+    # JSON is a text target, so buffers passed through by serialize are written as base64
+    if isinstance(value, tuple(binaryTypes)):
+        return encode_base64(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Middleware output is already serialized, so it is encoded as plain JSON like json.dumps would
+__encoder = json.JSONEncoder(default=__encode_default)
+# The C encoder json.dumps uses internally, built once so each record skips the JSONEncoder setup
+if c_make_encoder is not None:
+    __c_encoder = c_make_encoder(None, __encoder.default, encode_basestring_ascii, None, ": ", ", ", False, False, True)
+    __encode_tree = lambda tree: "".join(__c_encoder(tree, 0))  # noqa: E731
+else:
+    __encode_tree = __encoder.encode
+
+
+def __middleware_or_empty(middleware: Optional[SerializationMiddleware]) -> SerializationMiddleware:
+    return middleware if middleware is not None else {}
+
+
+def __track_reference(value: object, visited: set[int]) -> int:
+    reference = id(value)
+    if reference in visited:
+        raise SerializeCycleException("Cannot serialize cyclic object graph")
+    visited.add(reference)
+    return reference
+
+
+def __encode_float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def __encode_leaf(value: Any) -> str:
+    """Encodes a serialized primitive (or primitive subclass) the same way json.dumps does."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if isinstance(value, int):
+        return int.__repr__(value)
+    return __encode_float(value)
+
+
+def __encode_key(key: Any) -> str:
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        return '"' + __encode_leaf(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def __encode_record(value: Any, middleware: SerializationMiddleware, visited: set[int], tag: Optional[tuple]) -> Optional[str]:
+    """
+    Encodes a nested object in one go through the compiled serializers and the C encoder.
+
+    Memory stays bounded by the largest single record rather than the whole document.
+    Returns None when the record is too deep for that, so it is walked like everything else.
+    """
+    try:
+        return __encode_tree(_with_tag(_serialize_inner(value, middleware, visited), tag))
+    except RecursionError:
+        return None
+
+
+def iter_encode(value: Any, middleware: Optional[SerializationMiddleware] = None, chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Serializes an object straight to JSON text, yielding it in chunks.
+
+    The output equals json.dumps(serialize(value, middleware)), but the object graph is walked with an
+    explicit stack and written out as it goes, so the serialized tree is never held in memory as a whole.
+    Binary values, which serialize passes through as they are, are written as base64 strings.
+    Objects nested inside containers are encoded one record at a time.
+    Middleware and cycle detection behave as in serialize.
+
+    Args:
+        value (Any): The value to serialize
+        chunk_size (int, optional): Approximate number of characters per yielded chunk. Defaults to 65536.
+
+    Yields:
+        str: Consecutive pieces of the JSON document
+    """
+    middleware = __middleware_or_empty(middleware)
+    leaves = __LEAF_TYPES.difference(middleware)
+    visited = set()
+    # Frames are [is a dict, remaining children, no child written yet, tracked references]
+    stack = []
+    # Stack depth of a record that proved too deep to encode in one go, its descendants are walked too
+    walkFrom = None
+    parts = []
+    size = 0
+
+    while True:
+        while True:
+            classType = type(value)
+            tag = None
+            if classType is _Tagged:
+                value, tag = value.value, value.tag
+                classType = type(value)
+            if (serializer := middleware.get(classType, None)) is not None:
+                for part in __encoder.iterencode(_with_tag(serializer(value, middleware), tag)):
+                    parts.append(part)
+                    size += len(part)
+                break
+
+            kind = classify(classType)
+            if kind in __LEAF_KINDS:
+                part = __encode_leaf(value)
+            elif kind is Kind.ENUM:
+                value = value.value
+                continue
+            elif kind is Kind.BINARY:
+                part = '"' + encode_base64(value) + '"'
+            elif kind is Kind.ARRAY:
+                part = __encode_tree(_serialize_inner(value, middleware, visited))
+            elif kind is Kind.OBJECT and stack and walkFrom is None and (part := __encode_record(value, middleware, visited, tag)) is not None:
+                pass
+            elif kind in __ITERABLE_KINDS:
+                stack.append([False, iter(value), True, (__track_reference(value, visited),)])
+                part = "["
+            else:
+                if kind is Kind.OBJECT and stack and walkFrom is None:
+                    walkFrom = len(stack)
+                references = (__track_reference(value, visited),)
+                if kind is not Kind.DICT:
+                    value = _with_tag(_object_fields(value), tag)
+                    references += (__track_reference(value, visited),)
+                stack.append([True, iter(value.items()), True, references])
+                part = "{"
+            parts.append(part)
+            size += len(part)
+            break
+
+        value = __NO_CHILD
+        while stack:
+            if size >= chunk_size:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+
+            frame = stack[-1]
+            is_dict, children, first, references = frame
+            if is_dict:
+                for key, child in children:
+                    if key.__class__ not in leaves:
+                        key = _serialize_inner(key, middleware, visited)
+                    part = (__encode_key(key) if first else ", " + __encode_key(key)) + ": "
+                    first = False
+                    if child.__class__ in leaves:
+                        part += __encode_leaf(child)
+                        parts.append(part)
+                        size += len(part)
+                        if size >= chunk_size:
+                            break
+                        continue
+                    parts.append(part)
+                    size += len(part)
+                    value = child
+                    break
+            else:
+                for child in children:
+                    part = "" if first else ", "
+                    first = False
+                    if child.__class__ in leaves:
+                        part += __encode_leaf(child)
+                        parts.append(part)
+                        size += len(part)
+                        if size >= chunk_size:
+                            break
+                        continue
+                    parts.append(part)
+                    size += len(part)
+                    value = child
+                    break
+            frame[2] = first
+
+            if value is not __NO_CHILD:
+                break
+            if size >= chunk_size:
+                continue
+
+            stack.pop()
+            if len(stack) == walkFrom:
+                walkFrom = None
+            for reference in references:
+                visited.remove(reference)
+            part = "}" if is_dict else "]"
+            parts.append(part)
+            size += len(part)
+
+        if not stack and value is __NO_CHILD:
+            if parts:
+                yield "".join(parts)
+            return
+
+
+def dump(value: Any, fp: Any, middleware: Optional[SerializationMiddleware] = None, chunk_size: int = 65536):
+    """
+    Serializes an object as JSON straight into a file-like object.
+
+    Binary streams receive UTF-8 encoded bytes, anything else receives str chunks.
+
+    Args:
+        value (Any): The value to serialize
+        fp (Any): A writable file-like object
+    """
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+    for chunk in iter_encode(value, middleware, chunk_size):
+        fp.write(chunk.encode("utf-8") if binary else chunk)
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters that can follow a prefix of a JSON number, like the . of 12.5 or the e of 1e3
+_NUMBER_PARTS = frozenset("0123456789.eE+-")
+
+
+class _JsonReader:
+    """Buffers text read from a file-like object, decoding bytes as UTF-8 when needed."""
+
+    def __init__(self, fp: Any):
+        self.fp = fp
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self, size: int) -> bool:
+        while not self.eof:
+            chunk = self.fp.read(size)
+            self.eof = not chunk
+            if isinstance(chunk, (bytes, bytearray)):
+                chunk = self.decoder.decode(chunk, final=self.eof)
+            if chunk:
+                # Consumed text is dropped so the buffer only holds what is still being parsed
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self, size: int) -> str:
+        """Skips whitespace and returns the next character, or an empty string at the end of the input."""
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.read_more(size):
+                return ""
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def decode(self, size: int) -> Any:
+        """Decodes the JSON value starting at the current position, reading more input until it is complete."""
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A value running up to the end of the buffer may be a truncated number like the 12 of 123,
+                # and a number followed by one of its parts only a prefix of one like the 12 of 12.5
+                truncated = end == len(self.buffer) or value.__class__ in (int, float) and self.buffer[end] in _NUMBER_PARTS
+                if not truncated or self.eof:
+                    self.pos = end
+                    return value
+            self.read_more(size)
+            # Growing the reads keeps values larger than one chunk linear to parse
+            size *= 2
+
+
+def iter_load(fp: Any, classType: type, middleware: Optional[DeserializationMiddleware] = None, strict: bool = False, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Deserializes a top-level JSON array read from a file-like object, yielding its items one at a time.
+
+    Items are parsed and deserialized as they are read, so memory is bounded by a single item rather
+    than the whole document. Items are deserialized exactly like deserialize would for classType,
+    with the same middleware and strict mode.
+
+    Args:
+        fp (Any): A readable file-like object, in text or binary mode
+        classType (type): The list type of the document, like list[T]
+        chunk_size (int, optional): Number of characters or bytes read at a time. Defaults to 65536.
+
+    Yields:
+        Any: The deserialized items, in order
+    """
+    # Resolved up front so an unsupported classType fails here rather than on the first next()
+    return __iter_items(_JsonReader(fp), classType, _item_deserializer(classType, middleware, strict), chunk_size)
+
+
+def __iter_items(reader: _JsonReader, classType: type, deserializeItem: Callable[[Any], Any], chunk_size: int) -> Iterator[Any]:
+    if reader.peek(chunk_size) != "[":
+        raise reader.error("Expecting '['")
+    reader.pos += 1
+
+    if reader.peek(chunk_size) == "]":
+        reader.pos += 1
+    else:
+        index = 0
+        while True:
+            if reader.peek(chunk_size) == "":
+                raise reader.error("Expecting value")
+            value = reader.decode(chunk_size)
+            try:
+                item = deserializeItem(value)
+            except Exception as e:
+                raise DeserializeClassException(DeserializeListException(e, value, classType, index), None, classType, None)
+            yield item
+            index += 1
+
+            delimiter = reader.peek(chunk_size)
+            reader.pos += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                reader.pos -= 1
+                raise reader.error("Expecting ',' delimiter")
+
+    if reader.peek(chunk_size) != "":
+        raise reader.error("Extra data")
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.pserialize import AsyncDeserializer, AsyncSerializer, deserialize, serialize
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+STORE = [
+    Shelf(rows=[[ShoeBox(size, "Jordans", Condition.GOOD) for size in range(20)], []]),
+    Shelf(rows=[[ShoeBox(11, None, Condition.BAD)]]),
+]
+
+
+class Event:
+    def __init__(self, at: datetime = None):
+        self.at = at
+
+
+async def serialize_datetime(value, middleware):
+    await asyncio.sleep(0)
+    return value.isoformat()
+
+
+async def deserialize_datetime(value, middleware):
+    await asyncio.sleep(0)
+    return datetime.fromisoformat(value)
+
+
+async def failing_datetime(value, middleware):
+    raise ValueError("bad date")
+
+
+def run_with_ticks(coroutine):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        try:
+            return await coroutine
+        finally:
+            task.cancel()
+
+    return asyncio.run(main()), ticks
+
+
+def test_async_serialize_matches_serialize_and_yields():
+    result, ticks = run_with_ticks(AsyncSerializer(yield_every=5).serialize(STORE))
+
+    assert result == serialize(STORE)
+    assert ticks > 5
+
+
+def test_async_deserialize_matches_deserialize_and_yields():
+    value = serialize(STORE)
+
+    result, ticks = run_with_ticks(AsyncDeserializer(yield_every=2).deserialize(value, list[Shelf]))
+
+    assert result == deserialize(value, list[Shelf])
+    assert ticks > 5
+
+
+def test_async_middleware():
+    events = [Event(datetime(2022, 7, 25 + day)) for day in range(3)]
+    expected = serialize(events, {datetime: _datetime.serializer})
+
+    serialized = asyncio.run(AsyncSerializer({datetime: serialize_datetime}).serialize(events))
+    deserialized = asyncio.run(AsyncDeserializer({datetime: deserialize_datetime}).deserialize(serialized, list[Event]))
+
+    assert serialized == expected
+    assert [event.at for event in deserialized] == [event.at for event in events]
+
+
+def test_async_middleware_errors_match_sync_errors():
+    value = [{"at": "2022-07-25"}]
+
+    def sync_failing(value, middleware):
+        raise ValueError("bad date")
+
+    with pytest.raises(Exception) as expected:
+        deserialize(value, list[Event], {datetime: sync_failing})
+    with pytest.raises(Exception) as error:
+        asyncio.run(AsyncDeserializer({datetime: failing_datetime}).deserialize(value, list[Event]))
+
+    assert type(error.value) is type(expected.value)
+    assert str(error.value) == str(expected.value)
+
+
+def test_async_serialize_detects_cycles():
+    value = []
+    value.append(value)
+
+    with pytest.raises(SerializeCycleException):
+        asyncio.run(AsyncSerializer().serialize(value))
+
+
+def test_time_slice_yields():
+    result, ticks = run_with_ticks(AsyncSerializer(yield_every=10 ** 9, time_slice=0).serialize(STORE))
+
+    assert result == serialize(STORE)
+    assert ticks > 5
@@ -0,0 +1,27 @@
+import json
+
+from benchmarks import suite
+
+
+def test_every_case_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(suite, "MIN_SAMPLE", 0)
+    output = tmp_path / "results.json"
+
+    assert suite.main(["--sizes", "2", "--repeats", "1", "--rounds", "1", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert {name.split("/")[0] for name in results} == set(suite.CASES)
+    assert all(timing["best"] > 0 and timing["calibration"] > 0 for timing in results.values())
+
+
+def test_compare_flags_results_slower_than_the_threshold():
+    baseline = {"results": {"a": {"best": 1.0, "calibration": 1.0}, "b": {"best": 1.0, "calibration": 1.0}}}
+    results = {"results": {
+        "a": {"best": 1.05, "calibration": 1.0},
+        "b": {"best": 2.0, "calibration": 2.0},
+        "new": {"best": 1.0, "calibration": 1.0},
+    }}
+
+    assert suite.compare(results, baseline, 0.1) == {"a": (1.05, False), "b": (1.0, False)}
+    assert suite.compare(results, baseline, 0.1, calibrated=False)["b"] == (2.0, True)
+    assert suite.compare(results, baseline, 0.01)["a"][1]
@@ -0,0 +1,97 @@
+import io
+import json
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import pytest
+
+from src.pserialize import deserialize, deserialize_iterative, dump, iter_encode, iter_load, serialize, serialize_iterative
+from src.pserialize.deserialize import DeserializeClassException
+
+
+@dataclass
+class Thumbnail:
+    name: str
+    data: bytes
+    readings: array
+    mask: Optional[bytearray] = None
+
+
+def test_buffers_are_passed_through_by_reference():
+    data = b"\x00\x01" * 1000
+    buffer = bytearray(b"abc")
+    view = memoryview(data)
+
+    assert serialize(data) is data
+    assert serialize(buffer) is buffer
+    assert serialize(view) is view
+    assert serialize_iterative([data])[0] is data
+
+
+def test_array_is_compact():
+    readings = array("d", [1.5, 2.5, -3.0])
+    serialized = serialize(readings)
+    assert serialized["typecode"] == "d"
+    assert len(serialized["data"]) == 3 * readings.itemsize
+
+    result = deserialize(serialized, array)
+    assert result == readings and result.typecode == "d"
+
+
+def test_binary_deserialize_without_copies():
+    data = b"abc"
+    assert deserialize(data, bytes) is data
+    view = deserialize(data, memoryview)
+    assert view.obj is data
+    assert deserialize(memoryview(data), bytes) == data
+    assert deserialize(data, bytearray) == bytearray(data)
+    assert deserialize(None, Optional[bytes]) is None
+
+
+def test_binary_from_base64():
+    assert deserialize("YWJj", bytes) == b"abc"
+    assert deserialize("YWJj", bytearray) == bytearray(b"abc")
+    with pytest.raises(DeserializeClassException):
+        deserialize("not base64!", bytes)
+    with pytest.raises(DeserializeClassException):
+        deserialize(5, bytes)
+
+
+def test_object_round_trip_through_json_text():
+    thumbnail = Thumbnail("t", b"\xff\xd8\xff", array("H", [1, 2, 65535]), bytearray(b"\x01"))
+    text = "".join(iter_encode(thumbnail))
+    decoded = json.loads(text)
+    assert decoded["data"] == "/9j/"
+
+    result = deserialize(decoded, Thumbnail)
+    assert result.data == thumbnail.data
+    assert result.readings == thumbnail.readings
+    assert result.mask == thumbnail.mask
+    assert deserialize_iterative(serialize(thumbnail), Thumbnail).readings == thumbnail.readings
+
+
+def test_stream_round_trip():
+    thumbnails = [Thumbnail(str(i), bytes([i]), array("i", [i, -i])) for i in range(3)]
+    fp = io.BytesIO()
+    dump(thumbnails, fp)
+    fp.seek(0)
+    result = list(iter_load(fp, list[Thumbnail]))
+    assert [t.readings for t in result] == [t.readings for t in thumbnails]
+    assert [t.data for t in result] == [t.data for t in thumbnails]
+
+
+def test_non_contiguous_view_is_encoded():
+    view = memoryview(b"abcdef")[::2]
+    assert json.loads("".join(iter_encode(view))) == "YWNl"
+
+
+def test_union_with_binary_member():
+    assert deserialize(3, Union[bytes, int]) == 3
+    assert deserialize(b"x", Union[int, bytes]) == b"x"
+
+
+@pytest.mark.skipif(sys.byteorder != "little", reason="checks the little-endian layout")
+def test_array_data_is_little_endian():
+    assert serialize(array("H", [1]))["data"] == b"\x01\x00"
@@ -0,0 +1,89 @@
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+from src.pserialize import Serializer, serialize, serialize_iterative
+from src.pserialize.serialize import SerializeCycleException, compile_serializer
+
+from .models.dataclass import A
+from .models.enum import Number
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+serialize_module = sys.modules["src.pserialize.serialize"]
+
+
+@dataclass
+class Link:
+    value: int
+    next: object = None
+
+
+def chain(depth):
+    head = None
+    for value in range(depth):
+        head = Link(value, head)
+    return head
+
+
+def cycle():
+    first = Link(1)
+    first.next = Link(2, first)
+    return first
+
+
+VALUES = [
+    [1, (2, 3), {4}, frozenset([5])],
+    {Number.FIVE: {"nested": [A(3.0, "bee", 1)]}},
+    [Shelf([[ShoeBox(10, "Jordans", Condition.GOOD), ShoeBox(11, None, Condition.BAD)]])],
+    chain(50),
+]
+
+
+@pytest.mark.parametrize("check_cycles", [False, "depth"])
+@pytest.mark.parametrize("value", VALUES)
+def test_untracked_output_matches(value, check_cycles):
+    assert serialize(value, check_cycles=check_cycles) == serialize(value)
+    assert serialize_iterative(value, check_cycles=check_cycles) == serialize(value)
+    assert Serializer(check_cycles=check_cycles).serialize(value) == serialize(value)
+
+
+@pytest.mark.parametrize("check_cycles", [False, "depth"])
+def test_deep_graphs_fall_back_to_iterative(check_cycles):
+    serialized = serialize(chain(5000), check_cycles=check_cycles)
+
+    values = []
+    while serialized is not None:
+        values.append(serialized["value"])
+        serialized = serialized["next"]
+    assert values == list(reversed(range(5000)))
+
+
+@pytest.mark.parametrize("check_cycles", [False, "depth"])
+def test_cycles_are_caught_by_the_depth_guard(check_cycles, monkeypatch):
+    monkeypatch.setattr(serialize_module, "MAX_DEPTH", 100)
+    with pytest.raises(SerializeCycleException):
+        serialize(cycle(), check_cycles=check_cycles)
+    with pytest.raises(SerializeCycleException):
+        serialize_iterative(cycle(), check_cycles=check_cycles)
+    with pytest.raises(SerializeCycleException):
+        Serializer(iterative=True, check_cycles=check_cycles).serialize(cycle())
+
+
+@pytest.mark.parametrize("check_cycles", ["nope", 1, 0, None, "Depth"])
+def test_other_modes_are_rejected(check_cycles):
+    with pytest.raises(ValueError):
+        serialize(A(3.0, "bee", 1), check_cycles=check_cycles)
+    with pytest.raises(ValueError):
+        serialize_iterative(A(3.0, "bee", 1), check_cycles=check_cycles)
+    with pytest.raises(ValueError):
+        Serializer(check_cycles=check_cycles)
+
+
+def test_serializers_are_generated_per_mode():
+    tracked = compile_serializer(Link)
+    untracked = compile_serializer(Link, False)
+
+    assert tracked is not untracked
+    assert untracked is compile_serializer(Link, False)
+    assert untracked(Link(1), {}, set()) == tracked(Link(1), {}, set())
@@ -0,0 +1,93 @@
+import gc
+import sys
+import weakref
+from enum import IntEnum
+from typing import Any, Dict, List, Literal, Optional, TypeVar, Union
+
+import pytest
+
+from src.pserialize import deserialize, serialize
+from src.pserialize.serialization_utils import Kind, TypeCache, classify
+
+from .models.enum import Number
+
+
+class Size(IntEnum):
+    SMALL = 1
+
+
+@pytest.mark.parametrize("typeT,kind", [
+    (Any, Kind.ANY),
+    (type(None), Kind.NONE),
+    (int, Kind.PRIMITIVE),
+    (bool, Kind.PRIMITIVE),
+    (Size, Kind.EXTENDED_PRIMITIVE),
+    (Number, Kind.ENUM),
+    (list, Kind.LIST),
+    (List[int], Kind.LIST),
+    (tuple[int, ...], Kind.TUPLE),
+    (set[str], Kind.SET),
+    (frozenset[str], Kind.FROZENSET),
+    (Dict[str, int], Kind.DICT),
+    (Union[int, str], Kind.UNION),
+    (Optional[int], Kind.OPTIONAL),
+    (Literal["a"], Kind.LITERAL),
+    (TypeVar("T"), Kind.TYPEVAR),
+    (object, Kind.OBJECT),
+])
+def test_classify(typeT, kind):
+    assert classify(typeT) is kind
+    assert classify(typeT) is kind
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="PEP 604 unions require Python 3.10+")
+def test_classify_pep_604_unions():
+    assert classify(eval("int | str")) is Kind.UNION
+    assert classify(eval("int | None")) is Kind.OPTIONAL
+
+
+def test_type_cache_drops_entries_of_collected_classes():
+    cache = TypeCache()
+
+    class Dynamic:
+        pass
+
+    cache.remember(Dynamic, "value")
+    assert cache.lookup(Dynamic) == "value"
+
+    del Dynamic
+    gc.collect()
+
+    assert cache.entries == {}
+    assert cache.references == {}
+
+
+def test_type_cache_bounds_unreferenceable_types():
+    cache = TypeCache(max_strong_entries=2)
+
+    for size in range(4):
+        cache.remember(tuple(range(size)), size)
+
+    assert cache.lookup(()) is None
+    assert cache.lookup((0, 1, 2)) == 3
+    assert len(cache.strong_entries) == 2
+
+
+def test_dynamically_created_classes_are_not_kept_alive():
+    Dynamic = type("Dynamic", (), {"__annotations__": {"value": int}})
+    value = Dynamic()
+    value.value = 1
+
+    assert serialize(value) == {"value": 1}
+    assert classify(Dynamic) is Kind.OBJECT
+
+    reference = weakref.ref(Dynamic)
+    del Dynamic, value
+    gc.collect()
+
+    assert reference() is None
+
+
+def test_bare_collection_annotations_deserialize_as_any():
+    assert deserialize([1, "two"], list) == [1, "two"]
+    assert deserialize({"a": 1}, dict) == {"a": 1}
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Optional
+
+import pytest
+
+from src.pserialize import Deserializer, Serializer, deserialize_columnar, serialize, serialize_columnar
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@dataclass(frozen=True)
+class Tag:
+    name: str
+
+
+@dataclass
+class Chain:
+    name: str
+    next: Optional["Chain"] = None
+
+
+BOXES = [ShoeBox(size, "Jordans" if size % 2 else "Air", Condition.GOOD if size < 8 else Condition.BAD) for size in range(10)]
+
+
+def test_lists_of_objects_are_written_as_columns():
+    assert serialize_columnar(BOXES) == {"$columns": {
+        "size": list(range(10)),
+        "name": {"$values": ["Air", "Jordans"], "$codes": [0, 1] * 5},
+        "condition": {"$values": ["Good", "Bad"], "$codes": [0] * 8 + [1] * 2},
+    }}
+
+
+def test_high_cardinality_columns_are_kept_as_lists():
+    boxes = [ShoeBox(1, str(index), Condition.GOOD) for index in range(3)]
+
+    assert serialize_columnar(boxes)["$columns"]["name"] == ["0", "1", "2"]
+
+
+@pytest.mark.parametrize("value", [
+    [],
+    [1, "a", None],
+    [ShoeBox(1, "Air", Condition.GOOD), Point(1, 2)],
+    [Chain("a"), {"name": "b"}],
+])
+def test_other_values_are_written_like_serialize(value):
+    assert serialize_columnar(value) == serialize(value)
+
+
+def test_nested_lists_are_written_as_columns():
+    value = {"boxes": (ShoeBox(1, "Air", Condition.GOOD),), "nodes": [Chain("a", Chain("b"))]}
+
+    assert serialize_columnar(value) == {
+        "boxes": {"$columns": {"size": [1], "name": ["Air"], "condition": ["Good"]}},
+        "nodes": {"$columns": {"name": ["a"], "next": [{"name": "b", "next": None}]}},
+    }
+
+
+def test_round_trip():
+    shelves = [Shelf([BOXES[:4], BOXES[4:]]), Shelf([[], BOXES])]
+    points = (Point(1, 2), Point(3, 4))
+
+    assert deserialize_columnar(serialize_columnar(shelves), list[Shelf]) == shelves
+    assert deserialize_columnar(serialize_columnar(points), tuple[Point, ...]) == points
+    assert deserialize_columnar(serialize_columnar(points), tuple[Point, Point]) == points
+    assert deserialize_columnar(serialize_columnar([Tag("a"), Tag("a")]), set[Tag]) == {Tag("a")}
+    assert deserialize_columnar(serialize_columnar(BOXES), list[Optional[ShoeBox]]) == BOXES
+    assert deserialize_columnar(serialize_columnar(BOXES), list[Any]) == serialize(BOXES)
+
+
+def test_serializer_and_deserializer_modes():
+    value = Serializer(columnar=True).serialize(BOXES)
+
+    assert "$columns" in value
+    assert Deserializer(columnar=True).deserialize(value, list[ShoeBox]) == BOXES
+
+
+def test_unknown_columns_follow_strict():
+    value = {"$columns": {"size": [1, 2], "name": ["a", "b"], "condition": ["Good", "Bad"], "extra": {"$values": ["x"], "$codes": [0, 0]}}}
+
+    assert [box.extra for box in deserialize_columnar(value, list[ShoeBox])] == ["x", "x"]
+    assert not hasattr(deserialize_columnar(value, list[ShoeBox], strict=True)[0], "extra")
+
+
+def test_failures_point_at_the_row():
+    value = serialize_columnar(BOXES)
+    value["$columns"]["condition"]["$values"][1] = "Broken"
+
+    with pytest.raises(DeserializeClassException) as error:
+        deserialize_columnar(value, list[ShoeBox])
+
+    assert isinstance(error.value.error, DeserializeListException)
+    assert error.value.error.index == 8
+    assert error.value.error.value == {"size": 8, "name": "Air", "condition": "Broken"}
+    assert error.value.error.error.field_name == "condition"
+
+
+def test_detects_cycles():
+    first = Chain("a")
+    first.next = first
+
+    with pytest.raises(SerializeCycleException):
+        serialize_columnar([first, Chain("b")])
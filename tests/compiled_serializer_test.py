@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from src.pserialize import Serializer, serialize
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.enum import Number
+
+
+@dataclass
+class Address:
+    street: str
+    number: int
+
+
+@dataclass
+class Profile:
+    id: int
+    name: str
+    score: float
+    active: bool
+    number: Number
+    nickname: Optional[str]
+    tags: list[str]
+    address: Address
+    friend: Optional["Profile"] = None
+
+
+def make_profile(**kwargs):
+    fields = dict(
+        id=1,
+        name="Andy",
+        score=1.5,
+        active=True,
+        number=Number.TWO,
+        nickname=None,
+        tags=["a", "b"],
+        address=Address("Main", 4),
+    )
+    fields.update(kwargs)
+    return Profile(**fields)
+
+
+def test_compiled_serializer_matches_generic_output():
+    profile = make_profile(friend=make_profile(id=2, nickname="Bo"))
+
+    assert Serializer().compile(Profile)(profile, {}, set()) == {
+        "id": 1,
+        "name": "Andy",
+        "score": 1.5,
+        "active": True,
+        "number": "two",
+        "nickname": None,
+        "tags": ["a", "b"],
+        "address": {"street": "Main", "number": 4},
+        "friend": {
+            "id": 2,
+            "name": "Andy",
+            "score": 1.5,
+            "active": True,
+            "number": "two",
+            "nickname": "Bo",
+            "tags": ["a", "b"],
+            "address": {"street": "Main", "number": 4},
+            "friend": None,
+        },
+    }
+
+
+def test_values_not_matching_annotations_use_generic_path():
+    profile = make_profile(id="one", tags=("x", Number.ONE), address={"street": "Side"})
+
+    serialized = serialize(profile)
+
+    assert serialized["id"] == "one"
+    assert serialized["tags"] == ["x", "one"]
+    assert serialized["address"] == {"street": "Side"}
+
+
+def test_extra_instance_attributes_are_serialized():
+    profile = make_profile()
+    profile.extra = Number.ONE
+
+    assert serialize(profile)["extra"] == "one"
+
+
+def test_middleware_for_specialized_field_type_is_applied():
+    serializer = Serializer(middleware={int: lambda value, _: str(value)})
+
+    serialized = serializer.serialize(make_profile())
+
+    assert serialized["id"] == "1"
+    assert serialized["address"]["number"] == "4"
+
+
+def test_cycle_through_compiled_objects_raises():
+    profile = make_profile()
+    profile.friend = profile
+
+    with pytest.raises(SerializeCycleException):
+        serialize(profile)
+
+
+def test_non_object_types_cannot_be_compiled():
+    with pytest.raises(TypeError):
+        Serializer().compile(int)
@@ -0,0 +1,116 @@
+import gc
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, make_dataclass
+from typing import Optional
+
+from src.pserialize import Deserializer, deserialize
+
+
+@dataclass
+class Node:
+    name: str
+    child: Optional["Node"] = None
+
+
+@dataclass
+class Holder:
+    later: "DefinedLater"
+
+
+def test_self_referencing_class_deserializes():
+    value = deserialize({"name": "a", "child": {"name": "b", "child": {"name": "c"}}}, Node)
+
+    assert value == Node("a", Node("b", Node("c")))
+
+
+def test_repeated_deserialize_reuses_compiled_plan():
+    data = [{"name": str(i)} for i in range(3)]
+
+    assert deserialize(data, list[Node]) == deserialize(data, list[Node])
+    assert deserialize(data, list[Node]) == [Node("0"), Node("1"), Node("2")]
+
+
+def test_middleware_changes_are_picked_up_between_calls():
+    deserializer = Deserializer()
+
+    assert deserializer.deserialize("4", int) == 4
+
+    deserializer.middleware[int] = lambda value, _: "middleware"
+
+    assert deserializer.deserialize("4", int) == "middleware"
+    assert deserializer.deserialize(["4"], list[int]) == ["middleware"]
+
+
+def test_strict_and_non_strict_plans_are_kept_apart():
+    data = {"name": "a", "extra": 1}
+
+    assert not hasattr(deserialize(data, Node, strict=True), "extra")
+    assert deserialize(data, Node).extra == 1
+
+
+def test_unresolved_forward_reference_fails_until_defined():
+    global DefinedLater
+
+    error = None
+    try:
+        deserialize({"later": {"value": 1}}, Holder)
+    except Exception as e:
+        error = e
+
+    assert error is not None
+
+    @dataclass
+    class DefinedLater:
+        value: int
+
+    assert deserialize({"later": {"value": "1"}}, Holder) == Holder(DefinedLater(1))
+
+
+def test_concurrent_first_calls_only_run_complete_plans():
+    class SlowHash(type):
+        # Hands the GIL over while Outer's plan is compiled, so the other threads call deserialize
+        # in between
+        def __hash__(cls):
+            time.sleep(0.001)
+            return id(cls)
+
+    @dataclass
+    class Inner(metaclass=SlowHash):
+        value: int
+
+    @dataclass
+    class Outer:
+        name: str
+        inner: Inner
+        others: list[Inner]
+
+    data = {"name": "a", "inner": {"value": 1}, "others": [{"value": 2}]}
+    barrier = threading.Barrier(8)
+
+    def first_call(_):
+        barrier.wait()
+        return deserialize(data, Outer)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(first_call, range(8)))
+
+    assert results == [Outer("a", Inner(1), [Inner(2)])] * 8
+
+
+def test_dynamically_created_classes_are_not_kept_alive():
+    First = make_dataclass("First", [("value", int)])
+    assert deserialize({"value": 1}, First) == First(1)
+    reference = weakref.ref(First)
+    del First
+
+    # Plan sets only keep the most recently used plans, those of later classes evict it
+    for index in range(1500):
+        Dynamic = make_dataclass(f"Dynamic{index}", [("value", int)])
+        assert deserialize({"value": index}, Dynamic) == Dynamic(index)
+    del Dynamic
+    gc.collect()
+
+    assert reference() is None
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from typing import Annotated, Literal, Optional, Union
+
+import pytest
+
+from src.pserialize import (
+    Discriminator,
+    deserialize,
+    deserialize_columnar,
+    deserialize_references,
+    iter_encode,
+    pack,
+    serialize,
+    serialize_async,
+    serialize_columnar,
+    serialize_iterative,
+    serialize_references,
+    unpack
+)
+from src.pserialize.deserialize import DeserializeClassException
+from src.pserialize.serialize import serialize_into
+
+
+@dataclass
+class Cat:
+    name: str
+    lives: int
+
+
+@dataclass
+class Dog:
+    name: str
+    kind: Literal["dog", "puppy"] = "dog"
+
+
+@dataclass
+class Bird:
+    __tag__ = "parrot"
+    name: str
+
+
+Pet = Annotated[Union[Cat, Dog, Bird], Discriminator("kind")]
+
+
+@dataclass
+class Home:
+    pets: list[Pet]
+    favourite: Optional[Pet] = None
+
+
+class Event:
+    __discriminator__ = Discriminator("type")
+
+
+class Opened(Event):
+    def __init__(self, door: str = None):
+        self.door = door
+
+
+class Closed(Event):
+    __tag__ = "shut"
+
+    def __init__(self, door: str = None, slammed: bool = None):
+        self.door = door
+        self.slammed = slammed
+
+
+def test_annotated_union_dispatches_on_the_tag():
+    home = deserialize({
+        "pets": [
+            {"kind": "Cat", "name": "tom", "lives": 9},
+            {"kind": "puppy", "name": "rex"},
+            {"kind": "parrot", "name": "polly"},
+        ],
+        "favourite": {"kind": "dog", "name": "fido"},
+    }, Home)
+
+    assert home == Home([Cat("tom", 9), Dog("rex", "puppy"), Bird("polly")], Dog("fido"))
+    # The tag is consumed for members that don't declare it as a field
+    assert vars(home.pets[0]) == {"name": "tom", "lives": 9}
+
+
+@dataclass
+class Owner:
+    pet: Pet
+    pets_by_name: dict[str, Pet]
+
+
+def test_annotated_union_round_trips():
+    home = Home([Cat("tom", 9), Dog("rex", "puppy"), Bird("polly")], Cat("felix", 3))
+    owner = Owner(Cat("tom", 9), {"polly": Bird("polly")})
+
+    serialized = serialize(home)
+
+    assert serialized == {
+        "pets": [
+            {"kind": "Cat", "name": "tom", "lives": 9},
+            {"name": "rex", "kind": "puppy"},
+            {"kind": "parrot", "name": "polly"},
+        ],
+        "favourite": {"kind": "Cat", "name": "felix", "lives": 3},
+    }
+    assert deserialize(serialized, Home) == home
+    assert serialize(owner) == {"pet": {"kind": "Cat", "name": "tom", "lives": 9}, "pets_by_name": {"polly": {"kind": "parrot", "name": "polly"}}}
+    assert deserialize(serialize(owner), Owner) == owner
+
+
+def test_annotated_union_tags_on_the_generic_path():
+    owner = Owner(Cat("tom", 9), {})
+    owner.note = "extra attributes take the generic object path"
+
+    assert serialize(owner)["pet"] == {"kind": "Cat", "name": "tom", "lives": 9}
+
+
+@pytest.mark.parametrize("value", [
+    Home([Cat("tom", 9), Dog("rex", "puppy"), Bird("polly")], Cat("felix", 3)),
+    Home([Cat("tom", 9), Cat("felix", 3)]),
+    Owner(Cat("tom", 9), {"polly": Bird("polly"), "rex": Dog("rex")}),
+])
+def test_annotated_union_tags_through_every_engine(value):
+    classType = type(value)
+    serialized = serialize(value)
+
+    assert serialize_iterative(value) == serialized
+    assert asyncio.run(serialize_async(value, yield_every=1)) == serialized
+    assert json.loads("".join(iter_encode(value, chunk_size=1))) == serialized
+    assert unpack(pack(value), classType) == value
+    assert serialize_into(value, classType) == serialized
+    assert deserialize(serialized, classType) == value
+    assert deserialize_columnar(serialize_columnar(value), classType) == value
+    assert deserialize_references(serialize_references(value), classType) == value
+
+
+def test_annotated_union_tags_through_shared_references():
+    cat = Cat("tom", 9)
+    home = deserialize_references(serialize_references(Home([cat, cat], cat)), Home)
+
+    assert home == Home([cat, cat], cat)
+    assert home.pets[0] is home.pets[1] is home.favourite
+
+
+@dataclass
+class PetChain:
+    pet: Pet
+    next: Optional["PetChain"] = None
+
+
+def test_annotated_union_tags_on_deep_graphs():
+    depth = sys.getrecursionlimit() * 2
+    chain = None
+    for index in range(depth):
+        chain = PetChain(Cat("tom", index) if index % 2 else Bird("polly"), chain)
+
+    # Deeper than the recursion limit, serialize falls back to the iterative walk
+    for serialized in (serialize(chain), serialize_iterative(chain), asyncio.run(serialize_async(chain))):
+        link, kinds = serialized, []
+        while link is not None:
+            kinds.append(link["pet"]["kind"])
+            link = link["next"]
+        assert kinds == ["Cat" if index % 2 else "parrot" for index in reversed(range(depth))]
+
+    assert "".join(iter_encode(chain)).count('"pet": {"kind": ') == depth
+
+    link = deserialize(serialized, PetChain)
+    while link is not None:
+        assert type(link.pet) is (Cat if link.pet.name == "tom" else Bird)
+        link = link.next
+
+
+def test_unknown_or_missing_tags_fail():
+    with pytest.raises(DeserializeClassException, match="Unknown kind 'Fish'"):
+        deserialize({"kind": "Fish", "name": "nemo"}, Pet)
+    with pytest.raises(DeserializeClassException, match="Expected discriminator field 'kind'"):
+        deserialize({"name": "nemo"}, Pet)
+
+
+def test_base_class_marker_round_trips_through_subclasses():
+    events = [Opened("front"), Closed("back", True)]
+
+    serialized = serialize(events)
+
+    assert serialized == [{"type": "Opened", "door": "front"}, {"type": "shut", "door": "back", "slammed": True}]
+    assert serialize_iterative(events) == serialized
+    assert json.loads("".join(iter_encode(events))) == serialized
+
+    opened, closed = deserialize(serialized, list[Event])
+    assert type(opened) is Opened and vars(opened) == {"door": "front"}
+    assert type(closed) is Closed and vars(closed) == {"door": "back", "slammed": True}
+
+
+def test_subclasses_defined_later_are_found():
+    class Locked(Event):
+        def __init__(self, door: str = None):
+            self.door = door
+
+    assert type(deserialize({"type": "Locked", "door": "side"}, Event)) is Locked
+
+
+def test_other_annotated_metadata_is_ignored():
+    assert deserialize(["1", 2], list[Annotated[int, "metadata"]]) == [1, 2]
@@ -1,8 +1,17 @@
 
 
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+import pytest
+
+from src.pserialize import deserialize, serialize
+from src.pserialize.deserialize import DeserializeClassException
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException, serialize_into
 
-from src.pserialize.serialize import serialize_into
 
 def test_serialize_into():
     @dataclass
@@ -28,3 +37,90 @@ def test_serialize_into():
         "name": "Andy",
         "email": "andy@gmail.com"
     }
+
+
+class Role(Enum):
+    ADMIN = "admin"
+    USER = "user"
+
+
+@dataclass
+class Address:
+    street: str
+    number: int
+    secret: str = "hidden"
+
+
+@dataclass
+class Account:
+    id: int
+    name: str
+    role: Role
+    address: Optional[Address]
+    previous: list[Address]
+    created: datetime
+    manager: Optional["Account"] = None
+
+
+@dataclass
+class AddressDTO:
+    number: str
+    street: str
+
+
+@dataclass
+class AccountDTO:
+    name: str
+    id: int
+    role: str
+    address: Optional[AddressDTO]
+    previous: list[AddressDTO]
+    created: str
+    manager: Optional["AccountDTO"]
+    nickname: Optional[str] = None
+
+
+S_MIDDLEWARE = {datetime: _datetime.serializer}
+D_MIDDLEWARE = {datetime: _datetime.deserializer}
+
+
+def test_serialize_into_matches_full_walks():
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    accounts = [
+        Account(1, "Andy", Role.ADMIN, Address("Main", 5), [Address("Old", 1), Address("Older", 2)], created),
+        Account(1, "Andy", Role.ADMIN, None, [], created),
+        Account(1, "Andy", Role.ADMIN, Address("Main", 5), [], created, Account(2, "Bo", Role.USER, None, [], created)),
+        Account("7", "Andy", "user", Address("Main", 5), [Address("Old", 1)], created),
+    ]
+
+    for account in accounts:
+        serialized = serialize(account, S_MIDDLEWARE)
+        expected = serialize(deserialize(serialized, AccountDTO, D_MIDDLEWARE, strict=True))
+
+        projected = serialize_into(account, AccountDTO, S_MIDDLEWARE, D_MIDDLEWARE)
+
+        assert projected == expected
+        assert list(projected) == list(expected)
+        assert list(projected["address"] or {}) == list(expected["address"] or {})
+
+
+def test_serialize_into_fills_missing_fields_after_present_ones():
+    @dataclass
+    class Partial:
+        id: int
+
+    projected = serialize_into(Partial(3), AccountDTO, S_MIDDLEWARE, D_MIDDLEWARE)
+
+    assert projected == serialize(deserialize(serialize(Partial(3)), AccountDTO, D_MIDDLEWARE, strict=True))
+    assert list(projected)[0] == "id"
+
+
+def test_serialize_into_reports_full_walk_errors():
+    with pytest.raises(DeserializeClassException) as e:
+        serialize_into(Account("x", "Andy", Role.ADMIN, None, [], datetime(2024, 1, 2)), AccountDTO, S_MIDDLEWARE, D_MIDDLEWARE)
+    assert "id:" in str(e.value)
+
+    account = Account(1, "Andy", Role.ADMIN, None, [], datetime(2024, 1, 2))
+    account.manager = account
+    with pytest.raises(SerializeCycleException):
+        serialize_into(account, AccountDTO, S_MIDDLEWARE, D_MIDDLEWARE)
@@ -1,6 +1,9 @@
+from enum import Enum, Flag, IntEnum
+
 import pytest
 
 from src.pserialize import serialize, deserialize
+from src.pserialize.deserialize import DeserializeClassException
 
 from .models.enum import Number
 
@@ -21,3 +24,48 @@ def test_serialize_enum(input, expected):
 def test_deserialize_enum(input, type, expected):
     assert deserialize(input, type) == expected
 
+
+class Shade(Enum):
+    DARK = 1
+    BLACK = 1
+    LIGHT = [2]
+
+    @classmethod
+    def _missing_(cls, value):
+        return cls.DARK if value == "dark" else None
+
+
+class Level(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Access(Flag):
+    READ = 1
+    WRITE = 2
+
+
+@pytest.mark.parametrize("input,type,expected", [
+    (1, Shade, Shade.DARK),
+    (1.0, Shade, Shade.DARK),
+    ([2], Shade, Shade.LIGHT),
+    ("dark", Shade, Shade.DARK),
+    (Level.HIGH, Level, Level.HIGH),
+    (True, Level, Level.LOW),
+    (3, Access, Access.READ | Access.WRITE),
+    (None, Number, None),
+])
+def test_deserialize_enum_like_its_constructor(input, type, expected):
+    assert deserialize(input, type) is expected
+
+
+def test_deserialize_enum_rejects_unknown_values():
+    with pytest.raises(DeserializeClassException):
+        deserialize("seven", Number)
+
+
+def test_serialize_enum_values_with_middleware():
+    middleware = {int: lambda value, middleware: value * 10}
+
+    assert serialize([Shade.DARK, Number.ONE], middleware) == [10, "one"]
+    assert serialize([Shade.LIGHT]) == [[2]]
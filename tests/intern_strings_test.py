@@ -0,0 +1,44 @@
+import json
+
+from src.pserialize import Deserializer, deserialize
+
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+DATA = json.loads(json.dumps([{"size": size, "name": "Jordans", "condition": "Good"} for size in range(3)]))
+
+
+def test_repeated_strings_share_one_object():
+    boxes = deserialize(DATA, list[ShoeBox], intern_strings=True)
+
+    assert len({id(box.name) for box in boxes}) == 1
+    assert [box.condition for box in boxes] == [Condition.GOOD] * 3
+
+
+def test_strings_are_not_interned_by_default():
+    boxes = deserialize(DATA, list[ShoeBox])
+
+    assert len({id(box.name) for box in boxes}) == 3
+
+
+def test_str_collection_items_are_interned():
+    value = json.loads('{"a": ["x", "x"], "b": ["x"]}')
+    names = deserialize(value, dict[str, list[str]], intern_strings=True)
+
+    assert names == {"a": ["x", "x"], "b": ["x"]}
+    assert names["a"][0] is names["a"][1] is names["b"][0]
+
+
+def test_interning_does_not_outlive_the_call():
+    deserialize(DATA, list[ShoeBox], intern_strings=True)
+    first = deserialize(DATA, list[ShoeBox], intern_strings=True)[0].name
+    second = deserialize(json.loads(json.dumps(DATA)), list[ShoeBox], intern_strings=True)[0].name
+
+    assert first == second and first is not second
+
+
+def test_deserializer_option():
+    value = json.loads(json.dumps({"rows": [DATA, DATA]}))
+    shelf = Deserializer(intern_strings=True).deserialize(value, Shelf)
+
+    assert len({id(box.name) for row in shelf.rows for box in row}) == 1
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, TypeVar, Union
+
+import pytest
+
+from src.pserialize import Deserializer, deserialize, deserialize_iterative
+
+from .models.dataclass import A
+from .models.enum import Number
+from .models.shoe_store import Shelf, ShoeBox
+
+
+BoundInt = TypeVar("BoundInt", bound=int)
+
+
+@dataclass
+class Leaf:
+    number: Number
+
+
+@dataclass
+class Branch:
+    leaves: list[Leaf]
+    lookup: dict[str, Leaf]
+    pair: tuple[int, Leaf]
+    tags: frozenset[str]
+    maybe: Optional[Leaf]
+    either: Union[int, str]
+    mode: Literal["a", "b"]
+    bound: BoundInt
+    anything: Any
+
+
+@dataclass
+class Link:
+    value: int
+    next: Optional["Link"] = None
+
+
+def link_data(depth):
+    data = None
+    for value in range(depth):
+        data = {"value": value, "next": data}
+    return data
+
+
+def link_values(link):
+    values = []
+    while link is not None:
+        values.append(link.value)
+        link = link.next
+    return values
+
+
+BRANCH = {
+    "leaves": [{"number": "one"}, {"number": "two"}],
+    "lookup": {"first": {"number": "three"}},
+    "pair": ["1", {"number": "four"}],
+    "tags": ["x", "y"],
+    "maybe": None,
+    "either": "e",
+    "mode": "a",
+    "bound": "5",
+    "anything": {"raw": [1]},
+    "extra": True,
+}
+
+
+@pytest.mark.parametrize("value,classType", [
+    (BRANCH, Branch),
+    ({"c": 3.0, "b": "bee", "a": 1}, A),
+    ([{"rows": [[{"size": 10, "name": "Jordans", "condition": "Good"}]]}], list[Shelf]),
+    ({"size": 12, "condition": "Bad"}, ShoeBox),
+    ([[1, "2"], [3.0]], list[list[int]]),
+    (None, Branch),
+])
+def test_iterative_matches_recursive(value, classType):
+    assert deserialize_iterative(value, classType) == deserialize(value, classType)
+
+
+def test_iterative_strict_mode_ignores_extra_fields():
+    branch = deserialize_iterative(BRANCH, Branch, strict=True)
+
+    assert not hasattr(branch, "extra")
+    assert branch.pair == (1, Leaf(Number.FOUR))
+
+
+@pytest.mark.parametrize("value,classType", [
+    ({"leaves": [{"number": "one"}, {"number": "1"}]}, Branch),
+    ({"lookup": {"first": {"number": "1"}}}, Branch),
+    ({"pair": [1, {"number": "1"}]}, Branch),
+    ({"pair": [1]}, Branch),
+    ({"1": [1], "two": [2]}, dict[int, list[int]]),
+    ({"1": [1, "x"]}, dict[int, list[int]]),
+    ([[1], [2, "x"]], list[set[int]]),
+    ({"value": 1, "next": {"value": 2, "next": {"value": "x"}}}, Link),
+])
+def test_iterative_builds_the_same_error_chain(value, classType):
+    with pytest.raises(Exception) as recursive:
+        deserialize(value, classType)
+    with pytest.raises(Exception) as iterative:
+        deserialize_iterative(value, classType)
+
+    assert type(iterative.value) is type(recursive.value)
+    assert str(iterative.value) == str(recursive.value)
+
+
+def test_iterative_handles_values_deeper_than_recursion_limit():
+    link = Deserializer(iterative=True).deserialize(link_data(5000), Link)
+
+    assert link_values(link) == list(reversed(range(5000)))
+
+
+def test_deserialize_falls_back_to_iterative_for_deep_values():
+    data = []
+    for _ in range(3000):
+        data = [data]
+
+    value = deserialize(data, list)
+    depth = 0
+    while value:
+        value = value[0]
+        depth += 1
+
+    assert depth == 3000
+    assert link_values(deserialize(link_data(5000), Link)) == list(reversed(range(5000)))
+
+
+def test_iterative_reports_deep_failures_with_full_path():
+    data = link_data(3000)
+    innermost = data
+    while innermost["next"] is not None:
+        innermost = innermost["next"]
+    innermost["value"] = "x"
+
+    with pytest.raises(Exception) as error:
+        deserialize_iterative({"wrapped": data}, dict[str, Link])
+
+    link = "next:Union[Link, NoneType]"
+    assert str(error.value) == "dict[str,Link].value -> " + " -> ".join([link] * 2999) + \
+        " -> value:int -> 'x' |invalid literal for int() with base 10: 'x'|"
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+from src.pserialize import Serializer, serialize, serialize_iterative
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.dataclass import A
+from .models.enum import Number
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+@dataclass
+class Link:
+    value: int
+    next: object = None
+
+
+def chain(depth):
+    head = None
+    for value in range(depth):
+        head = Link(value, head)
+    return head
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    1,
+    "two",
+    Number.THREE,
+    [1, (2, 3), {4}, frozenset([5])],
+    {Number.FIVE: {"nested": [A(3.0, "bee", 1)]}},
+    [Shelf([[ShoeBox(10, "Jordans", Condition.GOOD), ShoeBox(11, None, Condition.BAD)]])],
+    chain(50),
+])
+def test_iterative_matches_recursive(value):
+    assert serialize_iterative(value) == serialize(value)
+
+
+def chain_values(serialized):
+    values = []
+    while serialized is not None:
+        values.append(serialized["value"])
+        serialized = serialized["next"]
+    return values
+
+
+def test_iterative_handles_graphs_deeper_than_recursion_limit():
+    serialized = Serializer(iterative=True).serialize(chain(5000))
+
+    assert chain_values(serialized) == list(reversed(range(5000)))
+
+
+def test_iterative_applies_middleware():
+    serializer = Serializer(middleware={datetime: _datetime.serializer}, iterative=True)
+
+    assert serializer.serialize([datetime(2022, 7, 25)]) == ["2022-07-25T00:00:00"]
+
+
+def test_iterative_detects_cycles():
+    head = chain(3)
+    head.next.next.next = head
+
+    with pytest.raises(SerializeCycleException):
+        serialize_iterative(head)
+
+
+def test_iterative_allows_shared_references():
+    child = Link(1)
+
+    assert serialize_iterative([child, child]) == [{"value": 1, "next": None}] * 2
+
+
+def test_serialize_falls_back_to_iterative_for_deep_graphs():
+    assert chain_values(serialize(chain(5000))) == list(reversed(range(5000)))
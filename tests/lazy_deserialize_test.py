@@ -0,0 +1,114 @@
+import copy
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from src.pserialize import Deserializer, deserialize, materialize, serialize
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException, is_lazy
+
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+@dataclass(frozen=True)
+class Store:
+    name: str
+    shelves: list[Shelf]
+    manager: "Manager" = None
+
+
+@dataclass
+class Manager:
+    name: str
+    age: int
+
+
+STORE = Store(
+    "Kicks",
+    [Shelf(rows=[[ShoeBox(10, "Jordans", Condition.GOOD)], []]), Shelf(rows=[])],
+    Manager("Ann", 40),
+)
+
+
+def lazy(value, classType):
+    return Deserializer(lazy=True).deserialize(value, classType)
+
+
+def test_structured_fields_are_deserialized_on_first_read():
+    store = lazy(serialize(STORE), Store)
+
+    assert is_lazy(store)
+    assert vars(store) == {"name": "Kicks"}
+    assert store.manager == Manager("Ann", 40)
+    assert vars(store) == {"name": "Kicks", "manager": Manager("Ann", 40)}
+    assert store.shelves[0].rows[0][0] == ShoeBox(10, "Jordans", Condition.GOOD)
+    assert store.shelves is store.shelves
+
+
+def test_lazy_objects_compare_and_serialize_like_eager_ones():
+    serialized = serialize(STORE)
+    store = lazy(serialized, Store)
+
+    assert isinstance(store, Store) and store.__class__ is Store
+    assert store == deserialize(serialized, Store)
+    assert serialize(lazy(serialized, Store)) == serialized
+    assert list(serialize(lazy(serialized, Store))) == list(serialized)
+
+
+def test_errors_surface_on_read_with_the_field_path():
+    serialized = serialize(STORE)
+    serialized["manager"]["age"] = "old"
+    with pytest.raises(DeserializeClassException) as eager:
+        deserialize(serialized, Store)
+    serialized["shelves"] = [{"rows": "nope"}, 3]
+
+    store = lazy(serialized, Store)
+    assert store.name == "Kicks"
+
+    with pytest.raises(DeserializeClassException) as error:
+        store.manager
+    assert str(error.value) == str(eager.value)
+
+    with pytest.raises(DeserializeClassException) as error:
+        store.shelves
+    assert isinstance(error.value.error.error, DeserializeListException)
+
+    # A failed field stays deferred and fails again
+    with pytest.raises(DeserializeClassException):
+        store.manager
+
+
+def test_materialize_restores_field_order():
+    store = lazy(serialize(STORE), Store)
+    store.manager
+
+    assert materialize(store) is store
+    assert list(vars(store)) == ["name", "shelves", "manager"]
+    assert materialize(3) == 3
+
+
+def test_fields_assigned_before_their_first_read_are_kept():
+    box = ShoeBox(9, "Air", Condition.BAD)
+    shelf = lazy(serialize(STORE.shelves[0]), Shelf)
+    shelf.rows = [[box]]
+
+    assert shelf.rows == [[box]]
+    assert materialize(shelf).rows == [[box]]
+
+    shelf = lazy(serialize(STORE.shelves[0]), Shelf)
+    shelf.rows = []
+
+    assert serialize(shelf) == {"rows": []}
+
+
+def test_copy_and_pickle_produce_plain_instances():
+    store = lazy(serialize(STORE), Store)
+
+    for clone in (copy.copy(store), pickle.loads(pickle.dumps(store))):
+        assert type(clone) is Store
+        assert clone == STORE
+
+
+def test_unknown_attributes_still_raise():
+    with pytest.raises(AttributeError):
+        lazy(serialize(STORE), Store).missing
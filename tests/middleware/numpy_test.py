@@ -0,0 +1,66 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.pserialize import Deserializer, Serializer, iter_encode
+
+from src.pserialize.middleware.numpy import DESERIALIZATION_MIDDLEWARE, SERIALIZATION_MIDDLEWARE, _ndarray
+
+serializer = Serializer(middleware=SERIALIZATION_MIDDLEWARE)
+deserializer = Deserializer(middleware=DESERIALIZATION_MIDDLEWARE)
+
+
+@dataclass
+class Reading:
+    sensor: str
+    values: np.ndarray
+
+
+def test_serialize_ndarray_as_buffer_view():
+    array = np.arange(6, dtype="<f8").reshape(2, 3)
+
+    serialized = serializer.serialize(array)
+
+    assert serialized["dtype"] == "<f8"
+    assert serialized["shape"] == [2, 3]
+    assert np.shares_memory(np.asarray(serialized["data"]), array)
+
+
+@pytest.mark.parametrize("array", [
+    np.arange(12.0).reshape(3, 4),
+    np.arange(12).reshape(3, 4).T,
+    np.array(5),
+    np.array([], dtype=">i2"),
+    np.zeros(2, dtype=[("a", "<i4"), ("b", "<f8", (2,))]),
+])
+def test_ndarray_round_trip_through_json(array):
+    text = "".join(iter_encode(Reading("s", array), SERIALIZATION_MIDDLEWARE))
+
+    deserialized = deserializer.deserialize(json.loads(text), Reading).values
+
+    assert deserialized.dtype == array.dtype
+    assert deserialized.shape == array.shape
+    assert (deserialized == array).all()
+    assert deserialized.flags.writeable
+
+
+def test_deserialize_copies_once_and_views_on_request():
+    array = np.arange(4)
+    serialized = serializer.serialize(array)
+
+    assert not np.shares_memory(deserializer.deserialize(serialized, np.ndarray), array)
+    view = _ndarray.view_deserializer(serialized)
+    assert np.shares_memory(view, array)
+
+
+def test_list_forms():
+    array = np.arange(4).reshape(2, 2)
+
+    serialized = Serializer(middleware={np.ndarray: _ndarray.list_serializer}).serialize(array)
+
+    assert serialized == [[0, 1], [2, 3]]
+    assert (deserializer.deserialize(serialized, np.ndarray) == array).all()
+    assert serializer.serialize(np.array([1, "a"], dtype=object)) == [1, "a"]
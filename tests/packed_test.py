@@ -0,0 +1,141 @@
+import json
+from array import array
+from datetime import datetime
+from enum import IntEnum
+from typing import Any, NamedTuple, Optional
+
+import pytest
+
+from src.pserialize import Deserializer, Serializer, deserialize, pack, serialize, unpack
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.dataclass import A
+from .models.enum import Number
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+class Level(IntEnum):
+    LOW = 1
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Route:
+    def __init__(self, name: str, stops: list[Point], boxes: dict[str, Optional[ShoeBox]], weight: float = 0.0):
+        self.name = name
+        self.stops = stops
+        self.boxes = boxes
+        self.weight = weight
+
+    def __eq__(self, other: object) -> bool:
+        return vars(self) == vars(other)
+
+
+STORE = [
+    Shelf(rows=[
+        [ShoeBox(10, "Jordans é", Condition.EXCELLENT), ShoeBox(11, None, Condition.BAD)],
+        [],
+    ])
+]
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    True,
+    False,
+    0,
+    127,
+    128,
+    -1,
+    -32,
+    -33,
+    2 ** 100,
+    -(2 ** 100),
+    1.5,
+    float("inf"),
+    "",
+    "x" * 31,
+    "quote \" and unicode é \ud800",
+    "y" * 1000,
+    b"\x00\xff",
+    bytearray(300),
+    memoryview(b"abcd")[::2],
+    array("i", [1, -2, 3]),
+    Number.ONE,
+    Level.LOW,
+    [],
+    {},
+    list(range(20)),
+    {str(i): i for i in range(20)},
+    [[[]], {}],
+    {Number.FIVE: [1, (2, 3), frozenset([4])], 1: None, 2.5: False, None: Level.LOW},
+    A(3.0, "bee", 1),
+    Point(1, 2),
+    STORE,
+])
+def test_unpack_to_any_matches_serialize(value):
+    assert unpack(pack(value), Any) == serialize(value)
+
+
+def test_round_trip_matches_deserialize():
+    route = Route("north", [Point(1, 2), Point(-3, 400)], {"a": ShoeBox(9, "Air", Condition.GOOD), "b": None}, 2.5)
+
+    assert unpack(pack(route), Route) == route
+    assert unpack(pack(STORE), list[Shelf]) == deserialize(serialize(STORE), list[Shelf])
+    assert unpack(pack([{1, 2}, {3}]), list[frozenset[int]]) == [frozenset([1, 2]), frozenset([3])]
+
+
+def test_map_keys_are_written_once():
+    boxes = [ShoeBox(size, "Jordans", Condition.GOOD) for size in range(100)]
+    data = pack(boxes)
+
+    assert data.count(b"condition") == 1
+    assert len(data) < len(json.dumps(serialize(boxes))) / 2
+
+
+def test_unknown_fields_follow_strict():
+    data = pack({"size": 1, "name": "Air", "condition": "Good", "extra": [1]})
+
+    assert unpack(data, ShoeBox).extra == [1]
+    assert not hasattr(unpack(data, ShoeBox, strict=True), "extra")
+
+
+def test_middleware_is_applied_both_ways():
+    value = {"at": datetime(2022, 7, 25, 11, 3, 44, 21000)}
+    data = Serializer(middleware={datetime: _datetime.serializer}).pack(value)
+
+    assert unpack(data, Any) == {"at": "2022-07-25T11:03:44.021000"}
+    assert Deserializer(middleware={datetime: _datetime.deserializer}).unpack(data, dict[str, datetime]) == value
+
+
+def test_failures_match_deserialize():
+    data = pack([[1, 2], [3, "four"]])
+
+    with pytest.raises(DeserializeClassException) as packed:
+        unpack(data, list[list[int]], strict=True)
+    with pytest.raises(DeserializeClassException) as unpacked:
+        deserialize([[1, 2], [3, "four"]], list[list[int]], strict=True)
+
+    assert isinstance(packed.value.error, DeserializeListException)
+    assert packed.value.error.index == 1
+    assert str(packed.value) == str(unpacked.value)
+
+
+def test_detects_cycles():
+    value = []
+    value.append(value)
+
+    with pytest.raises(SerializeCycleException):
+        pack(value)
+
+
+@pytest.mark.parametrize("data", [b"", b"\x85abc", b"\xc8\xff", b"\xc9\x00", b"\x91", b"\x01\x02", b"\xca", b"\xb1\xc1\x05\x01"])
+def test_rejects_malformed_documents(data):
+    with pytest.raises(DeserializeClassException) as error:
+        unpack(data, Any)
+    assert isinstance(error.value.error, ValueError)
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.pserialize import Deserializer, deserialize, deserialize_parallel, serialize
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException
+from src.pserialize.middleware.datetime import _datetime
+
+from .models.shoe_store import Condition, ShoeBox
+
+
+BOXES = [ShoeBox(i, f"box {i}", Condition.GOOD) for i in range(100)]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("classType, value", [
+    (list[ShoeBox], serialize(BOXES)),
+    (set[int], list(range(100))),
+    (frozenset[str], [str(i) for i in range(100)]),
+    (dict[int, ShoeBox], {str(box.size): serialize(box) for box in BOXES}),
+])
+def test_parallel_matches_serial(executor, classType, value):
+    result = deserialize_parallel(value, classType, executor, chunks=7, threshold=10)
+
+    assert result == deserialize(value, classType)
+    assert type(result) is type(deserialize(value, classType))
+
+
+def test_parallel_applies_middleware(executor):
+    middleware = {datetime: _datetime.deserializer}
+    value = [datetime(2022, 1, 1 + i).isoformat() for i in range(20)]
+
+    assert deserialize_parallel(value, list[datetime], executor, middleware, threshold=10) == deserialize(value, list[datetime], middleware)
+
+
+def test_parallel_errors_report_global_index(executor):
+    value = list(range(100))
+    value[73] = "x"
+
+    with pytest.raises(DeserializeClassException) as error:
+        deserialize_parallel(value, list[int], executor, strict=True, chunks=4, threshold=10)
+
+    assert isinstance(error.value.error, DeserializeListException)
+    assert error.value.error.index == 73
+
+
+def test_small_and_unsplittable_values_stay_serial():
+    class FailingExecutor:
+        def map(self, *args):
+            raise AssertionError("should not be used")
+
+    assert deserialize_parallel([1, 2], list[int], FailingExecutor(), threshold=10) == [1, 2]
+    assert deserialize_parallel(serialize(BOXES[0]), ShoeBox, FailingExecutor(), threshold=0) == BOXES[0]
+    assert deserialize_parallel(None, list[int], FailingExecutor(), threshold=0) is None
+
+
+def test_deserializer_runs_chunks_in_worker_processes():
+    with Deserializer(parallel=2, parallel_threshold=10) as deserializer:
+        assert deserializer.deserialize(serialize(BOXES), list[ShoeBox]) == BOXES
+        assert deserializer.deserialize(serialize(BOXES), list[ShoeBox]) == BOXES
+    assert deserializer.executor is None
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.pserialize import Serializer, serialize, serialize_parallel
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+BOXES = [ShoeBox(i, f"box {i}", Condition.GOOD) for i in range(100)]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("value", [
+    BOXES,
+    tuple(BOXES),
+    [Shelf(rows=[BOXES[:i]]) for i in range(30)],
+])
+def test_parallel_matches_serial(executor, value):
+    assert serialize_parallel(value, executor, chunks=7, threshold=10) == serialize(value)
+
+
+def test_parallel_applies_middleware(executor):
+    middleware = {datetime: _datetime.serializer}
+    value = [datetime(2022, 1, 1 + i) for i in range(20)]
+
+    assert serialize_parallel(value, executor, middleware, threshold=10) == serialize(value, middleware)
+
+
+def test_parallel_detects_cycles(executor):
+    value = [[] for _ in range(20)]
+    value[13].append(value)
+
+    with pytest.raises(SerializeCycleException):
+        serialize_parallel(value, executor, threshold=10)
+
+
+def test_small_and_unsplittable_values_stay_serial():
+    class FailingExecutor:
+        def map(self, *args):
+            raise AssertionError("should not be used")
+
+    assert serialize_parallel([1, 2], FailingExecutor(), threshold=10) == [1, 2]
+    assert serialize_parallel({i: i for i in range(20)}, FailingExecutor(), threshold=0) == {i: i for i in range(20)}
+    assert serialize_parallel(BOXES, FailingExecutor(), {list: lambda value, middleware: len(value)}, threshold=0) == 100
+
+
+def test_serializer_runs_chunks_in_configured_worker_processes():
+    value = [datetime(2022, 1, 1 + i) for i in range(20)]
+
+    with Serializer(middleware={datetime: _datetime.serializer}, parallel=2, parallel_threshold=10) as serializer:
+        assert serializer.serialize(value) == serialize(value, {datetime: _datetime.serializer})
+        assert serializer.serialize(BOXES) == serialize(BOXES)
+    assert serializer.executor is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Annotated, Literal, Optional, Union
+
+from src.pserialize import Discriminator, deserialize, serialize
+
+
+@dataclass
+class Cat:
+    name: str
+    kind: Literal["cat"] = "cat"
+
+
+@dataclass
+class Dog:
+    name: str
+    kind: Literal["dog", "puppy"] = "dog"
+
+
+Pet = Annotated[Union[Cat, Dog], Discriminator("kind")]
+
+
+@dataclass
+class Home:
+    pets: list[Pet]
+    favourite: Optional[Pet] = None
+
+
+class Animal:
+    __discriminator__ = Discriminator("kind")
+
+
+class Fish(Animal):
+    kind: Literal["fish"]
+
+    def __init__(self, name: str = None, kind: Literal["fish"] = "fish"):
+        self.name = name
+        self.kind = kind
+
+
+def test_literal_tags_are_resolved():
+    home = Home([Cat("tom"), Dog("rex", "puppy")], Dog("fido"))
+
+    serialized = serialize(home)
+
+    assert serialized == {
+        "pets": [{"name": "tom", "kind": "cat"}, {"name": "rex", "kind": "puppy"}],
+        "favourite": {"name": "fido", "kind": "dog"},
+    }
+    assert deserialize(serialized, Home) == home
+
+
+def test_base_class_marker_reads_literal_tags():
+    serialized = serialize([Fish("nemo")])
+
+    assert serialized == [{"name": "nemo", "kind": "fish"}]
+    fish = deserialize(serialized, list[Animal])[0]
+    assert type(fish) is Fish and vars(fish) == {"name": "nemo", "kind": "fish"}
@@ -0,0 +1,51 @@
+import pytest
+
+from src.pserialize import deserialize, deserialize_iterative, serialize, serialize_iterative
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException
+
+
+def test_primitive_list_deserializes_to_a_copy():
+    values = [float(i) for i in range(100)]
+    result = deserialize(values, list[float])
+    assert result == values and result is not values
+    assert deserialize_iterative(values, list[float]) == values
+
+
+def test_primitive_list_is_converted_like_item_by_item():
+    values = [1, 2.5, "3", True] * 4
+    assert deserialize(values, list[float]) == [float(value) for value in values]
+    assert deserialize(values, tuple[str, ...]) == tuple(str(value) for value in values)
+    assert deserialize(values * 2, list[int]) == [int(float(value)) if isinstance(value, float) else int(value) for value in values * 2]
+
+
+def test_none_items_are_kept():
+    values = [1.0] * 10 + [None]
+    assert deserialize(values, list[float])[-1] is None
+    assert deserialize(values, list[str])[-1] is None
+    assert deserialize_iterative(values, list[str])[-1] is None
+
+
+@pytest.mark.parametrize("deserializer", [deserialize, deserialize_iterative])
+def test_bad_item_reports_its_index(deserializer):
+    values = [1.0] * 20 + ["x"] + [2.0] * 5
+    with pytest.raises(DeserializeClassException) as e:
+        deserializer(values, list[float])
+    error = e.value.error
+    assert isinstance(error, DeserializeListException)
+    assert error.index == 20 and error.value == "x"
+
+
+def test_primitive_list_serializes_to_a_copy():
+    values = list(range(100))
+    for serializer in (serialize, serialize_iterative):
+        result = serializer(values)
+        assert result == values and result is not values
+    assert sorted(serialize(set(values))) == values
+    assert serialize(tuple(values)) == values
+
+
+def test_primitive_list_uses_middleware():
+    values = [float(i) for i in range(20)]
+    middleware = {float: lambda value, middleware: str(value)}
+    assert serialize(values, middleware) == [str(value) for value in values]
+    assert serialize_iterative(values, middleware) == [str(value) for value in values]
@@ -0,0 +1,116 @@
+import json
+from dataclasses import dataclass
+from typing import Annotated, Literal, NamedTuple, Optional, Union
+
+import pytest
+
+from src.pserialize import Deserializer, Discriminator, Serializer, deserialize_references, serialize_references
+from src.pserialize.deserialize import DeserializeClassException
+from src.pserialize.serialize import SerializeCycleException
+
+
+@dataclass
+class Brand:
+    name: str
+
+
+@dataclass
+class Shoe:
+    size: int
+    brand: Brand
+
+
+@dataclass
+class Node:
+    name: str
+    parent: Optional["Node"] = None
+    children: list["Node"] = None
+
+
+class Pair(NamedTuple):
+    left: Brand
+    right: Brand
+
+
+def test_shared_object_is_written_once():
+    brand = Brand("Nike")
+    shoes = [Shoe(size, brand) for size in range(3)]
+
+    serialized = serialize_references(shoes)
+
+    assert serialized == [
+        {"$id": 1, "size": 0, "brand": {"$id": 2, "name": "Nike"}},
+        {"$id": 3, "size": 1, "brand": {"$ref": 2}},
+        {"$id": 4, "size": 2, "brand": {"$ref": 2}},
+    ]
+
+    deserialized = deserialize_references(json.loads(json.dumps(serialized)), list[Shoe])
+    assert [shoe.size for shoe in deserialized] == [0, 1, 2]
+    assert deserialized[0].brand is deserialized[1].brand is deserialized[2].brand
+    assert deserialized[0].brand.name == "Nike"
+
+
+def test_cycles_round_trip():
+    root = Node("root", children=[])
+    for name in "ab":
+        root.children.append(Node(name, parent=root, children=[]))
+
+    serialized = serialize_references(root)
+    deserialized = deserialize_references(serialized, Node)
+
+    assert [child.name for child in deserialized.children] == ["a", "b"]
+    assert all(child.parent is deserialized for child in deserialized.children)
+
+
+def test_container_cycles_still_raise():
+    value = []
+    value.append(value)
+    with pytest.raises(SerializeCycleException):
+        serialize_references(value)
+
+
+def test_named_tuples_and_dicts_share_objects():
+    brand = Brand("Geox")
+    value = {"pair": Pair(brand, brand), "other": brand}
+
+    serialized = serialize_references(value)
+    deserialized = deserialize_references(serialized, dict[str, Union[Pair, Brand]])
+
+    assert deserialized["pair"].left is deserialized["pair"].right is deserialized["other"]
+
+
+def test_tagged_union_resolves_references():
+    @dataclass
+    class Cat:
+        kind: Literal["cat"]
+        name: str
+
+    @dataclass
+    class Dog:
+        kind: Literal["dog"]
+        name: str
+
+    cat = Cat("cat", "Tom")
+    serialized = serialize_references([cat, Dog("dog", "Rex"), cat])
+    pets = deserialize_references(serialized, list[Annotated[Union[Cat, Dog], Discriminator("kind")]])
+
+    assert pets[0] is pets[2]
+    assert type(pets[1]).__name__ == "Dog"
+
+
+def test_unknown_reference_raises():
+    with pytest.raises(DeserializeClassException):
+        deserialize_references([{"$ref": 7}], list[Brand])
+
+
+def test_strict_mode_ignores_ids():
+    assert vars(deserialize_references({"$id": 1, "name": "Nike"}, Brand, strict=False)) == {"name": "Nike"}
+
+
+def test_serializer_and_deserializer_flags():
+    brand = Brand("Nike")
+    serialized = Serializer(preserve_references=True).serialize([brand, brand])
+    assert serialized[1] == {"$ref": 1}
+
+    brands = Deserializer(preserve_references=True).deserialize(serialized, list[Brand])
+    assert brands[0] is brands[1]
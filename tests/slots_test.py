@@ -0,0 +1,131 @@
+import io
+import json
+import sys
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import pytest
+
+from src.pserialize import Deserializer, Serializer, deserialize, deserialize_iterative, dump, serialize, serialize_iterative
+from src.pserialize.deserialize import DeserializeClassException
+
+
+class Point:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+class LabeledPoint(Point):
+    __slots__ = ("__label",)
+
+    def __init__(self, x: int, y: int, label: str):
+        super().__init__(x, y)
+        self.__label = label
+
+    @property
+    def label(self):
+        return self.__label
+
+
+class Pair(NamedTuple):
+    left: int
+    right: Optional[Point] = None
+
+
+@dataclass(frozen=True)
+class Frozen:
+    name: str
+    pairs: list[Pair]
+
+
+def test_slotted_round_trip():
+    point = Point(1, 2)
+    assert serialize(point) == {"x": 1, "y": 2}
+
+    result = deserialize({"x": 1, "y": 2}, Point)
+    assert type(result) is Point
+    assert (result.x, result.y) == (1, 2)
+
+
+def test_inherited_and_private_slots():
+    point = LabeledPoint(1, 2, "a")
+    serialized = serialize(point)
+    assert serialized == {"x": 1, "y": 2, "_LabeledPoint__label": "a"}
+    assert deserialize(serialized, LabeledPoint).label == "a"
+
+
+def test_missing_slot_is_none_and_unknown_field_dropped():
+    result = deserialize({"x": 1, "z": 3}, Point)
+    assert result.y is None
+    assert not hasattr(result, "z")
+
+
+def test_unset_slot_is_skipped():
+    point = Point.__new__(Point)
+    point.x = 1
+    assert serialize(point) == {"x": 1}
+
+
+def test_named_tuple_round_trip():
+    pair = Pair(1, Point(2, 3))
+    serialized = serialize(pair)
+    assert serialized == {"left": 1, "right": {"x": 2, "y": 3}}
+
+    result = deserialize(serialized, Pair)
+    assert type(result) is Pair
+    assert result.left == 1 and (result.right.x, result.right.y) == (2, 3)
+
+
+def test_named_tuple_from_list_and_defaults():
+    assert deserialize([1], Pair) == Pair(1, None)
+    assert deserialize({"left": 4}, Pair) == Pair(4, None)
+    with pytest.raises(Exception):
+        deserialize([1, None, 3], Pair)
+
+
+def test_named_tuple_field_error():
+    with pytest.raises(DeserializeClassException) as e:
+        deserialize({"left": 1, "right": {"x": "a"}}, Pair, strict=True)
+    assert "right:" in str(e.value)
+
+
+def test_frozen_dataclass_round_trip():
+    frozen = Frozen("f", [Pair(1), Pair(2, Point(0, 0))])
+    serialized = serialize(frozen)
+    result = deserialize(serialized, Frozen)
+    assert result.name == "f"
+    assert result.pairs[0] == Pair(1, None)
+    assert serialize(result) == serialized
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need python 3.10")
+def test_frozen_slotted_dataclass():
+    @dataclass(frozen=True, slots=True)
+    class Slotted:
+        name: str
+        point: Point
+
+    serialized = serialize(Slotted("s", Point(1, 2)))
+    assert serialized == {"name": "s", "point": {"x": 1, "y": 2}}
+    result = deserialize(serialized, Slotted)
+    assert result == Slotted("s", result.point) and result.point.y == 2
+
+
+def test_iterative_engines_and_stream_agree():
+    frozen = Frozen("f", [Pair(1), Pair(2, Point(0, 1))])
+    serialized = serialize(frozen)
+    assert serialize_iterative(frozen) == serialized
+    assert Serializer().compile(Frozen)(frozen, {}, set()) == serialized
+
+    fp = io.StringIO()
+    dump([frozen], fp)
+    assert json.loads(fp.getvalue()) == [serialized]
+
+    result = deserialize_iterative(serialized, Frozen)
+    assert serialize(result) == serialized
+    assert deserialize_iterative({"left": 1}, Pair) == Pair(1, None)
+    assert deserialize_iterative([1, {"x": 1, "y": 2}], Pair).right.y == 2
+    assert serialize(Deserializer(iterative=True).deserialize([{"x": 1}], list[Point])) == [{"x": 1, "y": None}]
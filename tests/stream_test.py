@@ -0,0 +1,156 @@
+import io
+import json
+from datetime import datetime
+from enum import IntEnum
+
+import pytest
+
+from src.pserialize import Deserializer, Serializer, deserialize, dump, iter_encode, iter_load, serialize
+from src.pserialize.deserialize import DeserializeClassException, DeserializeListException
+from src.pserialize.middleware.datetime import _datetime
+from src.pserialize.serialize import SerializeCycleException
+
+from .models.dataclass import A
+from .models.enum import Number
+from .models.shoe_store import Condition, Shelf, ShoeBox
+
+
+class Level(IntEnum):
+    LOW = 1
+
+
+STORE = [
+    Shelf(rows=[
+        [ShoeBox(10, "Jordans é", Condition.EXCELLENT), ShoeBox(11, None, Condition.BAD)],
+        [],
+    ])
+]
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    True,
+    3,
+    1.5,
+    float("inf"),
+    "quote \" and unicode é",
+    Number.ONE,
+    Level.LOW,
+    [],
+    {},
+    [[[]], {}],
+    {Number.FIVE: [1, (2, 3), frozenset([4])], 1: None, 2.5: False, None: Level.LOW},
+    A(3.0, "bee", 1),
+    STORE,
+])
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_encode_matches_json_dumps_of_serialize(value, chunk_size):
+    assert "".join(iter_encode(value, chunk_size=chunk_size)) == json.dumps(serialize(value))
+
+
+def test_iter_encode_yields_bounded_chunks():
+    chunks = list(iter_encode(list(range(10000)), chunk_size=100))
+
+    assert len(chunks) > 100
+    assert max(len(chunk) for chunk in chunks) < 200
+
+
+def test_dump_writes_text_and_bytes():
+    text = io.StringIO()
+    binary = io.BytesIO()
+
+    dump(STORE, text)
+    Serializer().dump(STORE, binary)
+
+    assert text.getvalue() == json.dumps(serialize(STORE))
+    assert binary.getvalue() == json.dumps(serialize(STORE)).encode("utf-8")
+
+
+def test_stream_applies_middleware():
+    serializer = Serializer(middleware={datetime: _datetime.serializer})
+    value = {"at": datetime(2022, 7, 25, 11, 3, 44, 21000)}
+
+    assert "".join(serializer.iter_encode(value)) == '{"at": "2022-07-25T11:03:44.021000"}'
+
+
+def test_stream_detects_cycles():
+    value = []
+    value.append(value)
+
+    with pytest.raises(SerializeCycleException):
+        "".join(iter_encode(value))
+
+
+def test_unsupported_keys_raise_type_error():
+    with pytest.raises(TypeError):
+        "".join(iter_encode({A(3.0, "bee", 1).__class__: 1}))
+
+
+class Link:
+    def __init__(self, next=None):
+        self.next = next
+
+
+def test_deep_records_are_walked_without_recursion():
+    chain = None
+    for _ in range(5000):
+        chain = Link(chain)
+
+    text = "".join(iter_encode([chain], chunk_size=1000))
+
+    assert text == "[" + '{"next": ' * 5000 + "null" + "}" * 5000 + "]"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_load_matches_deserialize(chunk_size):
+    text = json.dumps(serialize(STORE[0].rows[0] * 50))
+
+    for fp in (io.StringIO(text), io.BytesIO(text.encode("utf-8"))):
+        items = Deserializer().iter_deserialize(fp, list[ShoeBox], chunk_size=chunk_size)
+
+        assert list(items) == deserialize(json.loads(text), list[ShoeBox])
+
+
+def test_iter_load_is_incremental():
+    items = iter_load(io.StringIO('[1, 2, "three"]'), list[int], strict=True)
+
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(DeserializeClassException) as error:
+        next(items)
+    assert isinstance(error.value.error, DeserializeListException)
+    assert error.value.error.index == 2
+
+
+def test_iter_load_applies_middleware():
+    deserializer = Deserializer(middleware={datetime: _datetime.deserializer})
+    text = ' [ "2022-07-25T11:03:44.021000" ,"2022-07-26T00:00:00" ] '
+
+    assert list(deserializer.iter_deserialize(io.StringIO(text), list[datetime])) == [
+        datetime(2022, 7, 25, 11, 3, 44, 21000),
+        datetime(2022, 7, 26),
+    ]
+
+
+def test_iter_load_reads_numbers_split_between_chunks():
+    text = "[1.5e3, -0, 12.5, 2E-2, 0.25e+10, -7.125E1]"
+
+    for chunk_size in range(1, len(text) + 1):
+        assert list(iter_load(io.StringIO(text), list[float], chunk_size=chunk_size)) == json.loads(text)
+
+
+def test_iter_load_reads_long_lists_of_floats():
+    values = [12.5 + index for index in range(30000)]
+
+    assert list(iter_load(io.StringIO(json.dumps(values)), list[float], chunk_size=4096)) == values
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1,", "[1 2]", "[1,]", "[1] 2"])
+def test_iter_load_rejects_malformed_documents(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_load(io.StringIO(text), list[int], chunk_size=1))
+
+
+def test_iter_load_requires_a_list_type():
+    with pytest.raises(TypeError):
+        iter_load(io.StringIO("{}"), dict[str, int])
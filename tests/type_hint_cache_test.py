@@ -0,0 +1,144 @@
+import gc
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from src.pserialize import deserialize, invalidate_type_hints, serialize, type_hint_cache_info
+from src.pserialize.serialization_utils import TypeHintCache, get_attributes, get_init_type_hints
+
+
+@dataclass
+class Leaf:
+    value: int
+
+
+@dataclass
+class Branch:
+    leaf: "Leaf"
+    other: Optional["Branch"] = None
+
+
+def test_hints_are_resolved_once():
+    cache = TypeHintCache()
+    calls = []
+
+    def resolve(classType):
+        calls.append(classType)
+        return {"leaf": Leaf}
+
+    assert cache.get(Branch, "init", resolve) == {"leaf": Leaf}
+    cache.get(Branch, "init", resolve)["changed"] = int
+
+    assert cache.get(Branch, "init", resolve) == {"leaf": Leaf}
+    assert calls == [Branch]
+    assert cache.info() == (2, 1, 0, 1024, 1)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TypeHintCache(maxsize=2)
+    classes = [type(f"Class{index}", (), {}) for index in range(3)]
+
+    cache.get(classes[0], "init", lambda _: {})
+    cache.get(classes[1], "init", lambda _: {})
+    cache.get(classes[0], "init", lambda _: {})
+    cache.get(classes[2], "init", lambda _: {})
+
+    assert cache.info().evictions == 1
+    assert cache.info().currsize == 2
+    cache.get(classes[0], "init", lambda _: {})
+    assert cache.info().misses == 3
+
+
+def test_failures_are_not_cached():
+    cache = TypeHintCache()
+
+    def fail(_):
+        raise NameError("Later")
+
+    try:
+        cache.get(Leaf, "init", fail)
+    except NameError:
+        pass
+
+    assert cache.get(Leaf, "init", lambda _: {"value": int}) == {"value": int}
+
+
+def test_invalidate_drops_the_class_and_its_subclasses():
+    cache = TypeHintCache()
+
+    class Tree(Leaf):
+        pass
+
+    for classType in (Leaf, Tree, Branch):
+        cache.get(classType, "init", lambda _: {})
+    cache.invalidate(Leaf)
+
+    assert cache.info().currsize == 1
+    cache.invalidate()
+    assert cache.info().currsize == 0
+
+
+def test_collected_classes_are_dropped():
+    cache = TypeHintCache()
+    Dynamic = type("Dynamic", (), {"__annotations__": {"value": int}})
+    cache.get(Dynamic, "attributes", get_attributes)
+
+    reference = weakref.ref(Dynamic)
+    del Dynamic
+    gc.collect()
+    cache.get(Leaf, "init", lambda _: {})
+
+    assert reference() is None
+    assert cache.info().currsize == 1
+
+
+def test_deserialize_and_serialize_use_the_cache():
+    get_init_type_hints(Branch, include_extras=True)
+    before = type_hint_cache_info()
+
+    assert get_init_type_hints(Branch, include_extras=True) == {"leaf": Leaf, "other": Optional[Branch], "return": type(None)}
+    assert type_hint_cache_info().hits == before.hits + 1
+    assert deserialize({"leaf": {"value": 1}}, Branch) == Branch(Leaf(1))
+    assert serialize(Branch(Leaf(1))) == {"leaf": {"value": 1}, "other": None}
+
+
+def test_redefined_classes_are_picked_up_once_invalidated():
+    global Leaf
+    original = Leaf
+
+    assert deserialize({"leaf": {"value": 1}}, Branch).leaf == original(1)
+
+    @dataclass
+    class Leaf:
+        value: str
+
+    try:
+        invalidate_type_hints(original)
+        assert get_init_type_hints(Branch)["leaf"] is Leaf
+        assert deserialize({"leaf": {"value": 1}}, Branch).leaf == Leaf("1")
+    finally:
+        Leaf = original
+        invalidate_type_hints()
+
+
+@dataclass
+class Unrelated:
+    name: str
+
+
+def test_invalidate_only_recompiles_dependent_classes():
+    data = {"leaf": {"value": 1}}
+    deserialize(data, Branch)
+    deserialize({"name": "a"}, Unrelated)
+    serialize(Branch(Leaf(1)))
+    serialize(Unrelated("a"))
+    invalidate_type_hints(Leaf)
+    before = type_hint_cache_info()
+
+    assert deserialize({"name": "a"}, Unrelated) == Unrelated("a")
+    assert serialize(Unrelated("a")) == {"name": "a"}
+    assert type_hint_cache_info()[:2] == before[:2]
+
+    assert deserialize(data, Branch) == Branch(Leaf(1))
+    assert serialize(Branch(Leaf(1))) == {"leaf": {"value": 1}, "other": None}
+    assert type_hint_cache_info().misses > before.misses
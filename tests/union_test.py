@@ -1,10 +1,11 @@
 import sys
-from typing import Union
+from typing import Literal, NamedTuple, Union
 from dataclasses import dataclass
 
 import pytest
 
 from src.pserialize import serialize, deserialize
+from src.pserialize.deserialize import DeserializeClassException
 
 
 def test_union_prefers_existing_value_type_before_coercion():
@@ -75,3 +76,90 @@ def test_pep_604_optional_accepts_none_and_deserializes_real_type():
 
     assert deserialize({"a": None}, A) == A(None)
     assert deserialize({"a": "4"}, A) == A(4)
+
+
+class Meta:
+    def __init__(self, note: str = None):
+        self.note = note
+
+
+@dataclass
+class Cat:
+    meta: Meta
+    kind: Literal["cat"]
+    lives: int
+
+
+@dataclass
+class Dog:
+    meta: Meta
+    kind: Literal["dog"]
+    good: bool
+
+
+@dataclass
+class Pet:
+    meta: Meta
+    name: str
+
+
+def counting_middleware():
+    calls = []
+
+    def deserialize_meta(value, middleware):
+        calls.append(value)
+        return Meta(value)
+
+    return calls, {Meta: deserialize_meta}
+
+
+def test_literal_tag_selects_member_without_trying_others():
+    calls, middleware = counting_middleware()
+
+    pet = deserialize({"meta": "m", "kind": "dog", "good": True}, Union[Cat, Dog], middleware)
+
+    assert isinstance(pet, Dog) and pet.good
+    assert calls == ["m"]
+
+
+def test_tagged_union_keeps_member_order_for_untagged_values():
+    assert isinstance(deserialize({"name": "rex"}, Union[Cat, Dog, Pet]), Cat)
+    assert isinstance(deserialize({"name": "rex", "kind": "dog"}, Union[Cat, Pet, Dog]), Pet)
+    assert isinstance(deserialize({"kind": "fish"}, Union[Cat, Pet, Dog]), Pet)
+    assert isinstance(deserialize({"kind": ["cat"]}, Union[Cat, Pet]), Pet)
+
+
+def test_unknown_tag_fails_like_trial_and_error():
+    with pytest.raises(DeserializeClassException) as error:
+        deserialize({"kind": "fish"}, Union[Cat, Dog])
+
+    assert "Could not deserialize union" in str(error.value)
+
+
+def test_union_skips_members_that_cannot_accept_the_value_type():
+    @dataclass
+    class A:
+        a: Union[int, list[int], Pet]
+
+    assert deserialize({"a": ["1", 2]}, A) == A([1, 2])
+    assert deserialize({"a": {"name": "rex"}}, A).a.name == "rex"
+    assert deserialize({"a": "3"}, A) == A(3)
+
+
+def test_unions_differing_only_in_member_order_keep_their_own_order():
+    assert type(deserialize("4", Union[int, float])) is int
+    assert type(deserialize("4", Union[float, int])) is float
+    assert [type(item) for item in deserialize(["4"], list[Union[int, float]])] == [int]
+    assert [type(item) for item in deserialize(["4"], list[Union[float, int]])] == [float]
+
+
+class Pair(NamedTuple):
+    x: int
+    y: int
+
+
+@pytest.mark.parametrize("unionType", [Union[Pair, int], Union[Pair, str], Union[int, Pair], Union[Pair, list[int]]])
+def test_union_accepts_named_tuples_by_position(unionType):
+    assert deserialize([1, 2], unionType) == Pair(1, 2)
+    assert deserialize((1, 2), unionType) == Pair(1, 2)
+    assert deserialize({"x": 1, "y": 2}, unionType) == Pair(1, 2)